@@ -0,0 +1,64 @@
+"""Command line module."""
+from argparse import ArgumentParser
+from json import loads
+from sys import stdin, stdout
+
+from .stream import CHUNK_SIZE, streamFile
+
+'''
+  @abstract command line parser of streamed distances
+
+  @return {ArgumentParser}
+'''
+def parser():
+  argument_parser=ArgumentParser(
+    prog='python -m spycio',
+    description='Streams coordinate pairs, one per row with origin and destination '
+                'coordinates side by side, and appends their distance and travel time.'
+  )
+
+  argument_parser.add_argument('input', nargs='?', default='-',
+    help='input file, or - for standard input')
+  argument_parser.add_argument('-o', '--output', default='-',
+    help='output file, or - for standard output')
+  argument_parser.add_argument('-m', '--method', default='euclidean',
+    help='distance method, e.g. euclidean, manhattan, pnorm, geographical')
+  argument_parser.add_argument('-c', '--config', default='{}', type=loads,
+    help='method configuration as JSON, e.g. \'{"radius": 6371}\'')
+  argument_parser.add_argument('-s', '--speed', default=None, type=float,
+    help='average speed, which appends travel times')
+  argument_parser.add_argument('--chunk-size', default=CHUNK_SIZE, type=int,
+    help='rows read, computed and written at once')
+  argument_parser.add_argument('--header', action='store_true',
+    help='input starts with a header row')
+  argument_parser.add_argument('-d', '--delimiter', default=',',
+    help='column delimiter')
+
+  return argument_parser
+
+'''
+  @abstract command line entry point
+
+  @param {Array} arguments
+  @return {Number}
+'''
+def main(arguments=None):
+  options=parser().parse_args(arguments)
+
+  input_handle=stdin if options.input == '-' else open(options.input, newline='')
+  output_handle=stdout if options.output == '-' else open(options.output, 'w')
+
+  try:
+    streamFile(input_handle, output_handle, options.method, options.config, options.speed, \
+      options.chunk_size, options.header, options.delimiter)
+
+  finally:
+    if(input_handle is not stdin):
+      input_handle.close()
+    if(output_handle is not stdout):
+      output_handle.close()
+
+  return 0
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -0,0 +1,235 @@
+"""Asyncio module."""
+from asyncio import get_running_loop
+from math import isnan, nan
+
+from .utils import throw
+from .spycio import distance as scalarDistance
+from .batch import distanceBatch
+from .cache import frozenConfig
+
+# Longest time, in seconds, a request waits for others to share its batch
+DEFAULT_WINDOW=0.001
+
+DEFAULT_MAX_BATCH_SIZE=1024
+
+'''
+  @abstract distances of pairs on a single vectorized call, masking invalid
+  coordinates. Pairs left without a distance, or every pair should the call
+  raise, e.g. on coordinates of distinct dimensions, are evaluated one by
+  one, such that every request gets its own result or error.
+
+  @param {Object} method
+  @param {Object} methodConfig
+  @param {Array} pairs
+  @return {Array} (value, error) tuples
+'''
+def evaluatePairs(method, methodConfig, pairs):
+  try:
+    distances=distanceBatch(
+      [ pair[0] for pair in pairs ], [ pair[1] for pair in pairs ], method, methodConfig, \
+      validate="mask"
+    ).tolist()
+
+  except Exception:
+    distances=[nan] * len(pairs)
+
+  outcomes=[]
+  for (coordinate_1, coordinate_2), value in zip(pairs, distances):
+    if(not isnan(value)):
+      outcomes.append((value, None))
+      continue
+
+    try:
+      outcomes.append((scalarDistance(coordinate_1, coordinate_2, method, methodConfig), None))
+    except Exception as error:
+      outcomes.append((None, error))
+
+  return outcomes
+
+'''
+  @abstract pending requests of a method and configuration, evaluated once
+  full or once the window of their first request elapses
+'''
+class Group:
+  __slots__=('method', 'methodConfig', 'pairs', 'futures', 'timer')
+
+  def __init__(self, method, methodConfig):
+    self.method=method
+    self.methodConfig=methodConfig
+    self.pairs=[]
+    self.futures=[]
+    self.timer=None
+
+'''
+  @abstract gathers concurrent distance requests into vectorized batches.
+  Requests are grouped by method and configuration; a group is evaluated
+  once it holds max_batch_size requests or window seconds after its first
+  request, on given executor (the loop default one if None), off the event
+  loop. The window bounds the latency added to a lone request.
+
+  @param {Number} window
+  @param {Number} max_batch_size
+  @param {Object} executor
+'''
+class MicroBatcher:
+  def __init__(self, window=DEFAULT_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE, \
+    executor=None):
+    if(window < 0):
+      throw("Argument 'window' must be a non-negative number of seconds!", ValueError)
+
+    if(max_batch_size < 1):
+      throw("Argument 'max_batch_size' must be a positive integer!", ValueError)
+
+    self.window=window
+    self.max_batch_size=max_batch_size
+    self.executor=executor
+
+    self.groups={}
+    self.tasks=set()
+
+    self.requests=0
+    self.batches=0
+
+  '''
+    @abstract resolves to the distance of two points based on method
+
+    @param {Array} coordinate_1
+    @param {Array} coordinate_2
+    @param {String} method
+    @param {Object} methodConfig
+    @return {Number}
+  '''
+  async def distance(self, coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
+    loop=get_running_loop()
+    key=(loop, method, frozenConfig(methodConfig))
+
+    group=self.groups.get(key)
+    if(group is None):
+      group=Group(method, methodConfig)
+      group.timer=loop.call_later(self.window, self.flush, key)
+
+      self.groups[key]=group
+
+    future=loop.create_future()
+
+    group.pairs.append((coordinate_1, coordinate_2))
+    group.futures.append(future)
+    self.requests+=1
+
+    if(len(group.pairs) >= self.max_batch_size):
+      self.flush(key)
+
+    return await future
+
+  '''
+    @abstract resolves to the travel time of two points based on method
+
+    @param {Number} average_speed
+    @param {Array} coordinate_1
+    @param {Array} coordinate_2
+    @param {String} method
+    @param {Object} methodConfig
+    @return {Number}
+  '''
+  async def travelTime(self, average_speed, coordinate_1, coordinate_2, \
+    method="euclidean", methodConfig={}):
+    return await self.distance(coordinate_1, coordinate_2, method, methodConfig) / average_speed
+
+  '''
+    @abstract evaluates the pending group of given key
+
+    @param {Array} key
+    @return
+  '''
+  def flush(self, key):
+    group=self.groups.pop(key, None)
+
+    if(group is None):
+      return
+
+    group.timer.cancel()
+    self.batches+=1
+
+    task=key[0].create_task(self.evaluate(key[0], group))
+    self.tasks.add(task)
+    task.add_done_callback(self.tasks.discard)
+
+  '''
+    @abstract evaluates a group on the executor and resolves its futures
+
+    @param {Object} loop
+    @param {Group} group
+    @return
+  '''
+  async def evaluate(self, loop, group):
+    try:
+      outcomes=await loop.run_in_executor(
+        self.executor, evaluatePairs, group.method, group.methodConfig, group.pairs
+      )
+    except Exception as error:
+      outcomes=[ (None, error) ] * len(group.futures)
+
+    for future, (value, error) in zip(group.futures, outcomes):
+      if(future.done()):
+        continue
+
+      if(error is None):
+        future.set_result(value)
+      else:
+        future.set_exception(error)
+
+batcher=None
+
+'''
+  @abstract replaces the module batcher, used by distance and travelTime,
+  with one of given latency settings
+
+  @param {Number} window
+  @param {Number} max_batch_size
+  @param {Object} executor
+  @return {MicroBatcher}
+'''
+def configure(window=DEFAULT_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE, executor=None):
+  global batcher
+
+  batcher=MicroBatcher(window, max_batch_size, executor)
+
+  return batcher
+
+'''
+  @abstract module batcher, created with default settings on first use
+
+  @return {MicroBatcher}
+'''
+def defaultBatcher():
+  return batcher if batcher is not None else configure()
+
+'''
+  @abstract resolves to the distance of two points based on method, batched
+  along with concurrent requests
+
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {String} method
+  @param {Object} methodConfig
+  @return {Number}
+'''
+async def distance(coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
+  return await defaultBatcher().distance(coordinate_1, coordinate_2, method, methodConfig)
+
+'''
+  @abstract resolves to the travel time of two points based on method,
+  batched along with concurrent requests
+
+  @param {Number} average_speed
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {String} method
+  @param {Object} methodConfig
+  @return {Number}
+'''
+async def travelTime(average_speed, coordinate_1, coordinate_2, method="euclidean", \
+  methodConfig={}):
+  return await defaultBatcher().travelTime(
+    average_speed, coordinate_1, coordinate_2, method, methodConfig
+  )
@@ -0,0 +1,93 @@
+"""Batch module."""
+from numpy import asarray, empty, nan
+
+from .utils import throw, floatDtype
+from .instrument import instrumented
+from .metrics import getMetric
+from .parallel import runTiles, batchTiles, workerCount
+from .speed import SpeedProfile, travelTimes
+
+'''
+  @abstract returns the distance between rows of two (N, d) arrays, 
+  split among given number of workers of given backend ('thread' or 'process'),
+  evaluated and returned on given floating dtype. Coordinate rows are
+  validated on given mode: 'raise' raises on any invalid row, 'mask'
+  returns NaN for pairs holding an invalid row and 'skip' trusts every row.
+
+  @param {Array} X
+  @param {Array} Y
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} workers
+  @param {String} backend
+  @param {Object} dtype
+  @param {String} validate
+  @return {Array}
+'''
+@instrumented("distanceBatch", 2)
+def distanceBatch(X, Y, method="euclidean", methodConfig={}, workers=1, backend="thread", \
+  dtype=float, validate="raise"):
+  dtype=floatDtype(dtype)
+
+  X=asarray(X, dtype=float)
+  Y=asarray(Y, dtype=float)
+
+  if(X.ndim != 2 or X.shape != Y.shape):
+    emsg="Arguments must be equally shaped (N, d) arrays, received {0} and {1}!".format(\
+      X.shape, Y.shape
+    )
+    throw(emsg, TypeError)
+
+  metric=getMetric(method, **methodConfig)
+
+  invalid_X=metric.invalidRows(X, validate)
+  invalid_Y=metric.invalidRows(Y, validate)
+
+  prepared_X=metric.prepareAs(X, dtype)
+  prepared_Y=metric.prepareAs(Y, dtype)
+
+  if(workers == 1):
+    result=metric.kernel(prepared_X, prepared_Y).astype(dtype, copy=False)
+  else:
+    workers=workerCount(workers)
+    result=empty(len(X), dtype=dtype)
+
+    runTiles(metric, method, methodConfig, prepared_X, prepared_Y, result, \
+      batchTiles(len(X), workers), workers, backend)
+
+  for invalid_rows in (invalid_X, invalid_Y):
+    if(invalid_rows is not None):
+      result[invalid_rows]=nan
+
+  return result
+
+'''
+  @abstract returns the travel time between rows of two (N, d) arrays at
+  given speed: a number, an (N,) array of per-pair speeds or a SpeedProfile
+
+  @param {Object} average_speed
+  @param {Array} X
+  @param {Array} Y
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} workers
+  @param {String} backend
+  @param {Object} dtype
+  @param {String} validate
+  @return {Array}
+'''
+@instrumented("travelTimeBatch", 3)
+def travelTimeBatch(average_speed, X, Y, method="euclidean", methodConfig={}, \
+  workers=1, backend="thread", dtype=float, validate="raise"):
+  distances=distanceBatch(X, Y, method, methodConfig, workers, backend, dtype, validate)
+
+  if(not isinstance(average_speed, SpeedProfile)):
+    average_speed=asarray(average_speed, dtype=float)
+
+    if(average_speed.ndim > 0 and average_speed.shape != distances.shape):
+      emsg="Speeds must be a number or an {0} array, received shape {1}!".format(\
+        distances.shape, average_speed.shape
+      )
+      throw(emsg, ValueError)
+
+  return travelTimes(distances, average_speed).astype(distances.dtype, copy=False)
@@ -0,0 +1,149 @@
+"""Cache module."""
+from collections import OrderedDict
+from threading import Lock
+
+from .utils import throw
+from .metrics import getMetric
+
+'''
+  @abstract hashable counterpart of a method configuration
+
+  @param {Object} methodConfig
+  @return {Array}
+'''
+def frozenConfig(methodConfig):
+  try:
+    frozen=tuple(sorted(methodConfig.items()))
+    hash(frozen)
+
+    return frozen
+
+  except TypeError:
+    return repr(sorted(methodConfig.items()))
+
+'''
+  @abstract opt-in memoizing layer in front of distance and travelTime.
+  Entries are keyed on method, frozen configuration and coordinates rounded
+  to precision decimals, and are evaluated on the rounded coordinates, such
+  that cached values do not depend on the order of calls. At most maxsize
+  entries are kept (None for unbounded), evicting the least recently used.
+  As every method of spycio is symmetric, pairs are keyed regardless of
+  their order unless symmetric is unset.
+
+  @param {Number} maxsize
+  @param {Number} precision
+  @param {Boolean} symmetric
+'''
+class DistanceCache:
+  def __init__(self, maxsize=2 ** 16, precision=6, symmetric=True):
+    if(maxsize is not None and maxsize < 1):
+      throw("Argument 'maxsize' must be a positive integer or None!", ValueError)
+
+    self.maxsize=maxsize
+    self.precision=precision
+    self.symmetric=symmetric
+
+    self.entries=OrderedDict()
+    self.metrics={}
+    self.lock=Lock()
+
+    self.hits=0
+    self.misses=0
+    self.evictions=0
+
+  def __len__(self):
+    return len(self.entries)
+
+  '''
+    @abstract coordinates rounded to cache precision
+
+    @param {Array} coordinate
+    @return {Array}
+  '''
+  def quantize(self, coordinate):
+    return tuple([ round(float(value), self.precision) for value in coordinate ])
+
+  '''
+    @abstract returns the distance of two points based on method, from cache if present
+
+    @param {Array} coordinate_1
+    @param {Array} coordinate_2
+    @param {String} method
+    @param {Object} methodConfig
+    @return {Number}
+  '''
+  def distance(self, coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
+    config=frozenConfig(methodConfig)
+
+    quantized_1=self.quantize(coordinate_1)
+    quantized_2=self.quantize(coordinate_2)
+
+    if(self.symmetric and quantized_2 < quantized_1):
+      quantized_1, quantized_2=quantized_2, quantized_1
+
+    key=(method, config, quantized_1, quantized_2)
+
+    with self.lock:
+      if(key in self.entries):
+        self.entries.move_to_end(key)
+        self.hits+=1
+
+        return self.entries[key]
+
+      self.misses+=1
+
+    metric_key=(method, config)
+    if(metric_key not in self.metrics):
+      self.metrics[metric_key]=getMetric(method, **methodConfig)
+
+    value=self.metrics[metric_key](list(quantized_1), list(quantized_2))
+
+    with self.lock:
+      self.entries[key]=value
+
+      if(self.maxsize is not None and len(self.entries) > self.maxsize):
+        self.entries.popitem(last=False)
+        self.evictions+=1
+
+    return value
+
+  '''
+    @abstract returns the travel time of two points based on method, from cache if present
+
+    @param {Number} average_speed
+    @param {Array} coordinate_1
+    @param {Array} coordinate_2
+    @param {String} method
+    @param {Object} methodConfig
+    @return {Number}
+  '''
+  def travelTime(self, average_speed, coordinate_1, coordinate_2, \
+    method="euclidean", methodConfig={}):
+    return self.distance(coordinate_1, coordinate_2, method, methodConfig) / average_speed
+
+  '''
+    @abstract hit, miss and eviction counters, along with current and maximum size
+
+    @return {Object}
+  '''
+  def stats(self):
+    with self.lock:
+      return {
+        'hits': self.hits,
+        'misses': self.misses,
+        'evictions': self.evictions,
+        'size': len(self.entries),
+        'maxsize': self.maxsize
+      }
+
+  '''
+    @abstract drops every entry and resets counters
+
+    @return
+  '''
+  def clear(self):
+    with self.lock:
+      self.entries.clear()
+      self.hits=0
+      self.misses=0
+      self.evictions=0
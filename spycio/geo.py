@@ -0,0 +1,249 @@
+"""Geo module."""
+from numpy import asarray, arange, empty, concatenate, argsort, argpartition, \
+  searchsorted, repeat, cumsum, floor, clip, sqrt, sin, cos, arcsin, ptp, broadcast_to, \
+  flatnonzero
+from math import pi, ceil
+
+from .utils import throw, areGeographical, degreeToRadian, radianToDegree
+from .metrics import requiredKey
+from .kernels import haversineBatch
+
+'''
+  @abstract concatenates the integer ranges [starts[i], ends[i])
+
+  @param {Array} starts
+  @param {Array} ends
+  @return {Array}
+'''
+def spans(starts, ends):
+  lengths=ends - starts
+  total=lengths.sum()
+
+  return repeat(starts - cumsum(lengths) + lengths, lengths) + arange(total)
+
+'''
+  @abstract grid cell size, in degrees, such that cells over the bounding
+  box of the points hold about cell_load points on average
+
+  @param {Array} points
+  @param {Number} cell_load
+  @return {Number}
+'''
+def defaultCellSize(points, cell_load=64):
+  spread=max(ptp(points[:, 0]) * ptp(points[:, 1]), 1e-8)
+
+  return float(clip(sqrt(spread * cell_load / len(points)), 1e-4, 10))
+
+'''
+  @abstract geographical index which buckets latitude and longitude degrees
+  on a regular grid. Points are sorted by cell, such that the cells of a
+  latitude row within a query bounding box form a contiguous span; the
+  candidates on those spans are confirmed with the great-circle distance.
+
+  @param {Array} points
+  @param {Object} methodConfig
+  @param {Number} cell_size
+'''
+class GeoIndex:
+  def __init__(self, points, methodConfig={}, cell_size=None):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim != 2 or points.shape[1] != 2 or len(points) == 0):
+      emsg="Argument 'points' must be a non-empty (N, 2) array, received shape {0}!".format(\
+        points.shape
+      )
+      throw(emsg, TypeError)
+
+    invalid_rows=(~areGeographical(points)).sum()
+    if(invalid_rows > 0):
+      throw("{0} provided coordinate rows are not geographical!".format(invalid_rows), TypeError)
+
+    self.radius=requiredKey(methodConfig, 'radius')
+    self.cell_size=defaultCellSize(points) if cell_size is None else cell_size
+
+    if(self.cell_size <= 0):
+      throw("Argument 'cell_size' must be a positive number of degrees!", ValueError)
+
+    self.rows=ceil(180 / self.cell_size)
+    self.columns=ceil(360 / self.cell_size)
+
+    cells=self.cellRow(points[:, 0]) * self.columns + self.cellColumn(points[:, 1])
+
+    self.order=argsort(cells, kind='stable')
+    self.cells=cells[self.order]
+    self.radians=degreeToRadian(points[self.order])
+
+  def __len__(self):
+    return len(self.order)
+
+  def cellRow(self, latitudes):
+    return clip(floor((latitudes + 90) / self.cell_size), 0, self.rows - 1).astype(int)
+
+  def cellColumn(self, longitudes):
+    return clip(floor((longitudes + 180) / self.cell_size), 0, self.columns - 1).astype(int)
+
+  '''
+    @abstract occupied cells and the spans [starts, ends) of their points
+
+    @return {Array} cells, starts and ends
+  '''
+  def cellSpans(self):
+    starts=flatnonzero(concatenate(([True], self.cells[1:] != self.cells[:-1])))
+    ends=concatenate((starts[1:], [len(self)]))
+
+    return self.cells[starts], starts, ends
+
+  '''
+    @abstract latitude and longitude degrees of the centres of cells, whose
+    points lie within an angle of cell_size degrees of them
+
+    @param {Array} cells
+    @return {Array} latitudes and longitudes
+  '''
+  def cellCenters(self, cells):
+    rows, columns=divmod(cells, self.columns)
+
+    latitudes=clip(-90 + (rows + 0.5) * self.cell_size, -90, 90)
+    longitudes=clip(-180 + (columns + 0.5) * self.cell_size, -180, 180)
+
+    return latitudes, longitudes
+
+  '''
+    @abstract positions of the points within the bounding box of the
+    spherical cap of angle delta around point x, in degrees
+
+    @param {Array} x
+    @param {Number} delta
+    @return {Array}
+  '''
+  def candidates(self, x, delta):
+    if(delta >= pi):
+      return arange(len(self))
+
+    latitude, longitude=x
+    latitude_radian=degreeToRadian(latitude)
+    delta_degree=radianToDegree(delta)
+
+    rows=arange(
+      self.cellRow(max(latitude - delta_degree, -90)),
+      self.cellRow(min(latitude + delta_degree, 90)) + 1
+    )
+
+    # Caps over a pole span every longitude
+    if(latitude_radian + delta >= pi / 2 or latitude_radian - delta <= -pi / 2):
+      longitude_ranges=[(-180, 180)]
+
+    else:
+      delta_longitude=radianToDegree(arcsin(sin(delta) / cos(latitude_radian)))
+      lowest, highest=longitude - delta_longitude, longitude + delta_longitude
+
+      if(lowest < -180):
+        longitude_ranges=[(lowest + 360, 180), (-180, highest)]
+      elif(highest > 180):
+        longitude_ranges=[(lowest, 180), (-180, highest - 360)]
+      else:
+        longitude_ranges=[(lowest, highest)]
+
+    starts=[]
+    ends=[]
+    for lowest, highest in longitude_ranges:
+      starts.append(searchsorted(self.cells, rows * self.columns + self.cellColumn(lowest)))
+      ends.append(searchsorted(self.cells, rows * self.columns + self.cellColumn(highest) + 1))
+
+    return spans(concatenate(starts), concatenate(ends))
+
+  '''
+    @abstract positions and distances of the points within distance r of
+    point x, given in radians
+
+    @param {Array} x
+    @param {Array} x_radian
+    @param {Number} r
+    @return {Array}
+  '''
+  def within(self, x, x_radian, r):
+    positions=self.candidates(x, r / self.radius)
+    distances=haversineBatch(self.radians[positions], x_radian, self.radius)
+
+    inside=distances <= r
+
+    return positions[inside], distances[inside]
+
+  '''
+    @abstract indexed points within distance r of each row of points,
+    sorted by distance
+
+    @param {Array} points
+    @param {Number} r
+    @return {Array} lists of indices and distances, one entry per row
+  '''
+  def queryRadius(self, points, r):
+    points=self.queryPoints(points)
+    radii=broadcast_to(asarray(r, dtype=float), (len(points), ))
+
+    indices=[]
+    distances=[]
+    for x, x_radian, radius in zip(points, degreeToRadian(points), radii):
+      positions, point_distances=self.within(x, x_radian, radius)
+
+      nearest=argsort(point_distances, kind='stable')
+      indices.append(self.order[positions[nearest]])
+      distances.append(point_distances[nearest])
+
+    return indices, distances
+
+  '''
+    @abstract k nearest neighbours of each row of points, sorted by distance.
+    The search radius starts at one cell and doubles until it holds k
+    points, which are then the k nearest.
+
+    @param {Array} points
+    @param {Number} k
+    @return {Array} indices (Q, k) and distances (Q, k)
+  '''
+  def query(self, points, k=1):
+    points=self.queryPoints(points)
+
+    if(k < 1 or k > len(self)):
+      emsg="Argument 'k' must be between 1 and the number of indexed points {0}!".format(len(self))
+      throw(emsg, ValueError)
+
+    initial_radius=self.radius * degreeToRadian(self.cell_size)
+
+    indices=empty((len(points), k), dtype=int)
+    distances=empty((len(points), k))
+    for row, (x, x_radian) in enumerate(zip(points, degreeToRadian(points))):
+      r=initial_radius
+
+      while True:
+        positions, point_distances=self.within(x, x_radian, r)
+
+        if(len(positions) >= k or r >= pi * self.radius):
+          break
+
+        r*=2
+
+      nearest=argpartition(point_distances, k - 1)[:k]
+      nearest=nearest[argsort(point_distances[nearest], kind='stable')]
+
+      indices[row]=self.order[positions[nearest]]
+      distances[row]=point_distances[nearest]
+
+    return indices, distances
+
+  '''
+    @abstract checks query points are geographical
+
+    @param {Array} points
+    @return {Array}
+  '''
+  def queryPoints(self, points):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim == 1):
+      points=points[None, :]
+
+    if(points.ndim != 2 or points.shape[1] != 2 or not areGeographical(points).all()):
+      throw("Query points must be an (Q, 2) array of geographical coordinates!", TypeError)
+
+    return points
@@ -0,0 +1,220 @@
+"""Incremental module."""
+from numpy import asarray, empty, arange, isin
+from math import ceil
+
+from .utils import throw, floatDtype
+from .metrics import getMetric
+from .matrix import BLOCK_SIZE, tileShape, tiles
+from .parallel import evaluateTile
+
+'''
+  @abstract square distance matrix of a changing set of points. Appending
+  k points evaluates their k rows and columns only; removing points moves
+  the last points into the freed rows and columns, such that every update
+  costs O(k N) instead of O(N^2). Storage keeps spare capacity, grown by
+  factor growth when full, such that updates seldom reallocate.
+
+  As removals reorder points, every point gets a stable identifier on
+  append: row i of the matrix belongs to point ids[i].
+
+  @param {Array} points
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} capacity
+  @param {Number} growth
+  @param {Object} dtype
+  @param {Boolean} symmetric
+  @param {Number} block_size
+'''
+class IncrementalMatrix:
+  def __init__(self, points=None, method="euclidean", methodConfig={}, capacity=0, growth=2, \
+    dtype=float, symmetric=True, block_size=BLOCK_SIZE):
+    if(growth <= 1):
+      throw("Argument 'growth' must be a factor greater than 1!", ValueError)
+
+    self.metric=getMetric(method, **methodConfig)
+    self.dtype=floatDtype(dtype)
+    self.growth=growth
+    self.symmetric=symmetric
+    self.block_size=block_size
+
+    self.size=0
+    self.next_id=0
+    self.positions={}
+
+    self.dimension=None
+    self.buffer=empty((0, 0), dtype=self.dtype)
+    self.coordinates=empty((0, 0))
+    self.prepared=empty((0, 0), dtype=self.dtype)
+    self.identifiers=empty(0, dtype=int)
+
+    self.initial_capacity=capacity
+
+    if(points is not None):
+      self.append(points)
+
+  def __len__(self):
+    return self.size
+
+  def __repr__(self):
+    return "IncrementalMatrix({0} points, capacity {1}, method '{2}')".format(\
+      self.size, self.capacity, self.metric.name
+    )
+
+  @property
+  def capacity(self):
+    return len(self.buffer)
+
+  @property
+  def matrix(self):
+    return self.buffer[:self.size, :self.size]
+
+  @property
+  def points(self):
+    return self.coordinates[:self.size]
+
+  @property
+  def ids(self):
+    return self.identifiers[:self.size]
+
+  '''
+    @abstract positions of given point identifiers on the matrix
+
+    @param {Array} ids
+    @return {Array}
+  '''
+  def index(self, ids):
+    try:
+      return asarray([ self.positions[int(point_id)] for point_id in ids ], dtype=int)
+    except KeyError as error:
+      throw("Point identifier {0} not found!".format(error.args[0]), KeyError)
+
+  '''
+    @abstract grows storage to hold at least capacity points of given
+    coordinate and prepared dimensions, keeping current entries
+
+    @param {Number} capacity
+    @param {Number} d
+    @param {Number} prepared_d
+    @return
+  '''
+  def reserve(self, capacity, d, prepared_d):
+    if(capacity <= self.capacity):
+      return
+
+    n=self.size
+
+    buffer=empty((capacity, capacity), dtype=self.dtype)
+    coordinates=empty((capacity, d))
+    prepared=empty((capacity, prepared_d), dtype=self.dtype)
+    identifiers=empty(capacity, dtype=int)
+
+    if(n > 0):
+      buffer[:n, :n]=self.buffer[:n, :n]
+      coordinates[:n]=self.coordinates[:n]
+      prepared[:n]=self.prepared[:n]
+      identifiers[:n]=self.identifiers[:n]
+
+    self.buffer=buffer
+    self.coordinates=coordinates
+    self.prepared=prepared
+    self.identifiers=identifiers
+
+  '''
+    @abstract evaluates the block of distances between prepared rows of
+    positions rows and columns into the matrix, tile by tile
+
+    @param {slice} rows
+    @param {slice} columns
+    @return
+  '''
+  def evaluate(self, rows, columns):
+    A=self.prepared[rows]
+    B=self.prepared[columns]
+    result=self.buffer[rows, columns]
+
+    depth=self.metric.bufferDepth(A.shape[1])
+    tile_rows, tile_columns=tileShape(len(A), len(B), depth, self.block_size)
+
+    for tile in tiles(len(A), len(B), tile_rows, tile_columns):
+      evaluateTile(self.metric, A, B, result, tile)
+
+  '''
+    @abstract appends rows of points, evaluating their rows and columns only
+
+    @param {Array} points
+    @return {Array} identifiers of appended points
+  '''
+  def append(self, points):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim == 1):
+      points=points[None, :]
+
+    if(points.ndim != 2 or (self.dimension is not None and points.shape[1] != self.dimension)):
+      emsg="Argument 'points' must be a (k, d) array of the matrix dimension {0}, received {1}!"
+      throw(emsg.format(self.dimension, points.shape), TypeError)
+
+    self.metric.check(points)
+    prepared=self.metric.prepareAs(points, self.dtype)
+
+    n=self.size
+    total=n + len(points)
+
+    if(total > self.capacity):
+      capacity=max(total, ceil(self.capacity * self.growth), self.initial_capacity)
+      self.reserve(capacity, points.shape[1], prepared.shape[1])
+
+    ids=arange(self.next_id, self.next_id + len(points))
+
+    self.coordinates[n:total]=points
+    self.prepared[n:total]=prepared
+    self.identifiers[n:total]=ids
+
+    self.evaluate(slice(n, total), slice(0, total))
+
+    if(self.symmetric):
+      self.buffer[:n, n:total]=self.buffer[n:total, :n].T
+    else:
+      self.evaluate(slice(0, n), slice(n, total))
+
+    self.positions.update(zip(ids.tolist(), range(n, total)))
+    self.dimension=points.shape[1]
+    self.next_id+=len(points)
+    self.size=total
+
+    return ids
+
+  '''
+    @abstract removes points of given identifiers, moving the last points
+    into their rows and columns
+
+    @param {Array} ids
+    @return
+  '''
+  def remove(self, ids):
+    removed_ids=set(int(point_id) for point_id in ids)
+    removed=self.index(removed_ids)
+
+    n=self.size
+    remaining=n - len(removed)
+
+    holes=removed[removed < remaining]
+    tail=arange(remaining, n)
+    movers=tail[~isin(tail, removed)]
+
+    if(len(holes) > 0):
+      self.buffer[holes, :n]=self.buffer[movers, :n]
+      self.buffer[:n, holes]=self.buffer[:n, movers]
+
+      self.coordinates[holes]=self.coordinates[movers]
+      self.prepared[holes]=self.prepared[movers]
+      self.identifiers[holes]=self.identifiers[movers]
+
+    for point_id in removed_ids:
+      del self.positions[point_id]
+
+    for position in holes:
+      self.positions[int(self.identifiers[position])]=int(position)
+
+    self.size=remaining
@@ -0,0 +1,239 @@
+"""Instrument module."""
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+'''
+  Instrumentation is disabled by default, in which case instrumented
+  functions only pay for a flag lookup. Once enabled, every call of an
+  instrumented path records its method, number of evaluated elements and
+  latency, aggregated into a snapshot and handed to registered callbacks.
+  Errors raised through utils.throw are recorded as failures of the path
+  and method they were raised within.
+'''
+
+# Upper bounds, in seconds, of latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS=(1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1, 10)
+
+UNATTRIBUTED='unattributed'
+
+ENABLED=False
+
+callbacks=[]
+records={}
+lock=Lock()
+
+current_call=ContextVar('current_call', default=(UNATTRIBUTED, UNATTRIBUTED))
+
+'''
+  @abstract enables instrumentation, optionally registering a callback which
+  receives every recorded event as an object
+
+  @param {Function} callback
+  @return
+'''
+def enable(callback=None):
+  global ENABLED
+
+  if(callback is not None):
+    callbacks.append(callback)
+
+  ENABLED=True
+
+'''
+  @abstract disables instrumentation and unregisters callbacks, keeping
+  collected records
+
+  @return
+'''
+def disable():
+  global ENABLED
+
+  ENABLED=False
+  callbacks.clear()
+
+'''
+  @abstract whether instrumentation is enabled
+
+  @return {Boolean}
+'''
+def isEnabled():
+  return ENABLED
+
+'''
+  @abstract drops collected records
+
+  @return
+'''
+def reset():
+  with lock:
+    records.clear()
+
+'''
+  @abstract copy of collected records, as path -> method -> counters
+
+  @return {Object}
+'''
+def snapshot():
+  with lock:
+    return {
+      path: {
+        method: {
+          'calls': record['calls'],
+          'elements': record['elements'],
+          'seconds': record['seconds'],
+          'histogram': list(record['histogram']),
+          'failures': dict(record['failures'])
+        } for method, record in methods.items()
+      } for path, methods in records.items()
+    }
+
+'''
+  @abstract record of given path and method, created on first use
+
+  @param {String} path
+  @param {String} method
+  @return {Object}
+'''
+def entry(path, method):
+  methods=records.setdefault(path, {})
+
+  if(method not in methods):
+    methods[method]={
+      'calls': 0,
+      'elements': 0,
+      'seconds': 0.0,
+      'histogram': [0] * (len(LATENCY_BUCKETS) + 1),
+      'failures': {}
+    }
+
+  return methods[method]
+
+'''
+  @abstract hands an event to registered callbacks
+
+  @param {Object} event
+  @return
+'''
+def notify(event):
+  for callback in list(callbacks):
+    callback(event)
+
+'''
+  @abstract records a successful call of a path
+
+  @param {String} path
+  @param {String} method
+  @param {Number} elements
+  @param {Number} seconds
+  @return
+'''
+def recordCall(path, method, elements, seconds):
+  with lock:
+    record=entry(path, method)
+
+    record['calls']+=1
+    record['elements']+=elements
+    record['seconds']+=seconds
+    record['histogram'][bisect_left(LATENCY_BUCKETS, seconds)]+=1
+
+  notify({
+    'event': 'call', 'path': path, 'method': method, 'elements': elements, 'seconds': seconds
+  })
+
+'''
+  @abstract records an error raised within the current instrumented call
+
+  @param {Object} errorClass
+  @param {String} message
+  @return
+'''
+def recordFailure(errorClass, message):
+  path, method=current_call.get()
+  error=errorClass.__name__
+
+  with lock:
+    failures=entry(path, method)['failures']
+    failures[error]=failures.get(error, 0) + 1
+
+  notify({
+    'event': 'failure', 'path': path, 'method': method, 'error': error, 'message': message
+  })
+
+'''
+  @abstract name of a method given as a name or a Metric
+
+  @param {Object} method
+  @return {String}
+'''
+def methodName(method):
+  return method if isinstance(method, str) else getattr(method, 'name', repr(method))
+
+'''
+  @abstract evaluates function on args as a call of given path and method,
+  recording its latency and evaluated elements, i.e. the size of the 
+  result, or of its first item for tuples
+
+  @param {String} path
+  @param {Object} method
+  @param {Function} function
+  @param {Array} args
+  @param {Object} kwargs
+  @return {Object}
+'''
+def measure(path, method, function, args, kwargs={}):
+  method=methodName(method)
+  token=current_call.set((path, method))
+
+  try:
+    start=perf_counter()
+    result=function(*args, **kwargs)
+    seconds=perf_counter() - start
+
+  finally:
+    current_call.reset(token)
+
+  counted=result[0] if isinstance(result, tuple) else result
+  recordCall(path, method, getattr(counted, 'size', 1), seconds)
+
+  return result
+
+'''
+  @abstract whether a call of given path is being measured. Hot scalar 
+  functions check ENABLED inline, rather than through instrumented which
+  costs an extra call when disabled, and measure themselves on re-entry 
+  unless already measuring.
+
+  @param {String} path
+  @return {Boolean}
+'''
+def isMeasuring(path):
+  return current_call.get()[0] == path
+
+'''
+  @abstract decorates a function as an instrumented path, whose method is
+  the positional argument at method_position or keyword 'method'
+
+  @param {String} path
+  @param {Number} method_position
+  @return {Function}
+'''
+def instrumented(path, method_position):
+  def decorator(function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+      if(not ENABLED):
+        return function(*args, **kwargs)
+
+      if(len(args) > method_position):
+        method=args[method_position]
+      else:
+        method=kwargs.get('method', 'euclidean')
+
+      return measure(path, method, function, args, kwargs)
+
+    return wrapper
+
+  return decorator
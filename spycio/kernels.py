@@ -0,0 +1,277 @@
+"""Kernels module."""
+from numpy import asarray, absolute, amax, minimum, arccos, arcsin, sin, cos, clip, sqrt, \
+  where, errstate, broadcast_arrays, pi, Inf
+from numpy import sum as npsum, einsum, float64
+
+from .utils import throw, spherToCartBatch, degreeToRadian
+
+'''
+  Every batch kernel reduces over the last axis and broadcasts over the
+  remaining ones, such that an (N, d) pair of arrays yields an (N,) result.
+
+  Results agree with the scalar functions on spycio.spycio within a relative
+  tolerance of 1e-9 for the norm-based methods and an absolute tolerance of
+  1e-7 for the angle-based ones ('cosine', 'sphere' and 'geographical'), whose
+  cosines are clipped to [-1, 1] before arccos. The 'geographical' kernel
+  uses the haversine formula, which keeps full precision for nearby points
+  where the arccos of the scalar path loses it.
+
+  Kernels evaluate elementwise operations on the precision of their inputs,
+  while reductions over the last axis accumulate on float64. On float32
+  inputs, norm-based results hence hold a relative error of about d * 2^-24
+  from the elementwise differences, besides 2^-24 from storing them.
+'''
+
+'''
+  @abstract n-norm distance between rows of two arrays
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} p
+  @return {Array}
+'''
+def pNormDistanceBatch(X, Y, p):
+  if (p < 1):
+    throw("The exponent n must be a number greater or equal to 1!")
+
+  coordiff=absolute(X - Y)
+
+  if(p == Inf):
+    return amax(coordiff, axis=-1)
+  elif(p == 1):
+    return npsum(coordiff, axis=-1, dtype=float64)
+  elif(p == 2):
+    return sqrt(npsum(coordiff * coordiff, axis=-1, dtype=float64))
+  else:
+    return npsum(coordiff ** p, axis=-1, dtype=float64) ** (1 / p)
+
+'''
+  @abstract canberra distance between rows of two arrays.
+  Terms with null numerator and denominator contribute zero.
+
+  @param {Array} X
+  @param {Array} Y
+  @return {Array}
+'''
+def canberraBatch(X, Y):
+  numerator=absolute(X - Y)
+  denominator=absolute(X) + absolute(Y)
+
+  with errstate(divide='ignore', invalid='ignore'):
+    terms=where(denominator == 0, 0, numerator / denominator)
+
+  return npsum(terms, axis=-1, dtype=float64)
+
+'''
+  @abstract braycurtis distance between rows of two arrays
+
+  @param {Array} X
+  @param {Array} Y
+  @return {Array}
+'''
+def braycurtisBatch(X, Y):
+  numerator=npsum(absolute(X - Y), axis=-1, dtype=float64)
+  denominator=npsum(absolute(X + Y), axis=-1, dtype=float64)
+
+  with errstate(divide='ignore', invalid='ignore'):
+    return numerator / denominator
+
+'''
+  @abstract dot products between rows of two arrays on float64, without
+  the temporary array of their elementwise products
+
+  @param {Array} U
+  @param {Array} V
+  @return {Array}
+'''
+def rowDots(U, V):
+  return einsum('...i,...i->...', U, V, dtype=float64)
+
+'''
+  @abstract rows of an array scaled to unit norm, computed once per row on
+  float64, such that cosine kernels take plain dot products. Null rows
+  become NaN rows, which mask their distances instead of raising.
+
+  @param {Array} U
+  @return {Array}
+'''
+def unitRowsBatch(U):
+  U=asarray(U, dtype=float)
+  norms=sqrt(rowDots(U, U))[..., None]
+
+  with errstate(divide='ignore', invalid='ignore'):
+    return U * (1 / norms)
+
+'''
+  @abstract cosine of the angle between rows of two arrays of unit vectors
+
+  @param {Array} U
+  @param {Array} V
+  @return {Array}
+'''
+def unitCosnuvBatch(U, V):
+  return rowDots(U, V)
+
+'''
+  @abstract cosines of the angles between every row of A (M, d) and every
+  row of B (N, d), unit vectors, on a single matrix product. BLAS 
+  accumulates on the precision of the inputs, e.g. float32 ones hold a
+  relative error of about sqrt(d) * 2^-24.
+
+  @param {Array} A
+  @param {Array} B
+  @return {Array} (M, N)
+'''
+def unitCosnuvMatrix(A, B):
+  return A @ B.T
+
+'''
+  @abstract angle between rows of two arrays of unit vectors, e.g. rows
+  prepared by unitRowsBatch or spherToCartBatch
+
+  @param {Array} U
+  @param {Array} V
+  @return {Array}
+'''
+def unitArguvBatch(U, V):
+  return arccos(clip(rowDots(U, V), -1, 1))
+
+'''
+  @abstract distance between rows of two arrays of spherical coordinates.
+  Callers which reuse a point set should convert it once with 
+  spherToCartBatch(U, 1) and call unitArguvBatch instead.
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def nSphereDistanceBatch(X, Y, R):
+  return R * unitArguvBatch(spherToCartBatch(X, 1), spherToCartBatch(Y, 1))
+
+'''
+  @abstract great-circle distance between rows of two arrays of latitude
+  and longitude radians, on haversine formula
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def haversineBatch(X, Y, R):
+  latitudes_1=X[..., 0]
+  latitudes_2=Y[..., 0]
+
+  hav_theta=sin((latitudes_2 - latitudes_1) / 2) ** 2 + \
+    cos(latitudes_1) * cos(latitudes_2) * sin((Y[..., 1] - X[..., 1]) / 2) ** 2
+
+  return 2 * R * arcsin(sqrt(clip(hav_theta, 0, 1)))
+
+'''
+  @abstract distance between rows of two arrays of geographical coordinates,
+  in degrees
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def geographicalDistanceBatch(X, Y, R):
+  return haversineBatch(degreeToRadian(asarray(X, dtype=float)), \
+    degreeToRadian(asarray(Y, dtype=float)), R)
+
+'''
+  @abstract absolute longitude differences, in radians, between rows of two
+  arrays of latitude and longitude radians, taken the short way around
+
+  @param {Array} X
+  @param {Array} Y
+  @return {Array}
+'''
+def longitudeDifferenceBatch(X, Y):
+  differences=absolute(Y[..., 1] - X[..., 1])
+
+  return minimum(differences, 2 * pi - differences)
+
+'''
+  @abstract equirectangular approximation of the distance between rows of 
+  two arrays of latitude and longitude radians, within the error bound of
+  spycio.equirectangularDistance
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def equirectangularBatch(X, Y, R):
+  latitudes_1=X[..., 0]
+  latitudes_2=Y[..., 0]
+
+  x=longitudeDifferenceBatch(X, Y) * cos((latitudes_1 + latitudes_2) / 2)
+  y=latitudes_2 - latitudes_1
+
+  return R * sqrt(x * x + y * y)
+
+'''
+  @abstract local flat-earth approximation of the distance between rows of
+  two arrays prepared by geoToLocalBatch, whose third column caches the 
+  cosine of the latitude
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def flatEarthBatch(X, Y, R):
+  x=longitudeDifferenceBatch(X, Y) * (X[..., 2] + Y[..., 2]) / 2
+  y=Y[..., 0] - X[..., 0]
+
+  return R * sqrt(x * x + y * y)
+
+'''
+  @abstract flat-earth distance between rows of two arrays prepared by 
+  geoToLocalBatch, where its error bound stays within tolerance, and 
+  great-circle distance elsewhere, on haversine formula over cached cosines
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @param {Number} tolerance
+  @return {Array}
+'''
+def autoGeographicalBatch(X, Y, R, tolerance):
+  distances=asarray(flatEarthBatch(X, Y, R))
+
+  theta=distances / R
+  cos_phi=minimum(X[..., 2], Y[..., 2])
+
+  # Bounds theta^2 / (16 cos^2 phi) are compared multiplied out, safe at the poles
+  far=theta * theta > 16 * tolerance * cos_phi * cos_phi
+  far_count=far.sum()
+
+  if(far_count == 0):
+    return distances
+
+  # Mostly far pairs, e.g. matrices of scattered points, skip the gather
+  if(4 * far_count > far.size):
+    return where(far, cachedHaversineBatch(X, Y, R), distances)
+
+  X, Y=broadcast_arrays(X, Y)
+  distances[far]=cachedHaversineBatch(X[far], Y[far], R)
+
+  return distances
+
+'''
+  @abstract haversineBatch over arrays prepared by geoToLocalBatch, which 
+  reads latitude cosines off their third column
+
+  @param {Array} X
+  @param {Array} Y
+  @param {Number} R
+  @return {Array}
+'''
+def cachedHaversineBatch(X, Y, R):
+  hav_theta=sin((Y[..., 0] - X[..., 0]) / 2) ** 2 + \
+    X[..., 2] * Y[..., 2] * sin((Y[..., 1] - X[..., 1]) / 2) ** 2
+
+  return 2 * R * arcsin(sqrt(clip(hav_theta, 0, 1)))
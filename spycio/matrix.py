@@ -0,0 +1,284 @@
+"""Matrix module."""
+from numpy import asarray, empty, ndarray, nan
+from numpy.lib.format import open_memmap
+from math import isqrt, ceil
+from json import dump, load
+from os import path, remove, replace
+
+from .utils import throw, floatDtype
+from .instrument import instrumented
+from .metrics import getMetric
+from .parallel import TileRunner, workerCount
+from .speed import SpeedProfile, travelTimes
+
+'''
+  Default budget, in number of float entries, of the temporary
+  (rows, columns, d) buffer each tile broadcasts into: 2^20 entries (8 MB).
+'''
+BLOCK_SIZE=2 ** 20
+
+'''
+  @abstract tile shape whose (rows, columns, d) buffer fits on block_size entries
+
+  @param {Number} M
+  @param {Number} N
+  @param {Number} d
+  @param {Number} block_size
+  @return {Array}
+'''
+def tileShape(M, N, d, block_size=BLOCK_SIZE):
+  if(block_size < 1):
+    throw("Argument 'block_size' must be a positive number of entries!", ValueError)
+
+  entries=max(block_size // max(d, 1), 1)
+
+  rows=max(min(M, isqrt(entries)), 1)
+  columns=max(min(N, entries // rows), 1)
+
+  return rows, columns
+
+'''
+  @abstract yields (row, column) slices that cover an M x N matrix in tiles
+
+  @param {Number} M
+  @param {Number} N
+  @param {Number} rows
+  @param {Number} columns
+  @param {Number} first_row
+  @return {Generator}
+'''
+def tiles(M, N, rows, columns, first_row=0):
+  for row in range(first_row, M, rows):
+    for column in range(0, N, columns):
+      yield slice(row, min(row + rows, M)), slice(column, min(column + columns, N))
+
+'''
+  @abstract number of matrix rows already written on file, according to
+  its progress file. A missing progress file means a complete matrix.
+
+  @param {String} progress_path
+  @param {Array} shape
+  @return {Number}
+'''
+def readProgress(progress_path, shape):
+  if(not path.exists(progress_path)):
+    return shape[0]
+
+  with open(progress_path) as progress_file:
+    progress=load(progress_file)
+
+  if(tuple(progress['shape']) != tuple(shape)):
+    emsg="Progress file {0} refers to a {1} matrix, not {2}!".format(\
+      progress_path, tuple(progress['shape']), tuple(shape)
+    )
+    throw(emsg, ValueError)
+
+  return progress['rows']
+
+'''
+  @abstract atomically records the number of matrix rows written on file
+
+  @param {String} progress_path
+  @param {Number} rows
+  @param {Array} shape
+  @return
+'''
+def writeProgress(progress_path, rows, shape):
+  with open(progress_path + '.tmp', 'w') as progress_file:
+    dump({ 'rows': rows, 'shape': list(shape) }, progress_file)
+
+  replace(progress_path + '.tmp', progress_path)
+
+'''
+  @abstract resolves the output of an M x N matrix: an in-memory array when
+  out is None, the given array or memory map, or a .npy file opened as a
+  memory map. Memory-mapped outputs come with a progress file, from which
+  they are resumed when resume is set.
+
+  @param {Object} out
+  @param {Array} shape
+  @param {Boolean} resume
+  @param {Object} dtype
+  @return {Array} result, progress file path (or None) and first row to compute
+'''
+def matrixOutput(out, shape, resume=False, dtype=float):
+  if(out is None):
+    return empty(shape, dtype=dtype), None, 0
+
+  if(isinstance(out, ndarray)):
+    if(out.shape != shape):
+      emsg="Argument 'out' must have shape {0}, received {1}!".format(shape, out.shape)
+      throw(emsg, ValueError)
+
+    filename=getattr(out, 'filename', None)
+    if(filename is None):
+      return out, None, 0
+
+  else:
+    filename=str(out)
+    
+    if(resume and path.exists(filename)):
+      out=open_memmap(filename, mode='r+')
+
+      if(out.shape != shape):
+        emsg="File {0} holds a {1} matrix, not {2}!".format(filename, out.shape, shape)
+        throw(emsg, ValueError)
+
+    else:
+      out=open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+      resume=False
+
+  progress_path=filename + '.progress'
+  first_row=readProgress(progress_path, shape) if resume else 0
+
+  if(first_row < shape[0]):
+    writeProgress(progress_path, first_row, shape)
+
+  return out, progress_path, first_row
+
+'''
+  @abstract returns the M x N matrix of distances between rows of
+  arrays A (M, d) and B (N, d), computed tile by tile on given number 
+  of workers of given backend ('thread' or 'process').
+
+  The matrix is written into out, when given: an (M, N) array, a memory 
+  map or a path to a .npy file, which is then memory-mapped, such that the
+  matrix needs not fit in memory. Memory-mapped outputs are filled in bands
+  of rows, after each of which progress is flushed to a sidecar file 
+  '<filename>.progress'; with resume set, a partially written file is 
+  completed from its last band. The finished file is opened zero-copy with
+  numpy.load(filename, mmap_mode='r').
+
+  Entries are evaluated and stored on given floating dtype, e.g. float32 to
+  halve memory and bandwidth, while kernel reductions accumulate on float64;
+  a given out array keeps its own dtype. Geographical and sphere kernels
+  evaluate on float64 regardless, such that float32 results only hold the
+  relative rounding error of 2^-24 (about 1.2 m over 20000 km).
+
+  Coordinate rows are validated on given mode: 'raise' raises on any
+  invalid row, 'mask' returns NaN on rows and columns of invalid rows and
+  'skip' trusts every row.
+
+  @param {Array} A
+  @param {Array} B
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} block_size
+  @param {Number} workers
+  @param {String} backend
+  @param {Object} out
+  @param {Boolean} resume
+  @param {Object} dtype
+  @param {String} validate
+  @return {Array}
+'''
+@instrumented("distanceMatrix", 2)
+def distanceMatrix(A, B, method="euclidean", methodConfig={}, block_size=BLOCK_SIZE, \
+  workers=1, backend="thread", out=None, resume=False, dtype=float, validate="raise"):
+  dtype=floatDtype(dtype)
+  A=asarray(A, dtype=float)
+  B=asarray(B, dtype=float)
+
+  if(A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[1]):
+    emsg="Arguments must be (M, d) and (N, d) arrays, received {0} and {1}!".format(\
+      A.shape, B.shape
+    )
+    throw(emsg, TypeError)
+
+  metric=getMetric(method, **methodConfig)
+
+  invalid_A=metric.invalidRows(A, validate)
+  invalid_B=metric.invalidRows(B, validate)
+
+  prepared_A=metric.prepareAs(A, dtype)
+  prepared_B=metric.prepareAs(B, dtype)
+
+  M, d=prepared_A.shape
+  N=B.shape[0]
+  rows, columns=tileShape(M, N, metric.bufferDepth(d), block_size)
+
+  # Splits rows further, such that every worker gets tiles
+  workers=workerCount(workers)
+  if(workers > 1):
+    rows=max(min(rows, ceil(M / (4 * workers))), 1)
+
+  result, progress_path, first_row=matrixOutput(out, (M, N), resume, dtype)
+  band=max(M, 1) if progress_path is None else rows * workers
+
+  # Process workers fill a shared buffer of each band, which bounds its size
+  if(progress_path is None and backend == "process" and workers > 1):
+    band=rows * 4 * workers
+
+  runner=TileRunner(metric, method, methodConfig, prepared_A, prepared_B, workers, backend)
+
+  try:
+    for band_start in range(first_row, M, band):
+      band_stop=min(band_start + band, M)
+
+      runner.run(result, tiles(band_stop, N, rows, columns, band_start))
+
+      band_result=result[band_start:band_stop]
+
+      if(invalid_A is not None):
+        band_result[invalid_A[band_start:band_stop]]=nan
+
+      if(invalid_B is not None):
+        band_result[:, invalid_B]=nan
+
+      if(progress_path is not None):
+        result.flush()
+        writeProgress(progress_path, band_stop, (M, N))
+
+  finally:
+    runner.close()
+
+  if(progress_path is not None and path.exists(progress_path)):
+    remove(progress_path)
+
+  return result
+
+'''
+  @abstract returns the M x N matrix of travel times between rows of
+  arrays A (M, d) and B (N, d) at given speed: a number, an (M,) array of
+  per-origin speeds, an (M, N) array of per-pair speeds or a SpeedProfile.
+  Distances are converted in bands of rows within block_size entries.
+
+  @param {Object} average_speed
+  @param {Array} A
+  @param {Array} B
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} block_size
+  @param {Number} workers
+  @param {String} backend
+  @param {Object} dtype
+  @param {String} validate
+  @return {Array}
+'''
+@instrumented("travelTimeMatrix", 3)
+def travelTimeMatrix(average_speed, A, B, method="euclidean", methodConfig={}, \
+  block_size=BLOCK_SIZE, workers=1, backend="thread", dtype=float, validate="raise"):
+  result=distanceMatrix(A, B, method, methodConfig, block_size, workers, backend, \
+    dtype=dtype, validate=validate)
+  M, N=result.shape
+
+  speeds=average_speed
+  if(not isinstance(average_speed, SpeedProfile)):
+    speeds=asarray(average_speed, dtype=float)
+
+    if(speeds.ndim == 1 and len(speeds) == M):
+      speeds=speeds[:, None]
+    elif(speeds.ndim > 0 and speeds.shape != (M, N)):
+      emsg="Speeds must be a number, an ({0},) or an {1} array, received shape {2}!".format(\
+        M, (M, N), speeds.shape
+      )
+      throw(emsg, ValueError)
+
+  rows=max(block_size // max(N, 1), 1)
+  for row in range(0, M, rows):
+    band=slice(row, min(row + rows, M))
+    band_speeds=speeds if isinstance(speeds, SpeedProfile) or speeds.ndim == 0 else speeds[band]
+
+    result[band]=travelTimes(result[band], band_speeds)
+
+  return result
@@ -0,0 +1,411 @@
+"""Metrics module."""
+from numpy import asarray, arccos, clip, Inf, float64
+from warnings import warn
+
+from .utils import throw, hasKey, isSpherical, areSpherical, areGeographical, \
+  degreeToRadian, spherToCartBatch, geoToLocalBatch
+from .spycio import pNormDistance, cosnuv, arguv, canberraDistance, braycurtisDistance, \
+  nSphereDistance, geographicalDistance, equirectangularDistance, flatEarthDistance, \
+  autoGeographicalDistance, APPROXIMATION_TOLERANCE
+from .kernels import pNormDistanceBatch, canberraBatch, braycurtisBatch, unitRowsBatch, \
+  unitCosnuvBatch, unitCosnuvMatrix, unitArguvBatch, haversineBatch, equirectangularBatch, \
+  flatEarthBatch, autoGeographicalBatch
+
+'''
+  @abstract distance whose method dispatch and configuration lookup are
+  resolved once, at construction. Calling it evaluates the scalar form on
+  two points; its batch form evaluates a broadcasting kernel over the last
+  axis of two arrays and its check form raises on invalid coordinate rows,
+  which its valid form flags row-wise. Its optional pairwise form evaluates
+  every row pair of two prepared arrays at once, e.g. on a matrix product,
+  which matrix tiles take instead of broadcasting the kernel.
+  
+  The batch form applies the kernel to prepared arrays, such that callers 
+  which reuse an array across many kernel calls (e.g. matrix tiles) may 
+  prepare it once. Prepared arrays are cast to the requested dtype, unless
+  the metric sets its own precision, e.g. float64 for trigonometric kernels.
+
+  @param {String} name
+  @param {Function} scalar
+  @param {Function} kernel
+  @param {Function} check
+  @param {Function} prepare
+  @param {Object} precision
+  @param {Function} valid
+  @param {Function} pairwise
+'''
+class Metric:
+  __slots__=('name', 'scalar', 'kernel', 'check', 'prepare', 'precision', 'valid', 'pairwise')
+
+  def __init__(self, name, scalar, kernel, check=None, prepare=None, precision=None, \
+    valid=None, pairwise=None):
+    self.name=name
+    self.scalar=scalar
+    self.kernel=kernel
+    self.check=check if check is not None else noCheck
+    self.prepare=prepare if prepare is not None else noPrepare
+    self.precision=precision
+    self.valid=valid
+    self.pairwise=pairwise
+
+  def __call__(self, coordinate_1, coordinate_2):
+    return self.scalar(coordinate_1, coordinate_2)
+
+  def batch(self, X, Y):
+    return self.kernel(self.prepare(asarray(X, dtype=float)), self.prepare(asarray(Y, dtype=float)))
+
+  def prepareAs(self, U, dtype=float):
+    return self.prepare(U).astype(dtype if self.precision is None else self.precision, copy=False)
+
+  '''
+    @abstract distances between every row of prepared arrays A (M, d) and
+    B (N, d)
+
+    @param {Array} A
+    @param {Array} B
+    @return {Array} (M, N)
+  '''
+  def matrix(self, A, B):
+    if(self.pairwise is not None):
+      return self.pairwise(A, B)
+
+    return self.kernel(A[:, None, :], B[None, :, :])
+
+  '''
+    @abstract entries per row pair of the temporary buffer matrix takes on
+    d-dimensional prepared rows: d when broadcasting the kernel, none but
+    the result on a pairwise form
+
+    @param {Number} d
+    @return {Number}
+  '''
+  def bufferDepth(self, d):
+    return d if self.pairwise is None else 1
+
+  '''
+    @abstract validates rows of U on given mode: 'raise' raises on invalid
+    rows, 'mask' returns a mask of invalid rows (None if every row is valid)
+    and 'skip' trusts every row
+
+    @param {Array} U
+    @param {String} validate
+    @return {Array}
+  '''
+  def invalidRows(self, U, validate="raise"):
+    validateMode(validate)
+
+    if(validate == "raise"):
+      self.check(U)
+
+    elif(validate == "mask" and self.valid is not None):
+      invalid_rows=~self.valid(U)
+
+      if(invalid_rows.any()):
+        return invalid_rows
+
+    return None
+
+  def __repr__(self):
+    return "Metric('{name}')".format(name=self.name)
+
+'''
+  @abstract available metric factories, indexed by method name
+'''
+METRICS={}
+
+VALIDATE_MODES=['raise', 'mask', 'skip']
+
+notification_message="There must exist property '_placeholder_' on config argument 'methodConfig'!"
+
+'''
+  @abstract accepts any coordinate rows
+
+  @param {Array} U
+  @return
+'''
+def noCheck(U):
+  return None
+
+'''
+  @abstract keeps coordinate rows as they are
+
+  @param {Array} U
+  @return {Array}
+'''
+def noPrepare(U):
+  return U
+
+'''
+  @abstract builds a check which raises if any row of an array is invalid
+
+  @param {Function} areValid
+  @param {String} adjective
+  @return {Function}
+'''
+def rowsCheck(areValid, adjective):
+  def check(U):
+    invalid_rows=(~areValid(U)).sum()
+
+    if(invalid_rows > 0):
+      emsg="{0} provided coordinate rows are not {1}!".format(invalid_rows, adjective)
+      throw(emsg, TypeError)
+
+  return check
+
+'''
+  @abstract raises on an unknown validation mode
+
+  @param {String} validate
+  @return
+'''
+def validateMode(validate):
+  if(validate not in VALIDATE_MODES):
+    emsg="Validation \"{validate}\" not found among available modes: {modes}".format(\
+      validate=validate, modes=str(VALIDATE_MODES)
+    )
+    throw(emsg, TypeError)
+
+'''
+  @abstract returns config property key or raises
+
+  @param {Object} config
+  @param {String} key
+  @return {Object}
+'''
+def requiredKey(config, key):
+  if(not hasKey(config, key)):
+    throw(notification_message.replace("_placeholder_", key), TypeError)
+
+  return config[key]
+
+'''
+  @abstract registers a metric factory, which receives the method
+  configuration as keyword arguments and returns a Metric
+
+  @param {String} name
+  @param {Function} factory
+  @param {Array} aliases
+  @return {Function}
+'''
+def registerMetric(name, factory, aliases=()):
+  for key in (name, *aliases):
+    METRICS[key]=factory
+
+  return factory
+
+'''
+  @abstract returns the Metric of given method and configuration
+
+  @param {String} method
+  @param {Object} config
+  @return {Metric}
+'''
+def getMetric(method="euclidean", **config):
+  if(isinstance(method, Metric)):
+    return method
+
+  if(not hasKey(METRICS, method)):
+    emsg="Method \"{method}\" not found among available methods: {methods}".format(\
+      method=method, methods=str(list(METRICS.keys()))
+    )
+    throw(emsg, TypeError)
+
+  return METRICS[method](**config)
+
+'''
+  @abstract pNorm-based metric
+
+  @param {Object} config
+  @return {Metric}
+'''
+def pnormMetric(**config):
+  if (hasKey(config, "exponent")):
+    exponent=config['exponent']
+  else:
+    warn(notification_message.replace("_placeholder_", "exponent"), UserWarning)
+    exponent=2
+
+  if (exponent < 1):
+    throw("The exponent n must be a number greater or equal to 1!")
+
+  return Metric(
+    'pnorm',
+    lambda u, v: pNormDistance(u, v, exponent),
+    lambda X, Y: pNormDistanceBatch(X, Y, exponent)
+  )
+
+'''
+  @abstract parameterless metrics, which ignore the provided configuration
+
+  @param {Object} config
+  @return {Metric}
+'''
+def manhattanMetric(**config):
+  return Metric(
+    'manhattan',
+    lambda u, v: pNormDistance(u, v, 1),
+    lambda X, Y: pNormDistanceBatch(X, Y, 1)
+  )
+
+def euclideanMetric(**config):
+  return Metric(
+    'euclidean',
+    lambda u, v: pNormDistance(u, v, 2),
+    lambda X, Y: pNormDistanceBatch(X, Y, 2)
+  )
+
+def sqeuclideanMetric(**config):
+  return Metric(
+    'sqeuclidean',
+    lambda u, v: pNormDistance(u, v, 2) ** 2,
+    lambda X, Y: pNormDistanceBatch(X, Y, 2) ** 2
+  )
+
+def chebyshevMetric(**config):
+  return Metric(
+    'chebyshev',
+    lambda u, v: pNormDistance(u, v, Inf),
+    lambda X, Y: pNormDistanceBatch(X, Y, Inf)
+  )
+
+'''
+  @abstract cosine-based metrics, which normalize every point once on 
+  prepare, such that matrices take a single matrix product. Null vectors
+  get NaN distances on batch and matrix paths.
+
+  @param {Object} config
+  @return {Metric}
+'''
+def cosineMetric(**config):
+  return Metric(
+    'cosine',
+    lambda u, v: 1 - cosnuv(u, v, 2),
+    lambda X, Y: 1 - unitCosnuvBatch(X, Y),
+    prepare=unitRowsBatch,
+    pairwise=lambda A, B: 1 - unitCosnuvMatrix(A, B)
+  )
+
+def angularMetric(**config):
+  return Metric(
+    'angular',
+    lambda u, v: arguv(u, v, 2),
+    unitArguvBatch,
+    prepare=unitRowsBatch,
+    pairwise=lambda A, B: arccos(clip(unitCosnuvMatrix(A, B), -1, 1))
+  )
+
+def canberraMetric(**config):
+  return Metric('canberra', canberraDistance, canberraBatch)
+
+def braycurtisMetric(**config):
+  return Metric('braycurtis', braycurtisDistance, braycurtisBatch)
+
+'''
+  @abstract sphere-based metric, which requires property 'radius'
+
+  @param {Object} config
+  @return {Metric}
+'''
+def sphereMetric(**config):
+  radius=requiredKey(config, 'radius')
+  emsg="Provided coordinates are not spherical!"
+
+  def scalar(u, v):
+    if(not (isSpherical(u) and isSpherical(v))):
+      throw(emsg, TypeError)
+
+    return nSphereDistance(u, v, radius)
+
+  return Metric(
+    'sphere',
+    scalar,
+    lambda X, Y: radius * unitArguvBatch(X, Y),
+    rowsCheck(areSpherical, 'spherical'),
+    lambda U: spherToCartBatch(U, 1),
+    float64,
+    areSpherical,
+    lambda A, B: radius * arccos(clip(unitCosnuvMatrix(A, B), -1, 1))
+  )
+
+'''
+  @abstract geographical metric, which requires property 'radius'
+
+  @param {Object} config
+  @return {Metric}
+'''
+def geographicalMetric(**config):
+  radius=requiredKey(config, 'radius')
+
+  return Metric(
+    'geographical',
+    lambda u, v: geographicalDistance(u, v, radius),
+    lambda X, Y: haversineBatch(X, Y, radius),
+    rowsCheck(areGeographical, 'geographical'),
+    degreeToRadian,
+    float64,
+    areGeographical
+  )
+
+'''
+  @abstract approximate geographical metrics, which require property 
+  'radius', within the error bound documented on spycio.spycio. The auto
+  one takes optional property 'tolerance', the relative error allowed 
+  before it falls back to the great-circle distance.
+
+  @param {Object} config
+  @return {Metric}
+'''
+def equirectangularMetric(**config):
+  radius=requiredKey(config, 'radius')
+
+  return Metric(
+    'equirectangular',
+    lambda u, v: equirectangularDistance(u, v, radius),
+    lambda X, Y: equirectangularBatch(X, Y, radius),
+    rowsCheck(areGeographical, 'geographical'),
+    degreeToRadian,
+    float64,
+    areGeographical
+  )
+
+def flatEarthMetric(**config):
+  radius=requiredKey(config, 'radius')
+
+  return Metric(
+    'flatearth',
+    lambda u, v: flatEarthDistance(u, v, radius),
+    lambda X, Y: flatEarthBatch(X, Y, radius),
+    rowsCheck(areGeographical, 'geographical'),
+    geoToLocalBatch,
+    float64,
+    areGeographical
+  )
+
+def autoGeographicalMetric(**config):
+  radius=requiredKey(config, 'radius')
+  tolerance=config.get('tolerance', APPROXIMATION_TOLERANCE)
+
+  return Metric(
+    'autogeographical',
+    lambda u, v: autoGeographicalDistance(u, v, radius, tolerance),
+    lambda X, Y: autoGeographicalBatch(X, Y, radius, tolerance),
+    rowsCheck(areGeographical, 'geographical'),
+    geoToLocalBatch,
+    float64,
+    areGeographical
+  )
+
+registerMetric('pnorm', pnormMetric)
+registerMetric('manhattan', manhattanMetric, ('cityblock', ))
+registerMetric('euclidean', euclideanMetric)
+registerMetric('sqeuclidean', sqeuclideanMetric)
+registerMetric('chebyshev', chebyshevMetric, ('max', ))
+registerMetric('cosine', cosineMetric)
+registerMetric('angular', angularMetric)
+registerMetric('canberra', canberraMetric)
+registerMetric('braycurtis', braycurtisMetric)
+registerMetric('sphere', sphereMetric)
+registerMetric('geographical', geographicalMetric)
+registerMetric('equirectangular', equirectangularMetric)
+registerMetric('flatearth', flatEarthMetric)
+registerMetric('autogeographical', autoGeographicalMetric)
\ No newline at end of file
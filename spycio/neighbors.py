@@ -0,0 +1,310 @@
+"""Neighbors module."""
+from numpy import asarray, arange, empty, concatenate, argpartition, argsort, \
+  take_along_axis, broadcast_to, nonzero, lexsort, bincount, cumsum, flatnonzero, repeat, sqrt
+
+from .utils import throw, floatDtype, degreeToRadian, radianToDegree
+from .instrument import instrumented
+from .metrics import getMetric, requiredKey
+from .matrix import BLOCK_SIZE, tileShape
+from .kernels import pNormDistanceBatch, haversineBatch
+from .trees import KDTree, VPTree, minkowskiExponent
+from .geo import GeoIndex, spans, defaultCellSize
+
+# Leaf size of the k-d trees and average load of the grid cells of radius graphs
+GRAPH_LEAF_SIZE=32
+GRAPH_CELL_LOAD=16
+
+# Approximate geographical distances underestimate great circles by less than 20%
+APPROXIMATION_REACH=1.5
+
+GEOGRAPHICAL_METHODS=['geographical', 'equirectangular', 'flatearth', 'autogeographical']
+
+# Metrics without coordinate bounds, pruned on the triangle inequality of a vantage-point tree.
+# Methods 'angular' and 'sphere' compare blocks on their pairwise form instead, which outruns
+# the tree at every dimension
+VPTREE_METHODS=['canberra']
+
+'''
+  @abstract keeps the k nearest among current and candidate neighbours of each row
+
+  @param {Array} indices
+  @param {Array} distances
+  @param {Array} candidate_indices
+  @param {Array} candidate_distances
+  @param {Number} k
+  @return {Array}
+'''
+def mergeNearest(indices, distances, candidate_indices, candidate_distances, k):
+  indices=concatenate((indices, candidate_indices), axis=1)
+  distances=concatenate((distances, candidate_distances), axis=1)
+
+  if(distances.shape[1] > k):
+    nearest=argpartition(distances, k - 1, axis=1)[:, :k]
+
+    indices=take_along_axis(indices, nearest, axis=1)
+    distances=take_along_axis(distances, nearest, axis=1)
+
+  return indices, distances
+
+'''
+  @abstract brute-force k nearest neighbours of each row of queries among
+  rows of points, sorted by distance. Points are streamed in chunks and only
+  a running top-k is kept per query, such that memory does not grow with
+  the number of points.
+
+  @param {Array} queries
+  @param {Array} points
+  @param {Number} k
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} block_size
+  @param {Object} dtype
+  @return {Array} indices (Q, k) and distances (Q, k)
+'''
+@instrumented("knn", 3)
+def knn(queries, points, k=1, method="euclidean", methodConfig={}, block_size=BLOCK_SIZE, \
+  dtype=float):
+  dtype=floatDtype(dtype)
+  queries=asarray(queries, dtype=float)
+  points=asarray(points, dtype=float)
+
+  if(queries.ndim != 2 or points.ndim != 2 or queries.shape[1] != points.shape[1]):
+    emsg="Arguments must be (Q, d) and (N, d) arrays, received {0} and {1}!".format(\
+      queries.shape, points.shape
+    )
+    throw(emsg, TypeError)
+
+  if(k < 1 or k > len(points)):
+    emsg="Argument 'k' must be between 1 and the number of points {0}!".format(len(points))
+    throw(emsg, ValueError)
+
+  metric=getMetric(method, **methodConfig)
+
+  metric.check(queries)
+  metric.check(points)
+
+  prepared_queries=metric.prepareAs(queries, dtype)
+  prepared_points=metric.prepareAs(points, dtype)
+
+  Q, d=prepared_queries.shape
+  N=len(prepared_points)
+  rows, columns=tileShape(Q, N, metric.bufferDepth(d), block_size)
+
+  indices=empty((Q, k), dtype=int)
+  distances=empty((Q, k), dtype=dtype)
+
+  for row in range(0, Q, rows):
+    row_slice=slice(row, min(row + rows, Q))
+    row_count=row_slice.stop - row
+
+    nearest_indices=empty((row_count, 0), dtype=int)
+    nearest_distances=empty((row_count, 0))
+
+    for column in range(0, N, columns):
+      column_slice=slice(column, min(column + columns, N))
+
+      chunk_distances=metric.matrix(prepared_queries[row_slice], prepared_points[column_slice])
+      chunk_indices=broadcast_to(arange(column, column_slice.stop), chunk_distances.shape)
+
+      nearest_indices, nearest_distances=mergeNearest(
+        nearest_indices, nearest_distances, chunk_indices, chunk_distances, k
+      )
+
+    order=argsort(nearest_distances, axis=1, kind='stable')
+    indices[row_slice]=take_along_axis(nearest_indices, order, axis=1)
+    distances[row_slice]=take_along_axis(nearest_distances, order, axis=1)
+
+  return indices, distances
+
+'''
+  @abstract pairs of positions within distance r, evaluating each block of
+  rows [start, end) of data against its candidate positions only, in chunks
+  of at most block_size entries, on a matrix function of two sets of rows
+
+  @param {Function} matrix
+  @param {Array} data
+  @param {Array} blocks
+  @param {Number} r
+  @param {Number} block_size
+  @return {Array} rows, columns and distances
+'''
+def radiusEdges(matrix, data, blocks, r, block_size=BLOCK_SIZE):
+  rows, columns, distances=[empty(0, dtype=int)], [empty(0, dtype=int)], [empty(0)]
+
+  for start, end, candidates in blocks:
+    chunk=max(block_size // (end - start), 1)
+
+    for offset in range(0, len(candidates), chunk):
+      chunk_candidates=candidates[offset:offset + chunk]
+      chunk_distances=matrix(data[start:end], data[chunk_candidates])
+
+      chunk_rows, chunk_columns=nonzero(chunk_distances <= r)
+
+      rows.append(chunk_rows + start)
+      columns.append(chunk_candidates[chunk_columns])
+      distances.append(chunk_distances[chunk_rows, chunk_columns])
+
+  return concatenate(rows), concatenate(columns), concatenate(distances)
+
+'''
+  @abstract blocks of a k-d tree: its leaves, along with the points of the
+  leaves within distance r of their bounding boxes
+
+  @param {KDTree} tree
+  @param {Number} r
+  @return {Array}
+'''
+def treeBlocks(tree, r):
+  queries, leaves=tree.leafPairs(r)
+
+  grouped=argsort(queries, kind='stable')
+  queries=queries[grouped]
+  leaves=leaves[grouped]
+
+  bounds=flatnonzero(concatenate(([True], queries[1:] != queries[:-1], [True])))
+
+  for first, last in zip(bounds[:-1], bounds[1:]):
+    leaf=queries[first]
+    candidate_leaves=leaves[first:last]
+
+    yield tree.start[leaf], tree.end[leaf], \
+      spans(tree.start[candidate_leaves], tree.end[candidate_leaves])
+
+'''
+  @abstract blocks of a geographical index: its occupied cells, along with
+  the points of the cap of great-circle distance reach * r around them
+
+  @param {GeoIndex} index
+  @param {Number} r
+  @param {Number} reach
+  @return {Array}
+'''
+def cellBlocks(index, r, reach=1):
+  cells, starts, ends=index.cellSpans()
+  latitudes, longitudes=index.cellCenters(cells)
+
+  delta=reach * r / index.radius + degreeToRadian(index.cell_size)
+
+  for start, end, latitude, longitude in zip(starts, ends, latitudes, longitudes):
+    yield start, end, index.candidates((latitude, longitude), delta)
+
+'''
+  @abstract every pair of distinct rows of points within distance r, as a
+  compressed sparse row graph: the neighbours of row i are indices[j] at 
+  distances[j], for j from indptr[i] to indptr[i + 1], sorted by index.
+
+  Rows are evaluated in blocks against candidates only, such that work and
+  memory grow with the number of edges instead of N^2: p-norm methods prune
+  on the leaves of a k-d tree, and geographical points, approximate 
+  methods included, on the cells of a grid index, whose cells span at 
+  least r. Metric 'canberra' prunes on the triangle inequality of a 
+  vantage-point tree. Other methods evaluate blocks against every point, 
+  on O(N^2) work within O(block_size) memory: 'angular', 'sphere' and 
+  'cosine' on matrix products, which outrun a vantage-point tree at every
+  dimension, and 'braycurtis', which breaks the triangle inequality, along
+  with registered methods of unknown properties, on their kernels. Small leaves and cells keep 
+  blocks close to their neighbours, as every leaf or cell is a block.
+
+  @param {Array} points
+  @param {Number} r
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} block_size
+  @param {Number} leaf_size
+  @return {Array} indptr (N + 1,), indices (E,) and distances (E,)
+'''
+@instrumented("radiusGraph", 2)
+def radiusGraph(points, r, method="euclidean", methodConfig={}, block_size=BLOCK_SIZE, \
+  leaf_size=GRAPH_LEAF_SIZE):
+  points=asarray(points, dtype=float)
+
+  if(points.ndim != 2 or len(points) == 0):
+    emsg="Argument 'points' must be a non-empty (N, d) array, received shape {0}!".format(\
+      points.shape
+    )
+    throw(emsg, TypeError)
+
+  if(r < 0):
+    throw("Argument 'r' must be a non-negative distance!", ValueError)
+
+  N=len(points)
+
+  if(method in ('pnorm', 'manhattan', 'cityblock', 'euclidean', 'chebyshev', 'max')):
+    tree=KDTree(points, method, methodConfig, leaf_size)
+    exponent=minkowskiExponent(method, methodConfig)
+
+    rows, columns, distances=radiusEdges(
+      lambda X, Y: pNormDistanceBatch(X[:, None, :], Y[None, :, :], exponent), tree.data, \
+      treeBlocks(tree, r), r, block_size
+    )
+    order=tree.order
+
+  # Squared euclidean pairs within r are euclidean pairs within sqrt(r)
+  elif(method == 'sqeuclidean'):
+    tree=KDTree(points, 'euclidean', leaf_size=leaf_size)
+
+    rows, columns, distances=radiusEdges(
+      lambda X, Y: pNormDistanceBatch(X[:, None, :], Y[None, :, :], 2) ** 2, tree.data, \
+      treeBlocks(tree, sqrt(r)), r, block_size
+    )
+    order=tree.order
+
+  elif(method in GEOGRAPHICAL_METHODS):
+    metric=getMetric(method, **methodConfig)
+    radius=requiredKey(methodConfig, 'radius')
+
+    # Approximate distances within r lie within a wider great-circle cap
+    reach=1 if method == 'geographical' else APPROXIMATION_REACH
+
+    cell_size=None
+    if(points.shape[1] == 2):
+      cell_size=max(
+        defaultCellSize(points, GRAPH_CELL_LOAD), min(radianToDegree(reach * r / radius), 10)
+      )
+
+    index=GeoIndex(points, methodConfig, cell_size)
+
+    if(method == 'geographical'):
+      matrix=lambda X, Y: haversineBatch(X[:, None, :], Y[None, :, :], index.radius)
+      data=index.radians
+    else:
+      matrix=metric.matrix
+      data=metric.prepareAs(points)[index.order]
+
+    rows, columns, distances=radiusEdges(
+      matrix, data, cellBlocks(index, r, reach), r, block_size
+    )
+    order=index.order
+
+  elif(method in VPTREE_METHODS):
+    tree=VPTree(points, method, methodConfig, leaf_size)
+    neighbours, neighbour_distances=tree.queryRadius(points, r)
+
+    rows=repeat(arange(N), [ len(row_neighbours) for row_neighbours in neighbours ])
+    columns=concatenate(neighbours)
+    distances=concatenate(neighbour_distances)
+    order=arange(N)
+
+  else:
+    metric=getMetric(method, **methodConfig)
+    metric.check(points)
+
+    rows_per_block=max(min(block_size // N, N), 1)
+    blocks=[ \
+      (start, min(start + rows_per_block, N), arange(N)) for start in range(0, N, rows_per_block) \
+    ]
+
+    rows, columns, distances=radiusEdges(
+      metric.matrix, metric.prepareAs(points), blocks, r, block_size
+    )
+    order=arange(N)
+
+  distinct=rows != columns
+  rows=order[rows[distinct]]
+  columns=order[columns[distinct]]
+  distances=distances[distinct]
+
+  edges=lexsort((columns, rows))
+  indptr=concatenate(([0], cumsum(bincount(rows, minlength=N))))
+
+  return indptr, columns[edges], distances[edges]
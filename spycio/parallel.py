@@ -0,0 +1,321 @@
+"""Parallel module."""
+from numpy import ndarray, memmap, prod
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from warnings import catch_warnings, simplefilter
+from math import ceil
+from os import cpu_count
+from mmap import mmap
+
+from .utils import throw
+from .metrics import Metric, getMetric
+
+BACKENDS=['thread', 'process']
+
+'''
+  Work is split into tiles: a tile (row_slice, None) evaluates the rows
+  row_slice of a batch, while a tile (row_slice, column_slice) evaluates a
+  block of a matrix. Every backend evaluates the same tiles with the same
+  metric forms, hence results are identical to the single-threaded path.
+'''
+
+'''
+  @abstract evaluates a metric on a tile of prepared arrays A and B into
+  result: its kernel on batch tiles, its matrix form on matrix tiles. A
+  result which only holds rows from first on is written first rows higher.
+
+  @param {Metric} metric
+  @param {Array} A
+  @param {Array} B
+  @param {Array} result
+  @param {Array} tile
+  @param {Number} first
+  @return
+'''
+def evaluateTile(metric, A, B, result, tile, first=0):
+  row_slice, column_slice=tile
+  result_rows=slice(row_slice.start - first, row_slice.stop - first)
+
+  if(column_slice is None):
+    result[result_rows]=metric.kernel(A[row_slice], B[row_slice])
+  else:
+    result[result_rows, column_slice]=metric.matrix(A[row_slice], B[column_slice])
+
+'''
+  @abstract row tiles of an N-long batch, about four per worker
+
+  @param {Number} N
+  @param {Number} workers
+  @return {Array}
+'''
+def batchTiles(N, workers):
+  rows=max(ceil(N / (4 * workers)), 1)
+
+  return [ (slice(row, min(row + rows, N)), None) for row in range(0, N, rows) ]
+
+'''
+  @abstract number of workers, where None stands for every available core
+
+  @param {Number} workers
+  @return {Number}
+'''
+def workerCount(workers):
+  if(workers is None):
+    return cpu_count() or 1
+
+  if(workers < 1):
+    throw("Argument 'workers' must be a positive integer or None!", ValueError)
+
+  return workers
+
+'''
+  @abstract evaluates a group of tiles on a worker process, whose arrays
+  are attached from shared memory blocks described by (name, shape, dtype).
+  The result may instead be a memory-mapped file, described by 
+  (filename, offset, shape, dtype). A shared result only holds the rows
+  from first on.
+
+  @param {Array} task
+  @return
+'''
+def processTiles(task):
+  method, methodConfig, specs, result_spec, tiles, first=task
+
+  # The parent process already warned about the configuration
+  with catch_warnings():
+    simplefilter('ignore')
+    metric=getMetric(method, **methodConfig)
+
+  blocks=[ SharedMemory(name=spec[0]) for spec in specs ]
+
+  try:
+    arrays=[ \
+      ndarray(shape, dtype, buffer=block.buf) \
+      for block, (name, shape, dtype) in zip(blocks, specs) \
+    ]
+
+    if(result_spec is None):
+      A, B, result=arrays
+    else:
+      filename, offset, shape, dtype=result_spec
+
+      A, B=arrays
+      result=memmap(filename, dtype=dtype, mode='r+', offset=offset, shape=shape)
+
+    for tile in tiles:
+      evaluateTile(metric, A, B, result, tile, first)
+
+    if(isinstance(result, memmap)):
+      result.flush()
+
+    del A, B, result, arrays
+
+  finally:
+    for block in blocks:
+      block.close()
+
+'''
+  @abstract whether an array maps a whole file region, which worker
+  processes can map again on their own
+
+  @param {Array} result
+  @return {Boolean}
+'''
+def isFileMapped(result):
+  return isinstance(result, memmap) and isinstance(result.base, mmap) and \
+    result.filename is not None and result.flags.c_contiguous
+
+'''
+  @abstract evaluates tiles of prepared arrays A and B into results, on a
+  pool of workers which lives across runs until closed, e.g. over the bands
+  of a matrix. Backend 'thread' runs the kernels, which release the GIL, on
+  a thread pool. Backend 'process' runs them on a process pool, sharing A
+  and B through shared memory blocks, copied once, instead of pickling 
+  them; it requires a registered method name, which worker processes 
+  resolve again. Workers map results which are memory-mapped files again,
+  and fill other results through a shared buffer of the rows of each run,
+  such that memory grows with runs rather than with results.
+'''
+class TileRunner:
+  '''
+    @abstract creates a runner of tiles of A and B; pools and shared
+    memory blocks are only created once a run is split among workers
+
+    @param {Metric} metric
+    @param {Object} method
+    @param {Object} methodConfig
+    @param {Array} A
+    @param {Array} B
+    @param {Number} workers
+    @param {String} backend
+    @return
+  '''
+  def __init__(self, metric, method, methodConfig, A, B, workers=1, backend="thread"):
+    if(backend not in BACKENDS):
+      emsg="Backend \"{backend}\" not found among available backends: {backends}".format(\
+        backend=backend, backends=str(BACKENDS)
+      )
+      throw(emsg, TypeError)
+
+    self.metric=metric
+    self.method=method
+    self.methodConfig=methodConfig
+    self.A=A
+    self.B=B
+    self.workers=workerCount(workers)
+    self.backend=backend
+
+    if(backend == "process" and self.workers > 1 and isinstance(method, Metric)):
+      throw("Backend 'process' requires a registered method name, not a Metric!", TypeError)
+
+    self.executor=None
+    self.blocks=[]
+    self.specs=[]
+    self.buffer=None
+
+  '''
+    @abstract copies an array into a new shared memory block, described
+    by (name, shape, dtype)
+
+    @param {Array} array
+    @return {Array}
+  '''
+  def share(self, array):
+    block=SharedMemory(create=True, size=max(array.nbytes, 1))
+    self.blocks.append(block)
+
+    ndarray(array.shape, array.dtype, buffer=block.buf)[...]=array
+
+    return (block.name, array.shape, array.dtype.str)
+
+  '''
+    @abstract shared memory block of at least nbytes for run rows, reused
+    across runs unless too small
+
+    @param {Number} nbytes
+    @return {SharedMemory}
+  '''
+  def runBuffer(self, nbytes):
+    if(self.buffer is None or self.buffer.size < nbytes):
+      if(self.buffer is not None):
+        self.blocks.remove(self.buffer)
+        self.buffer.close()
+        self.buffer.unlink()
+
+      self.buffer=SharedMemory(create=True, size=max(nbytes, 1))
+      self.blocks.append(self.buffer)
+
+    return self.buffer
+
+  '''
+    @abstract evaluates tiles into result
+
+    @param {Array} result
+    @param {Array} tiles
+    @return {Array}
+  '''
+  def run(self, result, tiles):
+    tiles=list(tiles)
+
+    if(self.workers == 1 or len(tiles) <= 1):
+      for tile in tiles:
+        evaluateTile(self.metric, self.A, self.B, result, tile)
+
+    elif(self.backend == "thread"):
+      if(self.executor is None):
+        self.executor=ThreadPoolExecutor(self.workers)
+
+      def threadTile(tile):
+        evaluateTile(self.metric, self.A, self.B, result, tile)
+
+      list(self.executor.map(threadTile, tiles))
+
+    else:
+      self.runProcesses(result, tiles)
+
+    return result
+
+  '''
+    @abstract evaluates tiles into result on the process pool, which is
+    created along with the shared blocks of A and B on first use
+
+    @param {Array} result
+    @param {Array} tiles
+    @return
+  '''
+  def runProcesses(self, result, tiles):
+    if(self.executor is None):
+      self.specs=[ self.share(array) for array in (self.A, self.B) ]
+      self.executor=ProcessPoolExecutor(self.workers)
+
+    if(isFileMapped(result)):
+      result.flush()
+
+      specs=self.specs
+      result_spec=(result.filename, result.offset, result.shape, result.dtype.str)
+      buffer=None
+      first=0
+
+    # Workers fill the rows of this run only, copied into result once done
+    else:
+      first=min(row_slice.start for row_slice, _ in tiles)
+      last=max(row_slice.stop for row_slice, _ in tiles)
+
+      shape=(last - first,) + result.shape[1:]
+      block=self.runBuffer(int(prod(shape)) * result.dtype.itemsize)
+
+      specs=self.specs + [(block.name, shape, result.dtype.str)]
+      result_spec=None
+      buffer=ndarray(shape, result.dtype, buffer=block.buf)
+
+    groups=[ tiles[group::self.workers] for group in range(self.workers) ]
+    tasks=[ \
+      (self.method, self.methodConfig, specs, result_spec, group, first) \
+      for group in groups if group \
+    ]
+
+    list(self.executor.map(processTiles, tasks))
+
+    if(buffer is not None):
+      result[first:last]=buffer
+      del buffer
+
+  '''
+    @abstract shuts the pool down and releases shared memory blocks
+
+    @return
+  '''
+  def close(self):
+    if(self.executor is not None):
+      self.executor.shutdown()
+      self.executor=None
+
+    for block in self.blocks:
+      block.close()
+      block.unlink()
+
+    self.blocks=[]
+    self.buffer=None
+
+'''
+  @abstract evaluates tiles of prepared arrays A and B into result on a
+  TileRunner, closed once done
+
+  @param {Metric} metric
+  @param {Object} method
+  @param {Object} methodConfig
+  @param {Array} A
+  @param {Array} B
+  @param {Array} result
+  @param {Array} tiles
+  @param {Number} workers
+  @param {String} backend
+  @return {Array}
+'''
+def runTiles(metric, method, methodConfig, A, B, result, tiles, workers=1, backend="thread"):
+  runner=TileRunner(metric, method, methodConfig, A, B, workers, backend)
+
+  try:
+    return runner.run(result, tiles)
+  finally:
+    runner.close()
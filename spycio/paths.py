@@ -0,0 +1,164 @@
+"""Paths module."""
+from numpy import asarray, arange, zeros, empty, concatenate, cumsum, diff, searchsorted, \
+  float64
+
+from .utils import throw
+from .batch import distanceBatch
+
+'''
+  @abstract distances between consecutive rows of points, on a single
+  vectorized pass
+
+  @param {Array} points
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Object} dtype
+  @return {Array}
+'''
+def segmentDistances(points, method="euclidean", methodConfig={}, dtype=float):
+  if(len(points) < 2):
+    return zeros(0, dtype=dtype)
+
+  return distanceBatch(points[:-1], points[1:], method, methodConfig, dtype=dtype)
+
+'''
+  @abstract checks track offsets of N points: offsets[t] to offsets[t + 1]
+  are the rows of track t
+
+  @param {Array} offsets
+  @param {Number} N
+  @return {Array}
+'''
+def trackOffsets(offsets, N):
+  if(offsets is None):
+    return asarray([0, N])
+
+  offsets=asarray(offsets, dtype=int)
+
+  if(offsets.ndim != 1 or len(offsets) < 2 or offsets[0] != 0 or offsets[-1] != N \
+    or (diff(offsets) < 0).any()):
+    emsg="Offsets must increase from 0 to the number of points {0}!".format(N)
+    throw(emsg, ValueError)
+
+  return offsets
+
+'''
+  @abstract points as an (N, d) array
+
+  @param {Array} points
+  @return {Array}
+'''
+def pathPoints(points):
+  points=asarray(points, dtype=float)
+
+  if(points.ndim != 2):
+    throw("Argument 'points' must be an (N, d) array, received shape {0}!".format(\
+      points.shape
+    ), TypeError)
+
+  return points
+
+'''
+  @abstract distance travelled along points up to each of them, from the
+  first point of its track, given by offsets as for pathLength
+
+  @param {Array} points
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Array} offsets
+  @param {Object} dtype
+  @return {Array} (N,)
+'''
+def cumulativeDistance(points, method="euclidean", methodConfig={}, offsets=None, dtype=float):
+  points=pathPoints(points)
+  offsets=trackOffsets(offsets, len(points))
+
+  segments=segmentDistances(points, method, methodConfig, dtype)
+
+  # Segments which start a track join two distinct tracks
+  starts=offsets[1:-1]
+  segments[starts[(starts > 0) & (starts < len(points))] - 1]=0
+
+  cumulative=concatenate(([0], cumsum(segments, dtype=float64)))
+
+  track_starts=offsets[searchsorted(offsets, arange(len(points)), side='right') - 1]
+
+  return (cumulative - cumulative[track_starts]).astype(dtype, copy=False)
+
+'''
+  @abstract length of the polyline through consecutive rows of points.
+  Many tracks are given at once as ragged rows, by offsets such that track
+  t holds rows offsets[t] to offsets[t + 1], in which case a length is
+  returned per track.
+
+  @param {Array} points
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Array} offsets
+  @param {Object} dtype
+  @return {Object} a length, or an array of lengths of tracks
+'''
+def pathLength(points, method="euclidean", methodConfig={}, offsets=None, dtype=float):
+  points=pathPoints(points)
+  track_offsets=trackOffsets(offsets, len(points))
+
+  cumulative=cumulativeDistance(points, method, methodConfig, track_offsets, dtype)
+
+  # A track is as long as the distance travelled up to its last point
+  lengths=zeros(len(track_offsets) - 1, dtype=cumulative.dtype)
+  filled=diff(track_offsets) > 0
+  lengths[filled]=cumulative[track_offsets[1:][filled] - 1]
+
+  return lengths[0] if offsets is None else lengths
+
+'''
+  @abstract streaming path length: fixes of a track arrive in chunks, the
+  last fix of which is carried over to the next chunk
+
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Object} dtype
+'''
+class PathAccumulator:
+  def __init__(self, method="euclidean", methodConfig={}, dtype=float):
+    self.method=method
+    self.methodConfig=methodConfig
+    self.dtype=dtype
+
+    self.reset()
+
+  '''
+    @abstract starts a new track
+
+    @return
+  '''
+  def reset(self):
+    self.last=None
+    self.length=0.0
+    self.count=0
+
+  '''
+    @abstract appends a chunk of fixes to the track
+
+    @param {Array} points
+    @return {Array} distance travelled up to each fix of the chunk
+  '''
+  def update(self, points):
+    points=pathPoints(points)
+
+    if(len(points) == 0):
+      return empty(0, dtype=self.dtype)
+
+    carried=points if self.last is None else concatenate((self.last[None, :], points))
+    segments=segmentDistances(carried, self.method, self.methodConfig, self.dtype)
+
+    if(self.last is None):
+      segments=concatenate(([0], segments))
+
+    cumulative=self.length + cumsum(segments, dtype=float64)
+
+    self.last=points[-1].copy()
+    self.length=float(cumulative[-1])
+    self.count+=len(points)
+
+    return cumulative.astype(self.dtype, copy=False)
@@ -0,0 +1,66 @@
+"""Speed module."""
+from numpy import asarray, zeros, clip, diff, Inf
+
+from .utils import throw
+
+'''
+  @abstract distance-banded speed profile: the first bounds[0] of a leg are
+  travelled at speeds[0], the next ones up to bounds[1] at speeds[1], and so
+  on, the remainder beyond bounds[-1] at speeds[-1]. Short hops are hence
+  travelled at the first speeds, while travel time still grows with distance.
+
+  @param {Array} bounds
+  @param {Array} speeds
+'''
+class SpeedProfile:
+  def __init__(self, bounds, speeds):
+    self.bounds=asarray(bounds, dtype=float)
+    self.speeds=asarray(speeds, dtype=float)
+
+    if(self.bounds.ndim != 1 or len(self.speeds) != len(self.bounds) + 1):
+      throw("A speed profile requires one speed more than distance bounds!", ValueError)
+
+    if((self.bounds <= 0).any() or (diff(self.bounds) <= 0).any()):
+      throw("Distance bounds must be positive and increasing!", ValueError)
+
+    if((self.speeds <= 0).any()):
+      throw("Speeds must be positive!", ValueError)
+
+  def __repr__(self):
+    return "SpeedProfile({0}, {1})".format(self.bounds.tolist(), self.speeds.tolist())
+
+  '''
+    @abstract travel times of given distances
+
+    @param {Array} distances
+    @return {Array}
+  '''
+  def travelTime(self, distances):
+    distances=asarray(distances, dtype=float)
+    times=zeros(distances.shape)
+
+    lower=0
+    for upper, speed in zip((*self.bounds, Inf), self.speeds):
+      times+=clip(distances - lower, 0, upper - lower) / speed
+      lower=upper
+
+    return times
+
+'''
+  @abstract travel times of given distances at given speed: a number, an
+  array broadcastable against distances or a SpeedProfile
+
+  @param {Array} distances
+  @param {Object} average_speed
+  @return {Array}
+'''
+def travelTimes(distances, average_speed):
+  if(isinstance(average_speed, SpeedProfile)):
+    return average_speed.travelTime(distances)
+
+  speeds=asarray(average_speed, dtype=float)
+
+  if((speeds <= 0).any()):
+    throw("Speeds must be positive!", ValueError)
+
+  return distances / speeds
@@ -1,10 +1,14 @@
 """Main module."""
-from numpy import dot, max, abs, arccos, arcsin, sqrt, Inf
+from math import acos, asin, sqrt, hypot, cos, radians, pi, inf as Inf
 from functools import reduce
 from warnings import warn
 
 from .utils import hav, spherToCart, isSpherical, \
-  isGeographical, throw, hasKey, geoToSpher
+  isGeographical, throw, hasKey
+from . import instrument
+
+# Default relative error tolerated by 'autogeographical' before it falls back to great circles
+APPROXIMATION_TOLERANCE=1e-6
 
 '''
   @abstract n-norm of a number
@@ -30,11 +34,19 @@ def pNormDistance(coordinate_1, coordinate_2, p):
   if (p < 1):
     throw("The exponent n must be a number greater or equal to 1!")
 
-  def diffAbsFun(coords):
-    return abs(coords[0] - coords[1])
-  coordiff=list(map(diffAbsFun, zip(coordinate_1, coordinate_2)))
+  coordiff=[ abs(x_1 - x_2) for x_1, x_2 in zip(coordinate_1, coordinate_2) ]
+
+  if(p == Inf):
+    return max(coordiff)
+
+  # Common exponents skip the generic power sum
+  if(p == 1):
+    return sum(coordiff)
+
+  if(p == 2):
+    return hypot(*coordiff)
 
-  return max(coordiff) if p == Inf else pNorm(coordiff, p)
+  return pNorm(coordiff, p)
 
 '''
   @abstract returns the central angle between two coordinate points on a sphere
@@ -55,9 +67,9 @@ def sphereCentralAngle(coordinate_1, coordinate_2):
   aux_2=hav(longitude_2 - longitude_1)
   aux_3=hav(latitude_2 - latitude_1)
   
-  hav_theta=aux_3 + aux_2 * aux_1
+  hav_theta=min(max(aux_3 + aux_2 * aux_1, 0), 1)
 
-  return 2 * arcsin(sqrt(hav_theta))
+  return 2 * asin(sqrt(hav_theta))
 
 '''
   @abstract vector argument based on n-norm
@@ -68,12 +80,15 @@ def sphereCentralAngle(coordinate_1, coordinate_2):
   @return {Number}
 '''
 def cosnuv(u, v, n):
-  if(pNorm(u, n)==0 or pNorm(v, n)==0):
+  norm_u=pNorm(u, n)
+  norm_v=pNorm(v, n)
+
+  if(norm_u==0 or norm_v==0):
     msg='Method \'cosine\' does not support a null vector.'
     throw(msg, ZeroDivisionError)
   
   else:
-    return dot(u, v) / (pNorm(u, n) * pNorm(v, n))
+    return sum([ u_i * v_i for u_i, v_i in zip(u, v) ]) / (norm_u * norm_v)
 
 '''
   @abstract vector argument based on n-norm
@@ -84,7 +99,8 @@ def cosnuv(u, v, n):
   @return {Number}
 '''
 def arguv(u, v, n):
-  return arccos(cosnuv(u, v, n))
+  # Rounding may push the cosine of close vectors slightly beyond 1
+  return acos(min(max(cosnuv(u, v, n), -1), 1))
 
 '''
   @abstract returns the central angle between two coordinate points on a sphere
@@ -119,6 +135,196 @@ def greatCircleDistance(coord_1, coord_2, R):
 def nSphereDistance(coord_1, coord_2, R):
   return R * centralAngle(coord_1, coord_2, R)   
 
+'''
+  @abstract returns the canberra distance of two points
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @return {Number}
+'''
+def canberraDistance(coordinate_1, coordinate_2):
+  def add_lambda(acc, x):
+    return (acc + x)
+  def canberra_lambda(x_i):
+    denominator=abs(x_i[0]) + abs(x_i[1])
+
+    # Coordinates null on both points count as 0, as on canberraBatch
+    return (abs(x_i[0] - x_i[1]) / denominator) if denominator else 0.0
+  
+  return reduce(add_lambda, map(canberra_lambda, zip(coordinate_1, coordinate_2)))
+
+'''
+  @abstract returns the braycurtis distance of two points
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @return {Number}
+'''
+def braycurtisDistance(coordinate_1, coordinate_2):
+  def braycurtis_numerator_lambda(acc, x_i):
+    return (acc + abs(x_i[0] - x_i[1]))
+  def braycurtis_denominator_lambda(acc, x_i):
+    return (acc + abs(x_i[0] + x_i[1]))
+  
+  coords_zip=zip(coordinate_1, coordinate_2)
+  numerator=reduce(braycurtis_numerator_lambda, coords_zip, 0)
+
+  coords_zip=zip(coordinate_1, coordinate_2)
+  denominator=reduce(braycurtis_denominator_lambda, coords_zip, 0)
+
+  return numerator/denominator
+
+'''
+  @abstract raises unless both coordinates are geographical
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @return
+'''
+def checkGeographical(coordinate_1, coordinate_2):
+  coordinate_1_is_geographical=isGeographical(coordinate_1)
+  coordinate_2_is_geographical=isGeographical(coordinate_2)
+  
+  if(coordinate_1_is_geographical and coordinate_2_is_geographical):
+    return
+  
+  both_are_not_geographical=not coordinate_1_is_geographical and not coordinate_2_is_geographical
+
+  subject='Both provided coordinates' if both_are_not_geographical \
+    else (\
+      'Provided coordinate 1' if not coordinate_1_is_geographical \
+      else 'Provided coordinate 2'
+    )
+  verb= 'are' if both_are_not_geographical else 'is'
+
+  emsg="{subject} {verb} not geographical!".format(subject=subject, verb=verb)
+  
+  throw(emsg, TypeError)
+
+'''
+  @abstract returns the distance of two geographical points on a sphere, on
+  haversine formula as haversineBatch, which keeps its precision at short
+  distances
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {Number} R
+  @return {Number}
+'''
+def geographicalDistance(coordinate_1, coordinate_2, R):
+  checkGeographical(coordinate_1, coordinate_2)
+
+  latitude_1=radians(coordinate_1[0])
+  latitude_2=radians(coordinate_2[0])
+
+  hav_theta=hav(latitude_2 - latitude_1) + \
+    cos(latitude_1) * cos(latitude_2) * hav(radians(coordinate_2[1]) - radians(coordinate_1[1]))
+
+  return 2 * R * asin(sqrt(min(max(hav_theta, 0), 1)))
+
+'''
+  Approximate geographical distances project a pair of points on a plane,
+  which skips the arcsine of the great-circle formula. Against the 
+  great-circle distance, their relative error stays below 
+  theta^2 / (16 cos^2 phi), theta being the central angle (distance over
+  radius) and phi the largest absolute latitude of the pair, e.g. below:
+
+    |latitude|   1 km     10 km    100 km   1000 km
+    <= 60 deg    6e-9     6e-7     6e-5     6e-3
+    <= 80 deg    5e-8     5e-6     5e-4     5e-2
+
+  The bound blows up towards the poles, where longitudes converge.
+'''
+
+'''
+  @abstract longitude difference, in radians, wrapped into [-pi, pi)
+ 
+  @param {Number} lng_1
+  @param {Number} lng_2
+  @return {Number}
+'''
+def longitudeDifference(lng_1, lng_2):
+  return (lng_2 - lng_1 + pi) % (2 * pi) - pi
+
+'''
+  @abstract returns the equirectangular approximation of the distance of 
+  two geographical points, which scales longitudes by the cosine of the 
+  mean latitude
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {Number} R
+  @return {Number}
+'''
+def equirectangularDistance(coordinate_1, coordinate_2, R):
+  checkGeographical(coordinate_1, coordinate_2)
+
+  latitude_1=radians(coordinate_1[0])
+  latitude_2=radians(coordinate_2[0])
+
+  x=longitudeDifference(radians(coordinate_1[1]), radians(coordinate_2[1])) * \
+    cos((latitude_1 + latitude_2) / 2)
+
+  return R * hypot(x, latitude_2 - latitude_1)
+
+'''
+  @abstract returns the local flat-earth approximation of the distance of 
+  two geographical points, which scales longitudes by the mean cosine of 
+  both latitudes. Given those cosines, e.g. cached once per point by batch
+  and matrix paths, it takes no trigonometric call at all.
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {Number} R
+  @return {Number}
+'''
+def flatEarthDistance(coordinate_1, coordinate_2, R):
+  checkGeographical(coordinate_1, coordinate_2)
+
+  latitude_1=radians(coordinate_1[0])
+  latitude_2=radians(coordinate_2[0])
+
+  x=longitudeDifference(radians(coordinate_1[1]), radians(coordinate_2[1])) * \
+    (cos(latitude_1) + cos(latitude_2)) / 2
+
+  return R * hypot(x, latitude_2 - latitude_1)
+
+'''
+  @abstract whether the error bound of an approximate central angle between
+  points of given latitude cosines stays within tolerance
+ 
+  @param {Number} theta
+  @param {Number} cos_1
+  @param {Number} cos_2
+  @param {Number} tolerance
+  @return {Boolean}
+'''
+def withinTolerance(theta, cos_1, cos_2, tolerance):
+  cos_phi=min(cos_1, cos_2)
+
+  # Bound theta^2 / (16 cos^2 phi) multiplied out, safe at the poles
+  return theta * theta <= 16 * tolerance * cos_phi * cos_phi
+
+'''
+  @abstract returns the local flat-earth distance of two geographical 
+  points should its error bound stay within tolerance, and their 
+  great-circle distance otherwise
+ 
+  @param {Array} coordinate_1
+  @param {Array} coordinate_2
+  @param {Number} R
+  @param {Number} tolerance
+  @return {Number}
+'''
+def autoGeographicalDistance(coordinate_1, coordinate_2, R, tolerance=APPROXIMATION_TOLERANCE):
+  approximation=flatEarthDistance(coordinate_1, coordinate_2, R)
+
+  is_close=withinTolerance(
+    approximation / R, cos(radians(coordinate_1[0])), cos(radians(coordinate_2[0])), tolerance
+  )
+
+  return approximation if is_close else geographicalDistance(coordinate_1, coordinate_2, R)
+
 '''
   @abstract returns the distance of two points based on
  
@@ -129,6 +335,11 @@ def nSphereDistance(coord_1, coord_2, R):
   @return {Number}
 '''
 def distance(coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
+  if(instrument.ENABLED and not instrument.isMeasuring("distance")):
+    return instrument.measure(
+      "distance", method, distance, (coordinate_1, coordinate_2, method, methodConfig)
+    )
+
   notification_message="There must exist property '_placeholder_' on config argument 'methodConfig'!"
   
   # pNorm-based distance
@@ -153,29 +364,17 @@ def distance(coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
   elif(method=="cosine"):
     return 1-cosnuv(coordinate_1, coordinate_2, 2)
   
+  # Angle between vectors
+  elif(method=="angular"):
+    return arguv(coordinate_1, coordinate_2, 2)
+
   # Canberra distance
   elif(method=="canberra"):
-    def add_lambda(acc, x):
-      return (acc + x)
-    def canberra_lambda(x_i):
-      return (abs(x_i[0] - x_i[1]) / (abs(x_i[0]) + abs(x_i[1])))
-    
-    return reduce(add_lambda, map(canberra_lambda, zip(coordinate_1, coordinate_2)))
+    return canberraDistance(coordinate_1, coordinate_2)
   
   # Braycurtis distance
   elif(method=="braycurtis"):
-    def braycurtis_numerator_lambda(acc, x_i):
-      return (acc + abs(x_i[0] - x_i[1]))
-    def braycurtis_denominator_lambda(acc, x_i):
-      return (acc + abs(x_i[0] + x_i[1]))
-    
-    coords_zip=zip(coordinate_1, coordinate_2)
-    numerator=reduce(braycurtis_numerator_lambda, coords_zip, 0)
-
-    coords_zip=zip(coordinate_1, coordinate_2)
-    denominator=reduce(braycurtis_denominator_lambda, coords_zip, 0)
-
-    return numerator/denominator
+    return braycurtisDistance(coordinate_1, coordinate_2)
 
   # 2-Norm-based distance
   elif(method=="euclidean"):
@@ -205,41 +404,35 @@ def distance(coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
   
   # Sphere-based distance
   elif(method=="geographical"):
-    coordinate_1_is_geographical=isGeographical(coordinate_1)
-    coordinate_2_is_geographical=isGeographical(coordinate_2)
-    are_geographical=coordinate_1_is_geographical and coordinate_2_is_geographical
-    both_are_not_geographical=not coordinate_1_is_geographical and not coordinate_2_is_geographical
-    
     has_radius_key=hasKey(methodConfig, "radius")
 
     emsg1=notification_message.replace("_placeholder_", "radius")
     
-    subject='Both provided coordinates' if both_are_not_geographical \
-      else (\
-        'Provided coordinate 1' if not coordinate_1_is_geographical \
-        else ( \
-          'Provided coordinate 2' if not coordinate_2_is_geographical \
-          else 'None'
-        ) 
-      )
-    verb= 'are' if both_are_not_geographical else 'is'
-
-    emsg2="{subject} {verb} not geographical!".format(subject=subject, verb=verb)
-    
     return throw(emsg1, TypeError) if not has_radius_key \
-      else ( \
-        throw(emsg2, TypeError) if not are_geographical \
-        else nSphereDistance(
-        geoToSpher(coordinate_1[0], coordinate_1[1]), \
-        geoToSpher(coordinate_2[0], coordinate_2[1]), \
-        methodConfig['radius']
-      ) 
-      )
+      else geographicalDistance(coordinate_1, coordinate_2, methodConfig['radius'])
+
+  # Approximate geographical distances
+  elif(method in ("equirectangular", "flatearth", "autogeographical")):
+    if(not hasKey(methodConfig, "radius")):
+      throw(notification_message.replace("_placeholder_", "radius"), TypeError)
+
+    radius=methodConfig['radius']
+
+    if(method=="equirectangular"):
+      return equirectangularDistance(coordinate_1, coordinate_2, radius)
+
+    if(method=="flatearth"):
+      return flatEarthDistance(coordinate_1, coordinate_2, radius)
+
+    tolerance=methodConfig.get('tolerance', APPROXIMATION_TOLERANCE)
+
+    return autoGeographicalDistance(coordinate_1, coordinate_2, radius, tolerance)
 
   # Complains on unknown method
   else:
-    methods=['pnorm', 'cosine', 'sqeuclidean', 'euclidean', 'manhattan', 
-             'cityblock', 'max', 'chebyshev', 'sphere', 'geographical']
+    methods=['pnorm', 'cosine', 'angular', 'sqeuclidean', 'euclidean', 'manhattan', 
+             'cityblock', 'max', 'chebyshev', 'sphere', 'geographical',
+             'equirectangular', 'flatearth', 'autogeographical']
     emsg="Method \"{method}\" not found among available methods: {methods}".format(\
       method=method, methods=str(methods)
     )
@@ -255,4 +448,8 @@ def distance(coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
   @return {Number}
 '''
 def travelTime( average_speed, coordinate_1, coordinate_2, method="euclidean", methodConfig={}):
+    if(instrument.ENABLED and not instrument.isMeasuring("travelTime")):
+      return instrument.measure("travelTime", method, travelTime, \
+        (average_speed, coordinate_1, coordinate_2, method, methodConfig))
+
     return distance(coordinate_1, coordinate_2, method, methodConfig) / average_speed
@@ -0,0 +1,133 @@
+"""Stream module."""
+from numpy import asarray, column_stack
+from itertools import islice, tee
+from csv import reader
+
+from .utils import throw
+from .metrics import getMetric
+from .speed import travelTimes
+
+'''
+  Default number of rows read, computed and written at once
+'''
+CHUNK_SIZE=100000
+
+'''
+  @abstract reads non-empty delimited rows in chunks of chunk_size lists of
+  fields, as written on input
+
+  @param {File} handle
+  @param {Number} chunk_size
+  @param {String} delimiter
+  @return {Generator}
+'''
+def readRows(handle, chunk_size=CHUNK_SIZE, delimiter=','):
+  if(chunk_size < 1):
+    throw("Argument 'chunk_size' must be a positive integer!", ValueError)
+
+  rows=( row for row in reader(handle, delimiter=delimiter) if row )
+
+  while True:
+    chunk=list(islice(rows, chunk_size))
+
+    if(not chunk):
+      return
+
+    yield chunk
+
+'''
+  @abstract reads delimited rows of numbers in chunks of (chunk_size, columns)
+  arrays, such that memory does not grow with the file
+
+  @param {File} handle
+  @param {Number} chunk_size
+  @param {String} delimiter
+  @return {Generator}
+'''
+def readChunks(handle, chunk_size=CHUNK_SIZE, delimiter=','):
+  for chunk in readRows(handle, chunk_size, delimiter):
+    yield asarray(chunk, dtype=float)
+
+'''
+  @abstract splits chunks of rows with origin and destination coordinates
+  side by side, i.e. (N, 2 d) arrays, into pairs of (N, d) arrays
+
+  @param {Generator} chunks
+  @return {Generator}
+'''
+def splitPairs(chunks):
+  for chunk in chunks:
+    if(chunk.ndim != 2 or chunk.shape[1] % 2 != 0):
+      emsg="Rows must hold origin and destination coordinates side by side, received {0} columns!"
+      throw(emsg.format(chunk.shape[-1]), TypeError)
+
+    dimension=chunk.shape[1] // 2
+
+    yield chunk[:, :dimension], chunk[:, dimension:]
+
+'''
+  @abstract computes distances, and travel times when average_speed is given,
+  of each chunk of coordinate pairs with a single vectorized call. The
+  speed may be a number or a SpeedProfile.
+
+  @param {Generator} pairs
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} average_speed
+  @return {Generator} origins, destinations, distances and travel times (or None)
+'''
+def streamDistances(pairs, method="euclidean", methodConfig={}, average_speed=None):
+  metric=getMetric(method, **methodConfig)
+
+  for origins, destinations in pairs:
+    metric.check(origins)
+    metric.check(destinations)
+
+    distances=metric.batch(origins, destinations)
+    times=None if average_speed is None else travelTimes(distances, average_speed)
+
+    yield origins, destinations, distances, times
+
+'''
+  @abstract reads coordinate pairs from delimited input, writes them back
+  followed by their distance and travel time, chunk by chunk. Input fields
+  are written back as read, while computed columns are formatted on fmt.
+
+  @param {File} input_handle
+  @param {File} output_handle
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} average_speed
+  @param {Number} chunk_size
+  @param {Boolean} header
+  @param {String} delimiter
+  @param {String} fmt
+  @return {Number} number of processed rows
+'''
+def streamFile(input_handle, output_handle, method="euclidean", methodConfig={}, \
+  average_speed=None, chunk_size=CHUNK_SIZE, header=False, delimiter=',', fmt='%.15g'):
+  if(header):
+    columns=input_handle.readline().rstrip('\r\n')
+    columns+=delimiter + 'distance'
+
+    if(average_speed is not None):
+      columns+=delimiter + 'travel_time'
+
+    output_handle.write(columns + '\n')
+
+  # Chunks are parsed in lockstep with their fields, which are written back untouched
+  rows, parsed=tee(readRows(input_handle, chunk_size, delimiter))
+  chunks=( asarray(chunk, dtype=float) for chunk in parsed )
+
+  count=0
+  for chunk, (origins, destinations, distances, times) in \
+    zip(rows, streamDistances(splitPairs(chunks), method, methodConfig, average_speed)):
+    results=(distances,) if times is None else (distances, times)
+    results_fmt=delimiter.join([fmt] * len(results))
+
+    for row, values in zip(chunk, column_stack(results)):
+      output_handle.write(delimiter.join(row) + delimiter + results_fmt % tuple(values) + '\n')
+
+    count+=len(distances)
+
+  return count
@@ -0,0 +1,668 @@
+"""Trees module."""
+from numpy import asarray, arange, empty, full, zeros, concatenate, argpartition, argsort, \
+  maximum, broadcast_to, sqrt, clip, repeat, column_stack, flatnonzero, fromiter, Inf
+from numpy.random import default_rng
+from heapq import heappush, heappop
+from warnings import warn
+
+from .utils import throw, hasKey
+from .metrics import Metric, getMetric
+from .kernels import pNormDistanceBatch
+
+'''
+  @abstract Minkowski exponent of a method, which must belong to the p-norm family
+
+  @param {String} method
+  @param {Object} methodConfig
+  @return {Number}
+'''
+def minkowskiExponent(method, methodConfig={}):
+  exponents={
+    'manhattan': 1, 'cityblock': 1,
+    'euclidean': 2,
+    'max': Inf, 'chebyshev': Inf
+  }
+
+  if(method=="pnorm"):
+    getMetric(method, **methodConfig)
+
+    return methodConfig['exponent'] if hasKey(methodConfig, 'exponent') else 2
+
+  elif(hasKey(exponents, method)):
+    return exponents[method]
+
+  else:
+    methods=['pnorm'] + list(exponents.keys())
+    emsg="Method \"{method}\" is not supported by KDTree. Available methods: {methods}".format(\
+      method=method, methods=str(methods)
+    )
+    throw(emsg, TypeError)
+
+'''
+  @abstract leaf threshold growing with the number of points: bigger
+  leaves amortize the per-node traversal on bigger trees, whose leaves
+  are scanned on a single vectorized pass
+
+  @param {Number} N
+  @return {Number}
+'''
+def defaultLeafSize(N):
+  return int(clip(sqrt(N) / 4, 16, 256))
+
+'''
+  @abstract k-d tree over an (N, d) array for nearest neighbour and radius
+  queries under a Minkowski distance. Nodes are stored in flat arrays: node
+  i holds rows start[i] to end[i] of the reordered data, its bounding box
+  and children left[i] and right[i], which are -1 on leaves.
+
+  @param {Array} points
+  @param {String} method
+  @param {Object} methodConfig
+  @param {Number} leaf_size
+'''
+class KDTree:
+  def __init__(self, points, method="euclidean", methodConfig={}, leaf_size=None):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim != 2 or len(points) == 0):
+      emsg="Argument 'points' must be a non-empty (N, d) array, received shape {0}!".format(\
+        points.shape
+      )
+      throw(emsg, TypeError)
+
+    self.exponent=minkowskiExponent(method, methodConfig)
+    self.leaf_size=defaultLeafSize(len(points)) if leaf_size is None else leaf_size
+
+    if(self.leaf_size < 1):
+      throw("Argument 'leaf_size' must be a positive integer!", ValueError)
+
+    self.build(points)
+
+  def __len__(self):
+    return len(self.order)
+
+  '''
+    @abstract splits nodes at the median of their widest dimension
+    until they hold at most leaf_size points
+
+    @param {Array} points
+    @return
+  '''
+  def build(self, points):
+    N=len(points)
+    order=arange(N)
+
+    starts, ends, lefts, rights, lowers, uppers=[0], [N], [-1], [-1], [None], [None]
+    stack=[0]
+
+    while stack:
+      node=stack.pop()
+      start, end=starts[node], ends[node]
+
+      node_points=points[order[start:end]]
+      lower=node_points.min(axis=0)
+      upper=node_points.max(axis=0)
+
+      lowers[node]=lower
+      uppers[node]=upper
+
+      if(end - start <= self.leaf_size):
+        continue
+
+      dimension=(upper - lower).argmax()
+      middle=(end - start) // 2
+
+      partition=argpartition(node_points[:, dimension], middle)
+      order[start:end]=order[start:end][partition]
+
+      for child_start, child_end in ((start, start + middle), (start + middle, end)):
+        starts.append(child_start)
+        ends.append(child_end)
+        lefts.append(-1)
+        rights.append(-1)
+        lowers.append(None)
+        uppers.append(None)
+
+        stack.append(len(starts) - 1)
+
+      lefts[node]=len(starts) - 2
+      rights[node]=len(starts) - 1
+
+    self.order=order
+    self.data=points[order]
+    self.start=asarray(starts)
+    self.end=asarray(ends)
+    self.left=asarray(lefts)
+    self.right=asarray(rights)
+    self.lower=asarray(lowers)
+    self.upper=asarray(uppers)
+
+  '''
+    @abstract lower bound of the distances from point x to the points of nodes
+
+    @param {Array} x
+    @param {Array} nodes
+    @return {Array}
+  '''
+  def boxDistance(self, x, nodes):
+    return self.boxesDistance(x, x, nodes)
+
+  '''
+    @abstract lower bound of the distances from the box [lower, upper] to
+    the points of nodes
+
+    @param {Array} lower
+    @param {Array} upper
+    @param {Array} nodes
+    @return {Array}
+  '''
+  def boxesDistance(self, lower, upper, nodes):
+    gap=maximum(maximum(self.lower[nodes] - upper, lower - self.upper[nodes]), 0)
+
+    return pNormDistanceBatch(gap, 0, self.exponent)
+
+  '''
+    @abstract pairs of leaves whose bounding boxes lie within distance r,
+    found by descending from the root along every leaf at once
+
+    @param {Number} r
+    @return {Array} leaves and their candidate leaves
+  '''
+  def leafPairs(self, r):
+    leaves=flatnonzero(self.left == -1)
+
+    queries=leaves
+    nodes=zeros(len(leaves), dtype=int)
+
+    pair_queries=[]
+    pair_leaves=[]
+    while len(nodes):
+      within=self.boxesDistance(self.lower[queries], self.upper[queries], nodes) <= r
+      queries=queries[within]
+      nodes=nodes[within]
+
+      is_leaf=self.left[nodes] == -1
+      pair_queries.append(queries[is_leaf])
+      pair_leaves.append(nodes[is_leaf])
+
+      inner=~is_leaf
+      queries=repeat(queries[inner], 2)
+      nodes=column_stack((self.left[nodes[inner]], self.right[nodes[inner]])).ravel()
+
+    return concatenate(pair_queries), concatenate(pair_leaves)
+
+  '''
+    @abstract k nearest neighbours of a single point, as positions on
+    the reordered data and their distances
+
+    @param {Array} x
+    @param {Number} k
+    @return {Array}
+  '''
+  def queryPoint(self, x, k):
+    best_distances=full(k, Inf)
+    best_positions=full(k, -1)
+
+    heap=[(0.0, 0)]
+    while heap:
+      bound, node=heappop(heap)
+
+      if(bound > best_distances[-1]):
+        break
+
+      left=self.left[node]
+      if(left == -1):
+        start, end=self.start[node], self.end[node]
+        distances=pNormDistanceBatch(self.data[start:end], x, self.exponent)
+
+        candidate_distances=concatenate((best_distances, distances))
+        candidate_positions=concatenate((best_positions, arange(start, end)))
+
+        nearest=argpartition(candidate_distances, k - 1)[:k]
+        nearest=nearest[argsort(candidate_distances[nearest], kind='stable')]
+
+        best_distances=candidate_distances[nearest]
+        best_positions=candidate_positions[nearest]
+
+      else:
+        children=[left, self.right[node]]
+        bounds=self.boxDistance(x, children)
+
+        for child, child_bound in zip(children, bounds):
+          if(child_bound <= best_distances[-1]):
+            heappush(heap, (child_bound, child))
+
+    return best_positions, best_distances
+
+  '''
+    @abstract k nearest neighbours of each row of points, sorted by distance
+
+    @param {Array} points
+    @param {Number} k
+    @return {Array} indices (Q, k) and distances (Q, k)
+  '''
+  def query(self, points, k=1):
+    points=self.queryPoints(points)
+
+    if(k < 1 or k > len(self)):
+      emsg="Argument 'k' must be between 1 and the number of indexed points {0}!".format(len(self))
+      throw(emsg, ValueError)
+
+    indices=empty((len(points), k), dtype=int)
+    distances=empty((len(points), k))
+
+    for row, x in enumerate(points):
+      positions, distances[row]=self.queryPoint(x, k)
+      indices[row]=self.order[positions]
+
+    return indices, distances
+
+  '''
+    @abstract indexed points within distance r of each row of points,
+    sorted by distance
+
+    @param {Array} points
+    @param {Number} r
+    @return {Array} lists of indices and distances, one entry per row
+  '''
+  def queryRadius(self, points, r):
+    points=self.queryPoints(points)
+    radii=broadcast_to(asarray(r, dtype=float), (len(points), ))
+
+    indices=[]
+    distances=[]
+    for x, radius in zip(points, radii):
+      positions=[]
+      point_distances=[]
+
+      stack=[0]
+      while stack:
+        node=stack.pop()
+
+        left=self.left[node]
+        if(left == -1):
+          start, end=self.start[node], self.end[node]
+          node_distances=pNormDistanceBatch(self.data[start:end], x, self.exponent)
+
+          within=node_distances <= radius
+          positions.append(arange(start, end)[within])
+          point_distances.append(node_distances[within])
+
+        else:
+          children=[left, self.right[node]]
+          bounds=self.boxDistance(x, children)
+
+          stack.extend([ child for child, bound in zip(children, bounds) if bound <= radius ])
+
+      positions=concatenate(positions) if positions else arange(0)
+      point_distances=concatenate(point_distances) if point_distances else empty(0)
+
+      nearest=argsort(point_distances, kind='stable')
+      indices.append(self.order[positions[nearest]])
+      distances.append(point_distances[nearest])
+
+    return indices, distances
+
+  '''
+    @abstract checks query points against the indexed dimension
+
+    @param {Array} points
+    @return {Array}
+  '''
+  def queryPoints(self, points):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim == 1):
+      points=points[None, :]
+
+    if(points.ndim != 2 or points.shape[1] != self.data.shape[1]):
+      emsg="Query points must be an (Q, {0}) array, received shape {1}!".format(\
+        self.data.shape[1], points.shape
+      )
+      throw(emsg, TypeError)
+
+    return points
+
+'''
+  @abstract methods whose distance breaks the triangle inequality, such that
+  metric trees may miss some of their neighbours
+'''
+NON_METRIC_METHODS=['sqeuclidean', 'cosine', 'braycurtis']
+
+'''
+  @abstract Metric of a method name, Metric or function of two points, 
+  whose batch form loops over rows
+
+  @param {Object} method
+  @param {Object} methodConfig
+  @return {Metric}
+'''
+def treeMetric(method, methodConfig={}):
+  if(isinstance(method, (str, Metric)) or not callable(method)):
+    metric=getMetric(method, **methodConfig)
+
+  else:
+    def kernel(X, x):
+      return fromiter((method(row, x) for row in X), dtype=float, count=len(X))
+
+    metric=Metric(getattr(method, '__name__', repr(method)), method, kernel)
+
+  if(metric.name in NON_METRIC_METHODS):
+    emsg="Method \"{0}\" breaks the triangle inequality: queries may miss neighbours!".format(\
+      metric.name
+    )
+    warn(emsg, UserWarning)
+
+  return metric
+
+'''
+  @abstract vantage-point tree over an (N, d) array for nearest neighbour
+  and radius queries under any metric, pruned by the triangle inequality
+  alone. Nodes are stored in flat arrays: node i holds rows start[i] to 
+  end[i] of the reordered data, the first of which is its vantage point on
+  inner nodes, and children inside[i] and outside[i], which are -1 on 
+  leaves. Distances from the points of node i to the vantage point of its
+  parent lie within [low[i], high[i]].
+
+  Queries count their distance evaluations: evaluations holds their total
+  over queries, and saved the evaluations spared against brute force.
+
+  @param {Array} points
+  @param {Object} method
+  @param {Object} methodConfig
+  @param {Number} leaf_size
+  @param {Number} seed
+'''
+class VPTree:
+  def __init__(self, points, method="euclidean", methodConfig={}, leaf_size=None, seed=0):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim != 2 or len(points) == 0):
+      emsg="Argument 'points' must be a non-empty (N, d) array, received shape {0}!".format(\
+        points.shape
+      )
+      throw(emsg, TypeError)
+
+    self.metric=treeMetric(method, methodConfig)
+    self.leaf_size=defaultLeafSize(len(points)) if leaf_size is None else leaf_size
+
+    if(self.leaf_size < 1):
+      throw("Argument 'leaf_size' must be a positive integer!", ValueError)
+
+    self.metric.check(points)
+
+    self.dimension=points.shape[1]
+    self.resetCounters()
+    self.build(self.metric.prepareAs(points), default_rng(seed))
+
+  def __len__(self):
+    return len(self.order)
+
+  @property
+  def saved(self):
+    return self.queries * len(self) - self.evaluations
+
+  '''
+    @abstract resets query counters
+
+    @return
+  '''
+  def resetCounters(self):
+    self.queries=0
+    self.evaluations=0
+    self.counter=0
+    self.last_evaluations=zeros(0, dtype=int)
+
+  '''
+    @abstract splits nodes around a random vantage point, at the median of
+    the distances to it, until they hold at most leaf_size points
+
+    @param {Array} prepared
+    @param {Object} rng
+    @return
+  '''
+  def build(self, prepared, rng):
+    N=len(prepared)
+    order=arange(N)
+
+    starts, ends, insides, outsides, lows, highs=[0], [N], [-1], [-1], [0.0], [Inf]
+    stack=[0]
+
+    while stack:
+      node=stack.pop()
+      start, end=starts[node], ends[node]
+
+      if(end - start <= self.leaf_size):
+        continue
+
+      vantage=rng.integers(start, end)
+      order[[start, vantage]]=order[[vantage, start]]
+
+      distances=self.metric.kernel(prepared[order[start + 1:end]], prepared[order[start]])
+      middle=(end - start - 1) // 2
+
+      partition=argpartition(distances, middle)
+      order[start + 1:end]=order[start + 1:end][partition]
+      distances=distances[partition]
+
+      children=(
+        (start + 1, start + 1 + middle, distances[:middle]), 
+        (start + 1 + middle, end, distances[middle:])
+      )
+
+      for child_start, child_end, child_distances in children:
+        starts.append(child_start)
+        ends.append(child_end)
+        insides.append(-1)
+        outsides.append(-1)
+        lows.append(child_distances.min() if len(child_distances) else Inf)
+        highs.append(child_distances.max() if len(child_distances) else -Inf)
+
+        stack.append(len(starts) - 1)
+
+      insides[node]=len(starts) - 2
+      outsides[node]=len(starts) - 1
+
+    self.order=order
+    self.data=prepared[order]
+    self.start=asarray(starts)
+    self.end=asarray(ends)
+    self.inside=asarray(insides)
+    self.outside=asarray(outsides)
+    self.low=asarray(lows)
+    self.high=asarray(highs)
+
+  '''
+    @abstract distances from prepared point x to rows start to end of the
+    reordered data, counted as evaluations
+
+    @param {Array} x
+    @param {Number} start
+    @param {Number} end
+    @return {Array}
+  '''
+  def distances(self, x, start, end):
+    self.counter+=end - start
+
+    return asarray(self.metric.kernel(self.data[start:end], x), dtype=float)
+
+  '''
+    @abstract lower bounds of the distances from a point to the points of
+    children, given its distance to their parent vantage point
+
+    @param {Number} vantage_distance
+    @param {Array} children
+    @return {Array}
+  '''
+  def childBounds(self, vantage_distance, children):
+    return [ 
+      max(vantage_distance - self.high[child], self.low[child] - vantage_distance, 0) 
+      for child in children
+    ]
+
+  '''
+    @abstract k nearest neighbours of a single prepared point, as positions
+    on the reordered data and their distances
+
+    @param {Array} x
+    @param {Number} k
+    @return {Array}
+  '''
+  def queryPoint(self, x, k):
+    best_distances=full(k, Inf)
+    best_positions=full(k, -1)
+
+    heap=[(0.0, 0)]
+    while heap:
+      bound, node=heappop(heap)
+
+      if(bound > best_distances[-1]):
+        break
+
+      start, end=self.start[node], self.end[node]
+      inside=self.inside[node]
+
+      # Leaves scan their rows, inner nodes their vantage point only
+      if(inside != -1):
+        end=start + 1
+
+      distances=self.distances(x, start, end)
+
+      candidate_distances=concatenate((best_distances, distances))
+      candidate_positions=concatenate((best_positions, arange(start, end)))
+
+      nearest=argpartition(candidate_distances, k - 1)[:k]
+      nearest=nearest[argsort(candidate_distances[nearest], kind='stable')]
+
+      best_distances=candidate_distances[nearest]
+      best_positions=candidate_positions[nearest]
+
+      if(inside != -1):
+        children=[inside, self.outside[node]]
+
+        for child, child_bound in zip(children, self.childBounds(distances[0], children)):
+          child_bound=max(child_bound, bound)
+
+          if(child_bound <= best_distances[-1]):
+            heappush(heap, (child_bound, child))
+
+    return best_positions, best_distances
+
+  '''
+    @abstract k nearest neighbours of each row of points, sorted by distance
+
+    @param {Array} points
+    @param {Number} k
+    @return {Array} indices (Q, k) and distances (Q, k)
+  '''
+  def query(self, points, k=1):
+    points=self.queryPoints(points)
+
+    if(k < 1 or k > len(self)):
+      emsg="Argument 'k' must be between 1 and the number of indexed points {0}!".format(len(self))
+      throw(emsg, ValueError)
+
+    indices=empty((len(points), k), dtype=int)
+    distances=empty((len(points), k))
+    evaluations=empty(len(points), dtype=int)
+
+    for row, x in enumerate(points):
+      self.counter=0
+
+      positions, distances[row]=self.queryPoint(x, k)
+      indices[row]=self.order[positions]
+      evaluations[row]=self.counter
+
+    self.countQueries(evaluations)
+
+    return indices, distances
+
+  '''
+    @abstract indexed points within distance r of each row of points,
+    sorted by distance
+
+    @param {Array} points
+    @param {Number} r
+    @return {Array} lists of indices and distances, one entry per row
+  '''
+  def queryRadius(self, points, r):
+    points=self.queryPoints(points)
+    radii=broadcast_to(asarray(r, dtype=float), (len(points), ))
+
+    indices=[]
+    distances=[]
+    evaluations=empty(len(points), dtype=int)
+
+    for row, (x, radius) in enumerate(zip(points, radii)):
+      self.counter=0
+
+      positions=[]
+      point_distances=[]
+
+      stack=[0]
+      while stack:
+        node=stack.pop()
+
+        start, end=self.start[node], self.end[node]
+        inside=self.inside[node]
+
+        if(inside != -1):
+          end=start + 1
+
+        node_distances=self.distances(x, start, end)
+
+        within=node_distances <= radius
+        positions.append(arange(start, end)[within])
+        point_distances.append(node_distances[within])
+
+        if(inside != -1):
+          children=[inside, self.outside[node]]
+          bounds=self.childBounds(node_distances[0], children)
+
+          stack.extend([ child for child, bound in zip(children, bounds) if bound <= radius ])
+
+      positions=concatenate(positions)
+      point_distances=concatenate(point_distances)
+
+      nearest=argsort(point_distances, kind='stable')
+      indices.append(self.order[positions[nearest]])
+      distances.append(point_distances[nearest])
+      evaluations[row]=self.counter
+
+    self.countQueries(evaluations)
+
+    return indices, distances
+
+  '''
+    @abstract adds per-query evaluations to the counters
+
+    @param {Array} evaluations
+    @return
+  '''
+  def countQueries(self, evaluations):
+    self.last_evaluations=evaluations
+    self.queries+=len(evaluations)
+    self.evaluations+=int(evaluations.sum())
+
+  '''
+    @abstract checks query points against the indexed dimension and 
+    prepares them for the metric
+
+    @param {Array} points
+    @return {Array}
+  '''
+  def queryPoints(self, points):
+    points=asarray(points, dtype=float)
+
+    if(points.ndim == 1):
+      points=points[None, :]
+
+    if(points.ndim != 2 or points.shape[1] != self.dimension):
+      emsg="Query points must be an (Q, {0}) array, received shape {1}!".format(\
+        self.dimension, points.shape
+      )
+      throw(emsg, TypeError)
+
+    self.metric.check(points)
+
+    return self.metric.prepareAs(points)
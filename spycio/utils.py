@@ -1,6 +1,11 @@
-from math import pi
-from numpy import sin, cos
-from functools import reduce
+from math import pi, sin, cos
+
+from . import instrument
+
+'''
+  Scalar helpers run on the math module. Array helpers import NumPy on
+  their own, such that scalar distances do not load it.
+'''
 
 '''
   @abstract raise an error message 
@@ -10,6 +15,9 @@ from functools import reduce
   @return
 '''
 def throw(message, errorClass=Exception):
+  if(instrument.ENABLED):
+    instrument.recordFailure(errorClass, message)
+
   raise errorClass(message)
 
 '''
@@ -23,6 +31,22 @@ def throw(message, errorClass=Exception):
 def hasKey(object, key):
   return key in object.keys()
 
+'''
+  @abstract returns the numpy floating type of given dtype or raises
+ 
+  @param {Object} dtype
+  @return {Object}
+'''
+def floatDtype(dtype):
+  from numpy import dtype as npdtype
+
+  float_dtype=npdtype(dtype)
+
+  if(float_dtype.kind != 'f'):
+    throw("Argument 'dtype' must be a floating type, received {0}!".format(float_dtype), TypeError)
+
+  return float_dtype
+
 '''
   @abstract converts randian to degree angle
  
@@ -84,14 +108,7 @@ def spherToGeo(coordinates):
   @return {Boolean}
 '''
 def isGeographical(u):
-  def hasLength2(x):
-    return (len(x) == 2)
-  def isBetweenmmPI2andpPI2(vec):
-    return (vec[0] >= -90 and vec[0] <= 90)
-  def isBetweenmPIandpPI(vec):
-    return (vec[1] >= -180 and vec[1] <= 180)
-  
-  return hasLength2(u) and isBetweenmmPI2andpPI2(u) and isBetweenmPIandpPI(u)
+  return len(u) == 2 and -90 <= u[0] <= 90 and -180 <= u[1] <= 180
 
 '''
   @abstract an spherical coordinate of dimension n has:
@@ -106,19 +123,9 @@ def isGeographical(u):
 def isSpherical(u):
   u_length=len(u)
 
-  def isBetween0andpPI(result, elem):
-    return (result and elem >= 0 and elem <= pi)
-  def isBetween0and2PI(result, elem):
-    return (result and elem >= 0 and elem <= 2 * pi)
-  
-  def areBetweenmPIandpPI(vec):
-    return reduce(isBetween0andpPI, vec, True)
-  def areBetween0and2PI(vec):
-    return reduce(isBetween0and2PI, vec, True)
-
   return u_length >= 2 and \
-    areBetweenmPIandpPI(u[0:u_length - 1]) and\
-    areBetween0and2PI(u[u_length - 1:u_length])
+    all([ 0 <= angle <= pi for angle in u[0:u_length - 1] ]) and \
+    0 <= u[u_length - 1] <= 2 * pi
 
 '''
   @abstract converts map of spherical to cartesian coordinates
@@ -132,27 +139,17 @@ def spherToCart(coords, R):
   len_coords=len(coords)
   
   if(isSpherical(coords)):
-    
-    def prodsin(angles): 
-      def sinprodFun(prod_sofar, angle):
-        return (prod_sofar * sin(angle))
-      return 1 if len(angles) == 0 else reduce(sinprodFun, angles, 1)
+    cartesian=[]
+    prodsin=R
 
-    def s2cRecur(angles, index):
-      return prodsin(angles[0:index]) * cos(angles[index])
-    
-    prev_coords = coords[0:len_coords - 1]
-    indexes = range(len_coords)
-    curr_coord = coords[len_coords - 1]
-    last_coord = [R * prodsin(prev_coords) * sin(curr_coord)]
-    
-    def spherDistFun(index):
-      return (R * s2cRecur(coords, index))  
-    
-    prev_sphers=list(map(spherDistFun, indexes))
-    prev_sphers.extend(last_coord)
+    # Running product of sines, such that conversion is linear on dimension
+    for angle in coords:
+      cartesian.append(prodsin * cos(angle))
+      prodsin*=sin(angle)
 
-    return prev_sphers
+    cartesian.append(prodsin)
+
+    return cartesian
   
   else: 
     criterium_1='1. It is an array with more than two elements;'
@@ -166,3 +163,80 @@ def spherToCart(coords, R):
     )
     
     throw(emsg, TypeError)
+
+
+'''
+  @abstract row-wise counterpart of isGeographical for an (..., 2) array
+  of latitude and longitude degrees
+ 
+  @param {Array} U
+  @return {Array}
+'''
+def areGeographical(U):
+  from numpy import asarray, zeros
+
+  U=asarray(U)
+
+  if(U.ndim == 0 or U.shape[-1] != 2):
+    return zeros(U.shape[:-1], dtype=bool)
+
+  latitudes=U[..., 0]
+  longitudes=U[..., 1]
+
+  return (latitudes >= -90) & (latitudes <= 90) & \
+    (longitudes >= -180) & (longitudes <= 180)
+
+'''
+  @abstract row-wise counterpart of isSpherical for an (..., n) array of angles
+ 
+  @param {Array} U
+  @return {Array}
+'''
+def areSpherical(U):
+  from numpy import asarray, zeros
+
+  U=asarray(U)
+
+  if(U.ndim == 0 or U.shape[-1] < 2):
+    return zeros(U.shape[:-1], dtype=bool)
+
+  prev_angles=U[..., :-1]
+  last_angle=U[..., -1]
+
+  return ((prev_angles >= 0) & (prev_angles <= pi)).all(axis=-1) & \
+    (last_angle >= 0) & (last_angle <= 2 * pi)
+
+'''
+  @abstract row-wise counterpart of spherToCart: maps an (..., n) array of 
+  angles into an (..., n + 1) array of cartesian coordinates
+ 
+  @param {Array} angles
+  @param {Number} R
+  @return {Array}
+'''
+def spherToCartBatch(angles, R):
+  from numpy import asarray, cumprod, ones, concatenate, sin, cos
+
+  angles=asarray(angles, dtype=float)
+  
+  sines=sin(angles)
+  leading=ones(angles.shape[:-1] + (1,))
+  prodsins=cumprod(concatenate((leading, sines), axis=-1), axis=-1)
+
+  return R * concatenate((prodsins[..., :-1] * cos(angles), prodsins[..., -1:]), axis=-1)
+
+'''
+  @abstract maps an (..., 2) array of latitude and longitude degrees into
+  an (..., 3) array of latitude and longitude radians, followed by the
+  cosine of the latitude, such that flat-earth kernels evaluate it once 
+  per point rather than once per pair
+ 
+  @param {Array} U
+  @return {Array}
+'''
+def geoToLocalBatch(U):
+  from numpy import asarray, concatenate, cos as npcos
+
+  radians=degreeToRadian(asarray(U, dtype=float))
+
+  return concatenate((radians, npcos(radians[..., :1])), axis=-1)
@@ -0,0 +1,197 @@
+"""Benchmark suite: throughput of every distance path, in pairs per second.
+
+Run with ``python -m tests.benchmark --output results.json`` and compare two
+releases with ``python -m tests.benchmark --compare before.json after.json``.
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from json import dump, load
+from platform import platform, python_version
+from time import perf_counter
+
+import numpy
+from numpy import column_stack, pi
+from numpy.random import default_rng
+
+from spycio.spycio import distance, travelTime
+from spycio.utils import spherToCart, spherToCartBatch
+from spycio.batch import distanceBatch, travelTimeBatch
+from spycio.matrix import distanceMatrix
+
+METHODS=[
+    ("pnorm", { "exponent": 3 }),
+    ("manhattan", {}),
+    ("euclidean", {}),
+    ("sqeuclidean", {}),
+    ("chebyshev", {}),
+    ("cosine", {}),
+    ("angular", {}),
+    ("canberra", {}),
+    ("braycurtis", {}),
+    ("sphere", { "radius": 1 }),
+    ("geographical", { "radius": 6371 }),
+    ("equirectangular", { "radius": 6371 }),
+    ("flatearth", { "radius": 6371 }),
+    ("autogeographical", { "radius": 6371 }),
+]
+
+GEOGRAPHICAL_METHODS=["geographical", "equirectangular", "flatearth", "autogeographical"]
+
+SIZES=[1000, 100000]
+DIMENSIONS=[2, 8, 32]
+
+# Scalar paths loop in Python, hence they are timed on at most this many pairs
+SCALAR_LIMIT=2000
+
+def coordinates(rng, method, N, dimension):
+    if(method in GEOGRAPHICAL_METHODS):
+        return column_stack((rng.uniform(-90, 90, N), rng.uniform(-180, 180, N)))
+
+    if(method == "sphere"):
+        return column_stack((
+            rng.uniform(0, pi, (N, dimension - 1)), rng.uniform(0, 2 * pi, N)
+        ))
+
+    return rng.uniform(0.5, 10, (N, dimension))
+
+def timeit(function, repeat):
+    best=float("inf")
+
+    for _ in range(repeat):
+        start=perf_counter()
+        function()
+        best=min(best, perf_counter() - start)
+
+    return best
+
+def record(results, benchmark, path, method, dimension, N, pairs, seconds):
+    results.append({
+        "benchmark": benchmark,
+        "path": path,
+        "method": method,
+        "dimension": dimension,
+        "N": N,
+        "pairs": pairs,
+        "seconds": seconds,
+        "pairs_per_second": pairs / seconds if seconds > 0 else float("inf"),
+    })
+
+def run(sizes=SIZES, dimensions=DIMENSIONS, repeat=3, seed=0, scalar_limit=SCALAR_LIMIT):
+    rng=default_rng(seed)
+    results=[]
+
+    for method, config in METHODS:
+        method_dimensions=[2] if method in GEOGRAPHICAL_METHODS else dimensions
+
+        for dimension in method_dimensions:
+            for N in sizes:
+                X=coordinates(rng, method, N, dimension)
+                Y=coordinates(rng, method, N, dimension)
+
+                n=min(N, scalar_limit)
+                pairs=[ (list(x), list(y)) for x, y in zip(X[:n], Y[:n]) ]
+
+                seconds=timeit(lambda: [ distance(x, y, method, config) for x, y in pairs ], repeat)
+                record(results, "distance", "scalar", method, dimension, N, n, seconds)
+
+                seconds=timeit(
+                    lambda: [ travelTime(2, x, y, method, config) for x, y in pairs ], repeat
+                )
+                record(results, "travelTime", "scalar", method, dimension, N, n, seconds)
+
+                seconds=timeit(lambda: distanceBatch(X, Y, method, config), repeat)
+                record(results, "distance", "batch", method, dimension, N, N, seconds)
+
+                seconds=timeit(lambda: travelTimeBatch(2, X, Y, method, config), repeat)
+                record(results, "travelTime", "batch", method, dimension, N, N, seconds)
+
+                side=max(int(N ** 0.5), 1)
+                seconds=timeit(lambda: distanceMatrix(X[:side], Y[:side], method, config), repeat)
+                record(results, "distance", "matrix", method, dimension, N, side * side, seconds)
+
+    for dimension in dimensions:
+        for N in sizes:
+            angles=coordinates(rng, "sphere", N, dimension)
+
+            n=min(N, scalar_limit)
+            rows=[ list(angle) for angle in angles[:n] ]
+
+            seconds=timeit(lambda: [ spherToCart(row, 1) for row in rows ], repeat)
+            record(results, "spherToCart", "scalar", "sphere", dimension, N, n, seconds)
+
+            seconds=timeit(lambda: spherToCartBatch(angles, 1), repeat)
+            record(results, "spherToCart", "batch", "sphere", dimension, N, N, seconds)
+
+    return {
+        "python": python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform(),
+        "results": results,
+    }
+
+def key(result):
+    return (result["benchmark"], result["path"], result["method"], result["dimension"], result["N"])
+
+def compare(before, after, threshold=0.2):
+    """Returns the benchmarks whose throughput dropped by more than threshold."""
+    baseline={ key(result): result for result in before["results"] }
+    regressions=[]
+
+    for result in after["results"]:
+        previous=baseline.get(key(result))
+
+        if(previous is None):
+            continue
+
+        ratio=result["pairs_per_second"] / previous["pairs_per_second"]
+
+        if(ratio < 1 - threshold):
+            regressions.append((key(result), ratio))
+
+    return regressions
+
+def report(results):
+    for result in results["results"]:
+        print(
+            "{benchmark:>12} {path:>7} {method:>13} d={dimension:<3} N={N:<8} "
+            "{pairs_per_second:>14.0f} pairs/s".format(**result)
+        )
+
+def main(arguments=None):
+    parser=ArgumentParser(prog="python -m tests.benchmark", description=__doc__.splitlines()[0])
+
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=DIMENSIONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to save results into")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+        help="report regressions between two saved JSON results")
+    parser.add_argument("--threshold", type=float, default=0.2,
+        help="relative throughput drop reported as regression")
+
+    options=parser.parse_args(arguments)
+
+    if(options.compare):
+        with open(options.compare[0]) as before_file, open(options.compare[1]) as after_file:
+            regressions=compare(load(before_file), load(after_file), options.threshold)
+
+        for (benchmark, path, method, dimension, N), ratio in regressions:
+            print("{0} {1} {2} d={3} N={4}: {5:.0%} of previous throughput".format(\
+                benchmark, path, method, dimension, N, ratio
+            ))
+
+        return 1 if regressions else 0
+
+    results=run(options.sizes, options.dimensions, options.repeat)
+    report(results)
+
+    if(options.output):
+        with open(options.output, "w") as output_file:
+            dump(results, output_file, indent=2)
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -140,4 +140,43 @@ spher_cartesian_tuples=toParameter(\
     "candidate, norm_value", list(zip(spher_cartesian_candidates, spher_cartesian_norms))
 )
 
-pnorm_fixtures=toParameter("exponent,expected_value", [ (1, 2), (2, sqrt(2)), (Inf, 1), ])
\ No newline at end of file
+pnorm_fixtures=toParameter("exponent,expected_value", [ (1, 2), (2, sqrt(2)), (Inf, 1), ])
+
+batch_methods=toParameter(\
+    "method,method_config", \
+    [
+        ("pnorm", { "exponent": 3 }),
+        ("pnorm", { "exponent": Inf }),
+        ("manhattan", {}),
+        ("cityblock", {}),
+        ("euclidean", {}),
+        ("sqeuclidean", {}),
+        ("max", {}),
+        ("chebyshev", {}),
+        ("cosine", {}),
+        ("angular", {}),
+        ("canberra", {}),
+        ("braycurtis", {}),
+    ]\
+)
+
+batch_spherical_methods=toParameter(\
+    "method,method_config,bounds", \
+    [
+        ("sphere", { "radius": 2 }, [(0, pi), (0, 2 * pi)]),
+        ("geographical", { "radius": 6371 }, [(-90, 90), (-180, 180)]),
+        ("equirectangular", { "radius": 6371 }, [(-90, 90), (-180, 180)]),
+        ("flatearth", { "radius": 6371 }, [(-90, 90), (-180, 180)]),
+        ("autogeographical", { "radius": 6371 }, [(-90, 90), (-180, 180)]),
+    ]\
+)
+
+minkowski_methods=toParameter(\
+    "method,method_config", \
+    [
+        ("manhattan", {}),
+        ("euclidean", {}),
+        ("chebyshev", {}),
+        ("pnorm", { "exponent": 3 }),
+    ]\
+)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from asyncio import run, gather
+from math import isclose
+from pytest import raises
+
+from spycio import aio
+from spycio.spycio import distance
+from spycio.aio import MicroBatcher
+
+from .fixtures import TOL
+
+def test_MicroBatcher_batches_concurrent_requests():
+    batcher=MicroBatcher(window=0.01)
+    pairs=[ ([i, 0], [0, i + 1]) for i in range(10) ]
+
+    async def main():
+        return await gather(*[ batcher.distance(u, v, "manhattan") for u, v in pairs ])
+
+    results=run(main())
+
+    assert batcher.requests == 10 and batcher.batches == 1
+    assert all(isclose(result, distance(u, v, "manhattan"), rel_tol=TOL) \
+        for result, (u, v) in zip(results, pairs))
+
+def test_MicroBatcher_groups_and_max_batch_size():
+    batcher=MicroBatcher(window=0.01, max_batch_size=4)
+
+    async def main():
+        return await gather(
+            *[ batcher.distance([0, 0], [3, 4]) for _ in range(6) ],
+            *[
+                batcher.distance([0, 0], [0, 90], "geographical", { "radius": 1 })
+                for _ in range(2)
+            ]
+        )
+
+    results=run(main())
+
+    assert batcher.batches == 3
+    assert results[:6] == [5.0] * 6
+    assert all(isclose(result, distance([0, 0], [0, 90], "geographical", { "radius": 1 }), \
+        rel_tol=TOL) for result in results[6:])
+
+def test_MicroBatcher_isolates_errors():
+    batcher=MicroBatcher()
+
+    async def main():
+        return await gather(
+            batcher.distance([0, 0], [10, 10], "geographical", { "radius": 1 }),
+            batcher.distance([0, 0], [100, 10], "geographical", { "radius": 1 }),
+            return_exceptions=True
+        )
+
+    valid, invalid=run(main())
+
+    assert isclose(valid, distance([0, 0], [10, 10], "geographical", { "radius": 1 }), rel_tol=TOL)
+    assert isinstance(invalid, TypeError)
+
+def test_aio_module_functions():
+    aio.configure(window=0, max_batch_size=8)
+
+    assert run(aio.distance([0, 0], [3, 4])) == 5
+    assert run(aio.travelTime(2, [0, 0], [3, 4])) == 2.5
+
+    with raises(ValueError):
+        aio.configure(max_batch_size=0)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pytest import mark, raises, warns
+from numpy import allclose, array, pi, sqrt, isnan
+from numpy.random import default_rng
+
+from spycio.spycio import distance
+from spycio.batch import distanceBatch, travelTimeBatch
+
+from .fixtures import batch_methods, batch_spherical_methods
+
+rng=default_rng(42)
+
+def scalarDistances(X, Y, method, method_config):
+    return array([
+        distance(list(x), list(y), method, method_config) for x, y in zip(X, Y)
+    ])
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_distanceBatch_matches_scalar(method, method_config):
+    X=rng.uniform(0.5, 3, (50, 4))
+    Y=rng.uniform(0.5, 3, (50, 4))
+
+    result=distanceBatch(X, Y, method, method_config)
+
+    assert result.shape == (50, )
+    assert allclose(result, scalarDistances(X, Y, method, method_config), atol=1e-7)
+
+@mark.parametrize(batch_spherical_methods["names"], batch_spherical_methods["variables"])
+def test_distanceBatch_spherical_matches_scalar(method, method_config, bounds):
+    X=array([ rng.uniform(low, high, 30) for low, high in bounds ]).T
+    Y=array([ rng.uniform(low, high, 30) for low, high in bounds ]).T
+
+    result=distanceBatch(X, Y, method, method_config)
+    
+    assert allclose(result, scalarDistances(X, Y, method, method_config), atol=1e-7)
+
+def test_distanceBatch_pnorm_without_config():
+    with warns(UserWarning):
+        result=distanceBatch([[0, 0]], [[1, 1]], "pnorm")
+    
+    assert allclose(result, [sqrt(2)])
+
+def test_distanceBatch_canberra_null_terms():
+    assert allclose(distanceBatch([[0, 1]], [[0, 3]], "canberra"), [0.5])
+
+def test_distanceBatch_errors():
+    with raises(TypeError):
+        distanceBatch([[0, 0]], [[1, 1], [2, 2]])
+
+    with raises(TypeError):
+        distanceBatch([[0, 0]], [[1, 1]], "")
+
+    with raises(TypeError):
+        distanceBatch([[0, 0]], [[1, 1]], "sphere", {})
+
+    with raises(TypeError):
+        distanceBatch([[0, 0]], [[pi + 1, 0]], "sphere", { "radius": 1 })
+
+    with raises(TypeError):
+        distanceBatch([[0, 0]], [[91, 0]], "geographical", { "radius": 1 })
+
+    with raises(Exception):
+        distanceBatch([[0, 0]], [[1, 1]], "pnorm", { "exponent": 0.5 })
+
+@mark.parametrize("method", ["cosine", "angular"])
+def test_distanceBatch_masks_null_vectors(method):
+    result=distanceBatch([[0, 0], [1, 2], [3, 1]], [[1, 1], [0, 0], [1, 3]], method)
+
+    assert isnan(result[:2]).all()
+    assert allclose(result[2], distance([3, 1], [1, 3], method))
+
+def test_distanceBatch_validate_modes():
+    X=array([[0, 0], [10, 20], [100, 0]])
+    Y=array([[0, 90], [10, 20], [0, 0]])
+    config={ "radius": 1 }
+
+    with raises(TypeError):
+        distanceBatch(X, Y, "geographical", config)
+
+    masked=distanceBatch(X, Y, "geographical", config, validate="mask")
+
+    assert allclose(masked[:2], [pi / 2, 0])
+    assert isnan(masked[2])
+
+    skipped=distanceBatch(X, Y, "geographical", config, validate="skip")
+
+    assert not isnan(skipped).any()
+    assert isnan(travelTimeBatch(2, X, Y, "geographical", config, validate="mask")[2])
+
+    with raises(TypeError):
+        distanceBatch(X, Y, "geographical", config, validate="ignore")
+
+def test_distanceBatch_mask_without_checks():
+    X=rng.uniform(-1, 1, (4, 3))
+
+    assert not isnan(distanceBatch(X, X, "euclidean", validate="mask")).any()
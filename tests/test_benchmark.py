@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from json import load
+
+from spycio.metrics import METRICS
+
+from .benchmark import METHODS, run, compare, main
+
+def test_benchmark_covers_every_method():
+    results=run(sizes=[16], dimensions=[2, 3], repeat=1)["results"]
+
+    methods={ result["method"] for result in results }
+    paths={ (result["benchmark"], result["path"]) for result in results }
+
+    assert methods == { method for method, _ in METHODS }
+    assert ("distance", "batch") in paths and ("spherToCart", "scalar") in paths
+    assert all(result["pairs_per_second"] > 0 for result in results)
+
+def test_benchmark_covers_every_registered_metric():
+    # Aliases share the factory of the first name it was registered under
+    names={}
+    for name, factory in METRICS.items():
+        names.setdefault(factory, name)
+
+    assert set(names.values()) <= { method for method, _ in METHODS }
+
+def test_benchmark_compare():
+    before={ "results": [{ "benchmark": "distance", "path": "batch", "method": "euclidean", \
+        "dimension": 2, "N": 10, "pairs_per_second": 100.0 }] }
+    after={ "results": [dict(before["results"][0], pairs_per_second=50.0)] }
+
+    assert len(compare(before, after, 0.2)) == 1
+    assert compare(before, before, 0.2) == []
+
+def test_benchmark_main(tmp_path):
+    output=str(tmp_path / "results.json")
+
+    assert main(["--sizes", "8", "--dimensions", "2", "--repeat", "1", "--output", output]) == 0
+    assert main(["--compare", output, output]) == 0
+
+    with open(output) as output_file:
+        assert len(load(output_file)["results"]) > 0
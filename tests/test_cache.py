@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pytest import raises, warns
+from math import isclose
+from numpy import Inf
+
+from spycio.spycio import distance, travelTime
+from spycio.cache import DistanceCache, frozenConfig
+
+from .fixtures import TOL
+
+def test_DistanceCache_hits_and_misses():
+    cache=DistanceCache()
+
+    first=cache.distance([0, 0], [3, 4])
+    second=cache.distance([0, 0], [3, 4])
+
+    assert first == second == 5
+    assert cache.stats() == \
+        { 'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 2 ** 16 }
+
+def test_DistanceCache_quantized_keys():
+    cache=DistanceCache(precision=3)
+
+    cache.distance([0, 0], [1, 1], "manhattan")
+    cache.distance([0.0001, 0], [1, 1.0002], "manhattan")
+
+    assert cache.stats()['hits'] == 1
+
+def test_DistanceCache_symmetric_keys():
+    cache=DistanceCache()
+
+    cache.distance([0, 0], [1, 2], "canberra")
+    cache.distance([1, 2], [0, 0], "canberra")
+
+    assert cache.stats()['hits'] == 1
+
+    cache=DistanceCache(symmetric=False)
+
+    cache.distance([0, 0], [1, 2])
+    cache.distance([1, 2], [0, 0])
+
+    assert cache.stats()['hits'] == 0
+
+def test_DistanceCache_keys_on_method_and_config():
+    cache=DistanceCache()
+
+    cache.distance([0, 0], [1, 1], "pnorm", { "exponent": 1 })
+    cache.distance([0, 0], [1, 1], "pnorm", { "exponent": Inf })
+    cache.distance([0, 0], [1, 1], "euclidean")
+
+    assert cache.stats()['misses'] == 3
+
+def test_DistanceCache_lru_eviction():
+    cache=DistanceCache(maxsize=2)
+
+    cache.distance([0, 0], [1, 1])
+    cache.distance([0, 0], [2, 2])
+    cache.distance([0, 0], [1, 1])
+    cache.distance([0, 0], [3, 3])
+
+    assert cache.stats()['evictions'] == 1
+    
+    cache.distance([0, 0], [1, 1])
+    assert cache.stats()['hits'] == 2
+
+    cache.distance([0, 0], [2, 2])
+    assert cache.stats()['misses'] == 4
+
+def test_DistanceCache_matches_distance():
+    cache=DistanceCache()
+    config={ "radius": 6371 }
+
+    expected=distance([10, 20], [-30, 40], "geographical", config)
+
+    assert isclose(cache.distance([10, 20], [-30, 40], "geographical", config), expected, \
+        rel_tol=TOL)
+    assert isclose(cache.travelTime(50, [10, 20], [-30, 40], "geographical", config), \
+        travelTime(50, [10, 20], [-30, 40], "geographical", config), rel_tol=TOL)
+
+def test_DistanceCache_warns_once_and_clears():
+    cache=DistanceCache()
+
+    with warns(UserWarning):
+        cache.distance([0, 0], [1, 1], "pnorm")
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()['misses'] == 0
+
+def test_frozenConfig():
+    assert frozenConfig({ "b": 1, "a": 2 }) == (("a", 2), ("b", 1))
+    assert isinstance(frozenConfig({ "a": [1] }), str)
+
+def test_DistanceCache_errors():
+    with raises(ValueError):
+        DistanceCache(maxsize=0)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import allclose, column_stack, float32, float64, int64, abs as npabs
+from numpy.random import default_rng
+
+from spycio.batch import distanceBatch, travelTimeBatch
+from spycio.matrix import distanceMatrix, travelTimeMatrix
+from spycio.neighbors import knn
+from spycio.utils import floatDtype
+
+rng=default_rng(23)
+
+EARTH={ "radius": 6371000 }
+
+def geographicalPoints(N):
+    return column_stack((rng.uniform(-90, 90, N), rng.uniform(-180, 180, N)))
+
+@mark.parametrize("method,method_config", [("euclidean", {}), ("manhattan", {}), ("cosine", {})])
+def test_float32_norm_methods(method, method_config):
+    A=rng.uniform(1, 100, (30, 8))
+    B=rng.uniform(1, 100, (20, 8))
+
+    result=distanceMatrix(A, B, method, method_config, dtype=float32)
+    expected=distanceMatrix(A, B, method, method_config)
+
+    assert result.dtype == float32
+    assert allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+def test_float32_geographical_error_bound():
+    A=geographicalPoints(40)
+    B=geographicalPoints(50)
+
+    result=distanceMatrix(A, B, "geographical", EARTH, dtype=float32)
+    expected=distanceMatrix(A, B, "geographical", EARTH)
+
+    assert result.dtype == float32
+    assert (npabs(result - expected) <= expected * 2.0 ** -24 + 1e-9).all()
+
+def test_float32_batch_knn_and_travel_times():
+    X=geographicalPoints(25)
+    Y=geographicalPoints(25)
+
+    assert distanceBatch(X, Y, "geographical", EARTH, dtype=float32).dtype == float32
+    assert distanceBatch(X, Y, "geographical", EARTH, workers=2, dtype=float32).dtype == float32
+    assert travelTimeBatch(10, X, Y, "geographical", EARTH, dtype=float32).dtype == float32
+    assert travelTimeMatrix(10, X, Y, "geographical", EARTH, dtype=float32).dtype == float32
+
+    indices, distances=knn(X, Y, 3, "geographical", EARTH, dtype=float32)
+    _, expected=knn(X, Y, 3, "geographical", EARTH)
+
+    assert distances.dtype == float32
+    assert allclose(distances, expected, rtol=1e-6)
+
+def test_floatDtype():
+    assert floatDtype(float) == float64
+    assert floatDtype("float32") == float32
+
+    with raises(TypeError):
+        floatDtype(int64)
+
+    with raises(TypeError):
+        distanceMatrix([[0, 0]], [[1, 1]], dtype=int)
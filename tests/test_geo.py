@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import allclose, array, array_equal, column_stack, sort, zeros
+from numpy.random import default_rng
+
+from spycio.matrix import distanceMatrix
+from spycio.geo import GeoIndex, spans
+
+rng=default_rng(5)
+
+EARTH={ "radius": 6371 }
+
+def geographicalPoints(N):
+    return column_stack((rng.uniform(-90, 90, N), rng.uniform(-180, 180, N)))
+
+@mark.parametrize("cell_size", [None, 0.5, 7, 45])
+def test_GeoIndex_queryRadius_matches_brute_force(cell_size):
+    points=geographicalPoints(2000)
+    queries=array([[0, 179.9], [89.5, 10], [-45, -179.5], [10, 20]])
+
+    index=GeoIndex(points, EARTH, cell_size)
+    indices, distances=index.queryRadius(queries, 1500)
+
+    expected=distanceMatrix(queries, points, "geographical", EARTH)
+
+    for row in range(len(queries)):
+        assert array_equal(sort(indices[row]), (expected[row] <= 1500).nonzero()[0])
+        assert allclose(distances[row], sort(expected[row][expected[row] <= 1500]))
+
+@mark.parametrize("cell_size", [None, 1, 30])
+def test_GeoIndex_query_matches_brute_force(cell_size):
+    points=geographicalPoints(1000)
+    queries=geographicalPoints(25)
+
+    index=GeoIndex(points, EARTH, cell_size)
+    indices, distances=index.query(queries, k=4)
+
+    expected=distanceMatrix(queries, points, "geographical", EARTH)
+
+    assert allclose(distances, sort(expected, axis=1)[:, :4])
+    assert allclose(expected[range(25), indices[:, 0]], distances[:, 0])
+
+def test_GeoIndex_dense_city():
+    points=column_stack((rng.uniform(-23.6, -23.5, 5000), rng.uniform(-46.7, -46.6, 5000)))
+
+    index=GeoIndex(points, EARTH)
+    indices, distances=index.queryRadius([-23.55, -46.65], 2)
+
+    expected=distanceMatrix([[-23.55, -46.65]], points, "geographical", EARTH)[0]
+
+    assert index.cell_size < 0.1
+    assert array_equal(sort(indices[0]), (expected <= 2).nonzero()[0])
+
+def test_spans():
+    assert array_equal(spans(array([2, 7, 9]), array([4, 7, 11])), [2, 3, 9, 10])
+
+def test_GeoIndex_errors():
+    with raises(TypeError):
+        GeoIndex(zeros((3, 2)))
+
+    with raises(TypeError):
+        GeoIndex(array([[91, 0]]), EARTH)
+
+    with raises(TypeError):
+        GeoIndex(zeros((3, 2)), EARTH).query([[0, 200]])
+
+    with raises(ValueError):
+        GeoIndex(zeros((3, 2)), EARTH).query([[0, 0]], k=5)
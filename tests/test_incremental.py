@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import allclose, float32
+from numpy.random import default_rng
+
+from spycio.matrix import distanceMatrix
+from spycio.incremental import IncrementalMatrix
+
+from .fixtures import batch_methods
+
+rng=default_rng(21)
+
+def assertMatches(incremental, method="euclidean", method_config={}):
+    points=incremental.points
+
+    assert incremental.matrix.shape == (len(points), len(points))
+    assert allclose(incremental.matrix, distanceMatrix(points, points, method, method_config))
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_IncrementalMatrix_matches_distanceMatrix(method, method_config):
+    incremental=IncrementalMatrix(rng.uniform(0.5, 3, (6, 3)), method, method_config)
+
+    incremental.append(rng.uniform(0.5, 3, (5, 3)))
+    assertMatches(incremental, method, method_config)
+
+    incremental.remove([0, 4, 10])
+    assertMatches(incremental, method, method_config)
+
+    incremental.append(rng.uniform(0.5, 3, (2, 3)))
+    assertMatches(incremental, method, method_config)
+
+def test_IncrementalMatrix_ids_follow_points():
+    points=rng.uniform(-1, 1, (10, 2))
+    incremental=IncrementalMatrix(points)
+
+    incremental.remove([1, 2, 9])
+
+    assert sorted(incremental.ids) == [0, 3, 4, 5, 6, 7, 8]
+    assert allclose(incremental.points, points[incremental.ids])
+    assert list(incremental.index([8, 0])) == [ list(incremental.ids).index(8), 0 ]
+
+    assert list(incremental.append([[0, 0], [1, 1]])) == [10, 11]
+
+    with raises(KeyError):
+        incremental.remove([1])
+
+def test_IncrementalMatrix_capacity():
+    incremental=IncrementalMatrix(capacity=4, growth=1.5)
+
+    incremental.append(rng.uniform(-1, 1, (3, 2)))
+    buffer=incremental.buffer
+
+    incremental.append(rng.uniform(-1, 1, (1, 2)))
+    assert incremental.buffer is buffer and incremental.capacity == 4
+
+    incremental.append(rng.uniform(-1, 1, (1, 2)))
+    assert incremental.capacity == 6 and len(incremental) == 5
+    assertMatches(incremental)
+
+    incremental.remove(incremental.ids[:4])
+    assert incremental.capacity == 6 and len(incremental) == 1
+
+def test_IncrementalMatrix_asymmetric_geographical():
+    config={ "radius": 6371 }
+    incremental=IncrementalMatrix([[0, 0], [10, 10]], "geographical", config, symmetric=False, \
+        dtype=float32)
+
+    incremental.append([[20, -20], [-30, 170]])
+
+    assert incremental.matrix.dtype == float32
+    assert allclose(incremental.matrix, distanceMatrix(incremental.points, incremental.points, \
+        "geographical", config), rtol=1e-6)
+
+def test_IncrementalMatrix_errors():
+    with raises(ValueError):
+        IncrementalMatrix(growth=1)
+
+    incremental=IncrementalMatrix([[0, 0]])
+
+    with raises(TypeError):
+        incremental.append([[0, 0, 0]])
+
+    with raises(TypeError):
+        IncrementalMatrix([[100, 0]], "geographical", { "radius": 1 })
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pytest import raises, fixture
+from numpy import zeros, ones
+
+from spycio import instrument
+from spycio.spycio import distance, travelTime
+from spycio.batch import distanceBatch
+from spycio.matrix import distanceMatrix
+from spycio.neighbors import knn
+
+@fixture(autouse=True)
+def clean_instrument():
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+def test_instrument_disabled_records_nothing():
+    distance([0, 0], [3, 4])
+
+    assert not instrument.isEnabled()
+    assert instrument.snapshot() == {}
+
+def test_instrument_calls_and_elements():
+    instrument.enable()
+
+    distance([0, 0], [3, 4])
+    distance([0, 0], [3, 4], method="manhattan")
+    distanceBatch(zeros((5, 2)), ones((5, 2)), "euclidean")
+    distanceMatrix(zeros((3, 2)), ones((4, 2)), "chebyshev")
+    knn(zeros((2, 2)), ones((6, 2)), 3)
+
+    snapshot=instrument.snapshot()
+
+    assert snapshot['distance']['euclidean']['calls'] == 1
+    assert snapshot['distance']['manhattan']['elements'] == 1
+    assert snapshot['distanceBatch']['euclidean']['elements'] == 5
+    assert snapshot['distanceMatrix']['chebyshev']['elements'] == 12
+    assert snapshot['knn']['euclidean']['elements'] == 6
+
+def test_instrument_latency_histogram():
+    instrument.enable()
+
+    for _ in range(3):
+        distance([0, 0], [3, 4])
+
+    record=instrument.snapshot()['distance']['euclidean']
+
+    assert len(record['histogram']) == len(instrument.LATENCY_BUCKETS) + 1
+    assert sum(record['histogram']) == 3
+    assert record['seconds'] > 0
+
+def test_instrument_failures():
+    instrument.enable()
+
+    with raises(TypeError):
+        distance([0, 0], [1, 1], "unknown")
+
+    with raises(TypeError):
+        distanceBatch(zeros((2, 2)), zeros((3, 2)))
+
+    snapshot=instrument.snapshot()
+
+    assert snapshot['distance']['unknown']['failures'] == { 'TypeError': 1 }
+    assert snapshot['distance']['unknown']['calls'] == 0
+    assert snapshot['distanceBatch']['euclidean']['failures'] == { 'TypeError': 1 }
+
+def test_instrument_callback():
+    events=[]
+    instrument.enable(events.append)
+
+    travelTime(2, [0, 0], [3, 4])
+
+    assert [ (event['event'], event['path']) for event in events ] == \
+        [('call', 'distance'), ('call', 'travelTime')]
+    assert events[1]['method'] == 'euclidean'
+
+    instrument.disable()
+    distance([0, 0], [3, 4])
+
+    assert len(events) == 2
+
+def test_instrument_scalar_paths_skip_wrappers():
+    # Scalar paths check the flag inline, such that disabled calls take no extra frame
+    assert not hasattr(distance, '__wrapped__')
+    assert not hasattr(travelTime, '__wrapped__')
+
+    instrument.enable()
+    travelTime(2, [0, 0], [3, 4], "manhattan")
+
+    snapshot=instrument.snapshot()
+
+    assert snapshot['travelTime']['manhattan']['calls'] == 1
+    assert snapshot['distance']['manhattan']['calls'] == 1
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from math import isclose, radians
+from numpy import allclose, array, pi, column_stack
+
+from numpy.random import default_rng
+
+from spycio.spycio import greatCircleDistance, nSphereDistance
+from spycio.spycio import distance
+from spycio.utils import spherToCart, spherToCartBatch, degreeToRadian, geoToLocalBatch
+from spycio.kernels import haversineBatch, geographicalDistanceBatch, nSphereDistanceBatch, \
+    equirectangularBatch, flatEarthBatch, autoGeographicalBatch
+
+from .fixtures import TOL
+
+EARTH_RADIUS=6371008.8
+
+def test_haversineBatch_matches_greatCircleDistance():
+    X=array([[0, 0], [pi / 4, 1], [-1, -2]])
+    Y=array([[pi / 2, 0], [-pi / 4, -1], [1, 2]])
+
+    expected=[
+        greatCircleDistance([x[1], x[0]], [y[1], y[0]], 2) for x, y in zip(X, Y)
+    ]
+
+    assert allclose(haversineBatch(X, Y, 2), expected)
+
+def test_geographicalDistanceBatch_nearby_points():
+    step=1e-6
+    result=geographicalDistanceBatch([[0, 0]], [[0, step]], EARTH_RADIUS)
+
+    assert isclose(result[0], EARTH_RADIUS * radians(step), rel_tol=1e-9)
+
+def test_geographicalDistanceBatch_antipodal_points():
+    result=geographicalDistanceBatch([[0, 0], [90, 0]], [[0, 180], [-90, 0]], 1)
+
+    assert allclose(result, [pi, pi], rtol=TOL)
+
+def test_spherToCartBatch_high_dimension():
+    rng=default_rng(3)
+    angles=rng.uniform(0, pi, (5, 64))
+
+    cartesian=spherToCartBatch(angles, 2)
+
+    assert cartesian.shape == (5, 65)
+    assert allclose(cartesian, [ spherToCart(list(row), 2) for row in angles ])
+    assert allclose((cartesian ** 2).sum(axis=1), 4)
+
+def test_nSphereDistanceBatch_matches_scalar():
+    rng=default_rng(5)
+    X=rng.uniform(0, pi, (4, 16))
+    Y=rng.uniform(0, pi, (4, 16))
+
+    expected=[ nSphereDistance(list(x), list(y), 3) for x, y in zip(X, Y) ]
+
+    assert allclose(nSphereDistanceBatch(X, Y, 3), expected)
+
+
+def geographicalPairs(rng, N, spread):
+    X=column_stack((rng.uniform(-80, 80, N), rng.uniform(-180, 180, N)))
+    Y=(X + rng.normal(0, spread, X.shape)).clip([-90, -180], [90, 180])
+
+    return X, Y
+
+def test_approximate_geographical_batches_match_scalar():
+    X, Y=geographicalPairs(default_rng(7), 200, 0.5)
+
+    kernels={
+        "equirectangular": equirectangularBatch(degreeToRadian(X), degreeToRadian(Y), 6371),
+        "flatearth": flatEarthBatch(geoToLocalBatch(X), geoToLocalBatch(Y), 6371),
+    }
+
+    for method, result in kernels.items():
+        expected=[ distance(list(x), list(y), method, { "radius": 6371 }) for x, y in zip(X, Y) ]
+
+        assert allclose(result, expected, rtol=1e-12)
+
+def test_autoGeographicalBatch_falls_back_on_far_pairs():
+    rng=default_rng(9)
+
+    # Mostly near pairs gather far ones, mostly far pairs evaluate both formulas
+    for spread in [0.01, 20]:
+        X, Y=geographicalPairs(rng, 300, spread)
+        X[::10]=-X[::10]
+
+        result=autoGeographicalBatch(geoToLocalBatch(X), geoToLocalBatch(Y), 6371, 1e-6)
+        expected=geographicalDistanceBatch(X, Y, 6371)
+
+        assert allclose(result, expected, rtol=1e-5)
+
+def test_autoGeographicalBatch_broadcasts():
+    X, Y=geographicalPairs(default_rng(13), 20, 1)
+    A=geoToLocalBatch(X)
+    B=geoToLocalBatch(Y)
+
+    result=autoGeographicalBatch(A[:, None, :], B[None, :, :], 1, 1e-6)
+    expected=haversineBatch(degreeToRadian(X)[:, None, :], degreeToRadian(Y)[None, :, :], 1)
+
+    assert result.shape == (20, 20)
+    assert allclose(result, expected, rtol=1e-5)
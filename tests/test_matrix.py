@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from os.path import exists
+from numpy import allclose, array, zeros, load, memmap, isnan
+from numpy.lib.format import open_memmap
+from numpy.random import default_rng
+
+from spycio.spycio import distance
+from spycio.matrix import distanceMatrix, tileShape, writeProgress
+
+from .fixtures import batch_methods, batch_spherical_methods
+
+rng=default_rng(7)
+
+def scalarMatrix(A, B, method, method_config):
+    return array([
+        [ distance(list(a), list(b), method, method_config) for b in B ] for a in A
+    ])
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_distanceMatrix_matches_scalar(method, method_config):
+    A=rng.uniform(0.5, 3, (7, 3))
+    B=rng.uniform(0.5, 3, (11, 3))
+
+    result=distanceMatrix(A, B, method, method_config, block_size=20)
+
+    assert result.shape == (7, 11)
+    assert allclose(result, scalarMatrix(A, B, method, method_config), atol=1e-7)
+
+@mark.parametrize(batch_spherical_methods["names"], batch_spherical_methods["variables"])
+def test_distanceMatrix_spherical_matches_scalar(method, method_config, bounds):
+    A=array([ rng.uniform(low, high, 5) for low, high in bounds ]).T
+    B=array([ rng.uniform(low, high, 9) for low, high in bounds ]).T
+
+    result=distanceMatrix(A, B, method, method_config, block_size=16)
+
+    assert allclose(result, scalarMatrix(A, B, method, method_config), atol=1e-7)
+
+@mark.parametrize("block_size", [1, 5, 64, 2 ** 20])
+def test_distanceMatrix_block_size_invariant(block_size):
+    A=rng.uniform(-1, 1, (13, 2))
+    B=rng.uniform(-1, 1, (6, 2))
+
+    expected=distanceMatrix(A, B)
+
+    assert allclose(distanceMatrix(A, B, block_size=block_size), expected)
+
+def test_tileShape_budget():
+    rows, columns=tileShape(1000, 1000, 4, 400)
+
+    assert rows * columns * 4 <= 400
+    assert tileShape(3, 2, 10, 2 ** 20) == (3, 2)
+
+@mark.parametrize("workers", [1, 2])
+def test_distanceMatrix_empty_arrays(workers):
+    assert distanceMatrix(zeros((0, 2)), zeros((3, 2)) + 1, workers=workers).shape == (0, 3)
+    assert distanceMatrix(zeros((3, 2)), zeros((0, 2)), workers=workers).shape == (3, 0)
+
+def test_distanceMatrix_errors():
+    with raises(TypeError):
+        distanceMatrix(zeros((2, 2)), zeros((2, 3)))
+
+    with raises(TypeError):
+        distanceMatrix(zeros((2, 2)), zeros((2, 2)), "sphere", {})
+
+    with raises(ValueError):
+        distanceMatrix(zeros((2, 2)), zeros((2, 2)), block_size=0)
+
+def test_distanceMatrix_npy_output(tmp_path):
+    A=rng.uniform(-1, 1, (40, 3))
+    B=rng.uniform(-1, 1, (25, 3))
+    filename=str(tmp_path / "matrix.npy")
+
+    result=distanceMatrix(A, B, "manhattan", {}, block_size=30, out=filename)
+    
+    assert isinstance(result, memmap)
+    assert not exists(filename + ".progress")
+    assert allclose(load(filename, mmap_mode="r"), distanceMatrix(A, B, "manhattan"))
+
+def test_distanceMatrix_memmap_output(tmp_path):
+    A=rng.uniform(-1, 1, (12, 2))
+    B=rng.uniform(-1, 1, (9, 2))
+    
+    out=open_memmap(str(tmp_path / "matrix.npy"), mode="w+", dtype=float, shape=(12, 9))
+
+    for backend in ["thread", "process"]:
+        out[...]=0
+        result=distanceMatrix(A, B, block_size=8, workers=2, backend=backend, out=out)
+
+        assert result is out
+        assert allclose(load(str(tmp_path / "matrix.npy")), distanceMatrix(A, B))
+
+def test_distanceMatrix_resume(tmp_path):
+    A=rng.uniform(-1, 1, (30, 2))
+    B=rng.uniform(-1, 1, (10, 2))
+    filename=str(tmp_path / "matrix.npy")
+
+    expected=distanceMatrix(A, B)
+
+    # Simulates a crash after the first 12 rows, marked to check they are kept
+    partial=open_memmap(filename, mode="w+", dtype=float, shape=(30, 10))
+    partial[:12]=-1
+    partial.flush()
+    del partial
+
+    writeProgress(filename + ".progress", 12, (30, 10))
+
+    result=distanceMatrix(A, B, block_size=4, out=filename, resume=True)
+
+    assert (result[:12] == -1).all()
+    assert allclose(result[12:], expected[12:])
+    assert not exists(filename + ".progress")
+
+    # Complete files are kept as they are
+    assert (distanceMatrix(A, B, out=filename, resume=True)[:12] == -1).all()
+
+def test_distanceMatrix_output_errors(tmp_path):
+    with raises(ValueError):
+        distanceMatrix(zeros((2, 2)), zeros((3, 2)), out=zeros((3, 2)))
+
+    filename=str(tmp_path / "matrix.npy")
+    distanceMatrix(zeros((2, 2)), zeros((3, 2)), out=filename)
+
+    with raises(ValueError):
+        distanceMatrix(zeros((4, 2)), zeros((3, 2)), out=filename, resume=True)
+
+def test_distanceMatrix_validate_mask():
+    A=array([[0, 0], [4, 1], [1, 1]])
+    B=array([[1, 1], [0, 1], [-1, 0]])
+    config={ "radius": 1 }
+
+    with raises(TypeError):
+        distanceMatrix(A, B, "sphere", config)
+
+    result=distanceMatrix(A, B, "sphere", config, block_size=2, validate="mask")
+
+    assert isnan(result[1]).all() and isnan(result[:, 2]).all()
+    assert allclose(result[[0, 2]][:, :2], scalarMatrix(A[[0, 2]], B[:2], "sphere", config))
+
+@mark.parametrize("method", ["cosine", "angular"])
+def test_distanceMatrix_masks_null_vectors(method):
+    A=rng.uniform(-1, 1, (30, 16))
+    B=rng.uniform(-1, 1, (40, 16))
+    A[3]=0
+    B[[0, 7]]=0
+
+    result=distanceMatrix(A, B, method, block_size=64)
+
+    assert isnan(result[3]).all() and isnan(result[:, [0, 7]]).all()
+    assert isnan(result).sum() == 40 + 2 * 30 - 2
+
+    rows=[ row for row in range(30) if row != 3 ]
+    columns=[ column for column in range(40) if column not in (0, 7) ]
+
+    assert allclose(result[rows][:, columns], scalarMatrix(A[rows], B[columns], method, {}))
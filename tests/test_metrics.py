@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pytest import mark, raises, warns
+from math import isclose
+from numpy import allclose, array, absolute, pi
+from numpy.random import default_rng
+
+from spycio.spycio import distance
+from spycio.metrics import Metric, METRICS, getMetric, registerMetric
+from spycio.batch import distanceBatch
+
+from .fixtures import TOL, batch_methods
+
+rng=default_rng(3)
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_getMetric_matches_distance(method, method_config):
+    metric=getMetric(method, **method_config)
+
+    u=list(rng.uniform(0.5, 3, 3))
+    v=list(rng.uniform(0.5, 3, 3))
+
+    assert isclose(metric(u, v), distance(u, v, method, method_config), rel_tol=TOL)
+    assert allclose(metric.batch(array([u]), array([v])), [metric(u, v)])
+
+def test_getMetric_sphere_geographical():
+    sphere=getMetric("sphere", radius=1)
+    geographical=getMetric("geographical", radius=1)
+
+    assert isclose(sphere([0, 0], [1, 0]), 1, rel_tol=TOL)
+    assert isclose(geographical([0, 0], [0, 90]), \
+        distance([0, 0], [0, 90], "geographical", { "radius": 1 }))
+
+    with raises(TypeError):
+        sphere([0, 0], [4, 0])
+
+    with raises(TypeError):
+        geographical([0, 0], [100, 0])
+
+    with raises(TypeError):
+        sphere.check(array([[0, 0], [4, 0]]))
+
+def test_getMetric_errors():
+    with raises(TypeError):
+        getMetric("")
+
+    with raises(TypeError):
+        getMetric("sphere")
+
+    with raises(Exception):
+        getMetric("pnorm", exponent=0)
+
+    with warns(UserWarning):
+        getMetric("pnorm")
+
+def test_getMetric_passes_through_metric():
+    metric=getMetric("manhattan")
+
+    assert getMetric(metric) is metric
+    assert getMetric("cityblock").name == "manhattan"
+
+def test_registerMetric_custom():
+    def weightedMetric(weight=1, **config):
+        return Metric(
+            "weighted",
+            lambda u, v: weight * sum(abs(a - b) for a, b in zip(u, v)),
+            lambda X, Y: weight * absolute(X - Y).sum(axis=-1)
+        )
+
+    registerMetric("weighted", weightedMetric)
+
+    try:
+        assert getMetric("weighted", weight=2)([0, 0], [1, 1]) == 4
+        assert allclose(distanceBatch([[0, 0]], [[1, 2]], "weighted", { "weight": 3 }), [9])
+    finally:
+        del METRICS["weighted"]
+
+def test_Metric_batch_accepts_lists():
+    assert allclose(getMetric("euclidean").batch([[0, 0]], [[3, 4]]), [5])
+    assert allclose(getMetric("geographical", radius=1).batch([[0, 0]], [[0, 90]]), [pi / 2])
+
+def test_sphere_metric_prepares_cartesian():
+    sphere=getMetric("sphere", radius=2)
+    angles=array([[0.5, 1, 2], [1, 0.5, 3]])
+
+    prepared=sphere.prepare(angles)
+
+    assert prepared.shape == (2, 4)
+    assert allclose(sphere.kernel(prepared, prepared[::-1]), sphere.batch(angles, angles[::-1]))
+    assert allclose(sphere.batch(angles, angles[::-1]), \
+        [ sphere(list(angles[0]), list(angles[1])) ] * 2)
+
+
+@mark.parametrize("method", ["cosine", "angular"])
+def test_cosine_metrics_take_pairwise_products(method):
+    metric=getMetric(method)
+    A=metric.prepare(array([[3, 4], [0, 2], [1, 1]]))
+    B=metric.prepare(array([[1, 0], [2, 2]]))
+
+    assert allclose(absolute(A).max(axis=1), [0.8, 1, 0.5 ** 0.5])
+    assert metric.bufferDepth(64) == 1
+    assert allclose(metric.matrix(A, B), metric.kernel(A[:, None, :], B[None, :, :]))
+    assert getMetric("euclidean").bufferDepth(64) == 64
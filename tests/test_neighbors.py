@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import allclose, array, sort, zeros, nonzero, fill_diagonal, diff, repeat, arange, \
+    median, pi, Inf
+from numpy.random import default_rng
+
+from spycio.matrix import distanceMatrix
+from spycio.neighbors import knn, radiusGraph
+
+from .fixtures import batch_methods, batch_spherical_methods
+
+rng=default_rng(13)
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_knn_matches_distanceMatrix(method, method_config):
+    queries=rng.uniform(0.5, 3, (9, 4))
+    points=rng.uniform(0.5, 3, (60, 4))
+
+    indices, distances=knn(queries, points, 3, method, method_config, block_size=50)
+    expected=distanceMatrix(queries, points, method, method_config)
+
+    assert indices.shape == (9, 3)
+    assert allclose(distances, sort(expected, axis=1)[:, :3])
+    assert allclose(expected[range(9), indices[:, 0]], distances[:, 0])
+
+@mark.parametrize(batch_spherical_methods["names"], batch_spherical_methods["variables"])
+def test_knn_spherical(method, method_config, bounds):
+    queries=array([ rng.uniform(low, high, 5) for low, high in bounds ]).T
+    points=array([ rng.uniform(low, high, 40) for low, high in bounds ]).T
+
+    indices, distances=knn(queries, points, 2, method, method_config, block_size=16)
+    expected=distanceMatrix(queries, points, method, method_config)
+
+    assert allclose(distances, sort(expected, axis=1)[:, :2])
+
+@mark.parametrize("k", [1, 7, 30])
+def test_knn_block_size_invariant(k):
+    queries=rng.uniform(-1, 1, (4, 2))
+    points=rng.uniform(-1, 1, (30, 2))
+
+    indices, distances=knn(queries, points, k)
+
+    for block_size in [1, 3, 100]:
+        chunked_indices, chunked_distances=knn(queries, points, k, block_size=block_size)
+        
+        assert allclose(chunked_distances, distances)
+
+def test_knn_errors():
+    with raises(TypeError):
+        knn(zeros((2, 2)), zeros((3, 3)))
+
+    with raises(ValueError):
+        knn(zeros((2, 2)), zeros((3, 2)), k=4)
+
+    with raises(TypeError):
+        knn(zeros((2, 2)), zeros((3, 2)), 1, "sphere")
+
+def assertRadiusGraph(points, r, method, method_config, **options):
+    indptr, indices, distances=radiusGraph(points, r, method, method_config, **options)
+
+    expected=distanceMatrix(points, points, method, method_config)
+    fill_diagonal(expected, Inf)
+    rows, columns=nonzero(expected <= r)
+
+    assert len(indptr) == len(points) + 1
+    assert (repeat(arange(len(points)), diff(indptr)) == rows).all()
+    assert (indices == columns).all()
+    assert allclose(distances, expected[rows, columns])
+
+@mark.parametrize(batch_methods["names"], batch_methods["variables"])
+def test_radiusGraph_matches_distanceMatrix(method, method_config):
+    points=rng.uniform(0.5, 3, (150, 3))
+    matrix=distanceMatrix(points, points, method, method_config)
+
+    assertRadiusGraph(points, median(matrix) / 4, method, method_config, block_size=500, \
+        leaf_size=8)
+
+@mark.parametrize(batch_spherical_methods["names"], batch_spherical_methods["variables"])
+def test_radiusGraph_spherical(method, method_config, bounds):
+    points=array([ rng.uniform(low, high, 400) for low, high in bounds ]).T
+    matrix=distanceMatrix(points, points, method, method_config)
+
+    for r in [0, median(matrix) / 10, median(matrix)]:
+        assertRadiusGraph(points, r, method, method_config, block_size=1000)
+
+@mark.parametrize("method", ["angular", "sphere", "cosine"])
+def test_radiusGraph_pairwise_methods_skip_vantage_point_tree(method, monkeypatch):
+    def vantagePointTree(*args, **kwargs):
+        raise AssertionError("Pairwise methods must not build a vantage-point tree!")
+
+    monkeypatch.setattr("spycio.neighbors.VPTree", vantagePointTree)
+
+    points=rng.normal(size=(200, 16))
+    if(method == "sphere"):
+        points=array([ rng.uniform(0, pi, 200), rng.uniform(0, 2 * pi, 200) ]).T
+
+    matrix=distanceMatrix(points, points, method, { "radius": 1 })
+
+    assertRadiusGraph(points, median(matrix) / 4, method, { "radius": 1 }, block_size=1000)
+
+@mark.parametrize("method", ["geographical", "equirectangular", "flatearth", "autogeographical"])
+def test_radiusGraph_geographical_wraparound(method):
+    points=array([[0, 179.9], [0, -179.9], [89.9, 0], [89.9, 180], [-45, 10]])
+
+    indptr, indices, distances=radiusGraph(points, 50, method, { "radius": 6371 })
+
+    assert list(diff(indptr)) == [1, 1, 1, 1, 0]
+    assert list(indices) == [1, 0, 3, 2]
+
+@mark.parametrize("method", ["equirectangular", "flatearth", "autogeographical"])
+def test_radiusGraph_approximate_geographical_near_poles(method):
+    points=array([ rng.uniform(60, 90, 300), rng.uniform(-180, 180, 300) ]).T
+
+    assertRadiusGraph(points, 1500, method, { "radius": 6371 })
+
+def test_radiusGraph_errors():
+    with raises(TypeError):
+        radiusGraph(zeros(3), 1)
+
+    with raises(ValueError):
+        radiusGraph(zeros((3, 2)), -1)
+
+    with raises(TypeError):
+        radiusGraph(array([[100, 0]]), 1, "geographical", { "radius": 1 })
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import array_equal, zeros
+from numpy.random import default_rng
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from spycio.batch import distanceBatch
+from spycio.matrix import distanceMatrix
+from spycio.metrics import getMetric
+from spycio.parallel import batchTiles, workerCount
+
+rng=default_rng(17)
+
+parallel_setups=[
+    ("euclidean", {}),
+    ("pnorm", { "exponent": 3 }),
+    ("cosine", {}),
+    ("geographical", { "radius": 6371 }),
+]
+
+@mark.parametrize("backend", ["thread", "process"])
+@mark.parametrize("method,method_config", parallel_setups)
+def test_distanceMatrix_parallel_identical(backend, method, method_config):
+    A=rng.uniform(1, 80, (37, 2))
+    B=rng.uniform(1, 80, (23, 2))
+
+    expected=distanceMatrix(A, B, method, method_config, block_size=64)
+    result=distanceMatrix(A, B, method, method_config, 64, workers=3, backend=backend)
+
+    assert array_equal(result, expected)
+
+@mark.parametrize("backend", ["thread", "process"])
+@mark.parametrize("method,method_config", parallel_setups)
+def test_distanceBatch_parallel_identical(backend, method, method_config):
+    X=rng.uniform(1, 80, (101, 2))
+    Y=rng.uniform(1, 80, (101, 2))
+
+    expected=distanceBatch(X, Y, method, method_config)
+    result=distanceBatch(X, Y, method, method_config, workers=4, backend=backend)
+
+    assert array_equal(result, expected)
+
+def test_distanceMatrix_process_pool_and_buffers(monkeypatch):
+    pools, sizes=[], []
+
+    class CountedPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    def sharedMemory(*args, **kwargs):
+        if(kwargs.get("create")):
+            sizes.append(kwargs["size"])
+        return SharedMemory(*args, **kwargs)
+
+    monkeypatch.setattr("spycio.parallel.ProcessPoolExecutor", CountedPool)
+    monkeypatch.setattr("spycio.parallel.SharedMemory", sharedMemory)
+
+    A=rng.uniform(1, 80, (300, 2))
+    B=rng.uniform(1, 80, (40, 2))
+
+    result=distanceMatrix(A, B, block_size=64, workers=2, backend="process")
+
+    assert array_equal(result, distanceMatrix(A, B, block_size=64))
+    assert len(pools) == 1
+    assert sizes[:2] == [A.nbytes, B.nbytes]
+    assert max(sizes[2:]) < result.nbytes
+
+def test_batchTiles_cover_rows():
+    tiles=batchTiles(10, 2)
+
+    assert [ (tile.start, tile.stop) for tile, _ in tiles ] == \
+        [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)]
+
+def test_workerCount():
+    assert workerCount(None) >= 1
+    assert workerCount(3) == 3
+
+    with raises(ValueError):
+        workerCount(0)
+
+def test_parallel_errors():
+    with raises(TypeError):
+        distanceMatrix(zeros((4, 2)), zeros((4, 2)), block_size=2, workers=2, backend="gpu")
+
+    with raises(TypeError):
+        distanceMatrix(zeros((4, 2)), zeros((4, 2)), getMetric("euclidean"), block_size=2, \
+            workers=2, backend="process")
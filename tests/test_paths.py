@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from math import isclose
+from numpy import allclose, array, concatenate, zeros
+from numpy.random import default_rng
+
+from spycio.spycio import distance
+from spycio.paths import pathLength, cumulativeDistance, PathAccumulator
+
+from .fixtures import TOL, minkowski_methods
+
+rng=default_rng(17)
+
+GEOGRAPHICAL={ "radius": 6371 }
+
+def loopLength(points, method, method_config):
+    return sum([ \
+        distance(list(points[i]), list(points[i + 1]), method, method_config) \
+        for i in range(len(points) - 1) \
+    ])
+
+def track(N):
+    return array([ rng.uniform(-60, 60, N), rng.uniform(-180, 180, N) ]).T
+
+@mark.parametrize(minkowski_methods["names"], minkowski_methods["variables"])
+def test_pathLength_matches_loop(method, method_config):
+    points=rng.uniform(-5, 5, (40, 3))
+
+    assert isclose(pathLength(points, method, method_config), \
+        loopLength(points, method, method_config), rel_tol=TOL)
+
+def test_pathLength_geographical():
+    points=track(100)
+
+    assert isclose(pathLength(points, "geographical", GEOGRAPHICAL), \
+        loopLength(points, "geographical", GEOGRAPHICAL), rel_tol=TOL)
+    assert pathLength(points[:1], "geographical", GEOGRAPHICAL) == 0
+
+def test_cumulativeDistance():
+    points=track(20)
+    cumulative=cumulativeDistance(points, "geographical", GEOGRAPHICAL)
+
+    assert cumulative[0] == 0
+    assert allclose(cumulative, [ loopLength(points[:i + 1], "geographical", GEOGRAPHICAL) \
+        for i in range(20) ])
+
+@mark.parametrize("offsets", [[0, 12, 12, 13, 30], [0, 0, 30], [0, 30, 30], [0, 25, 30, 30]])
+def test_ragged_tracks(offsets):
+    points=track(30)
+
+    lengths=pathLength(points, "geographical", GEOGRAPHICAL, offsets)
+    cumulative=cumulativeDistance(points, "geographical", GEOGRAPHICAL, offsets)
+
+    expected_lengths=[ loopLength(points[start:end], "geographical", GEOGRAPHICAL) \
+        for start, end in zip(offsets[:-1], offsets[1:]) ]
+    expected_cumulative=concatenate([ \
+        cumulativeDistance(points[start:end], "geographical", GEOGRAPHICAL) \
+        for start, end in zip(offsets[:-1], offsets[1:]) ])
+
+    assert allclose(lengths, expected_lengths)
+    assert allclose(cumulative, expected_cumulative)
+
+def test_PathAccumulator_chunks():
+    points=track(50)
+    accumulator=PathAccumulator("geographical", GEOGRAPHICAL)
+
+    chunks=[
+        accumulator.update(points[start:end])
+        for start, end in [(0, 1), (1, 20), (20, 20), (20, 50)]
+    ]
+
+    assert allclose(concatenate(chunks), cumulativeDistance(points, "geographical", GEOGRAPHICAL))
+    assert isclose(accumulator.length, pathLength(points, "geographical", GEOGRAPHICAL), \
+        rel_tol=TOL)
+    assert accumulator.count == 50
+
+    accumulator.reset()
+    assert accumulator.update(points[:2])[0] == 0
+
+def test_paths_errors():
+    with raises(TypeError):
+        pathLength(zeros(3))
+
+    with raises(ValueError):
+        pathLength(zeros((4, 2)), offsets=[0, 3])
+
+    with raises(ValueError):
+        pathLength(zeros((4, 2)), offsets=[0, 3, 2, 4])
+
+    with raises(TypeError):
+        pathLength([[0, 0], [100, 0]], "geographical", GEOGRAPHICAL)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pytest import mark, raises
+from numpy import allclose, array, zeros
+from numpy.random import default_rng
+
+from spycio.spycio import travelTime
+from spycio.batch import travelTimeBatch, distanceBatch
+from spycio.matrix import travelTimeMatrix, distanceMatrix
+from spycio.speed import SpeedProfile, travelTimes
+
+rng=default_rng(19)
+
+URBAN=SpeedProfile([2, 10], [15, 30, 60])
+
+def test_SpeedProfile_travelTime():
+    times=URBAN.travelTime([0, 1, 2, 6, 10, 70])
+    
+    assert allclose(times, \
+        [0, 1 / 15, 2 / 15, 2 / 15 + 4 / 30, 2 / 15 + 8 / 30, 2 / 15 + 8 / 30 + 1])
+
+def test_SpeedProfile_monotone():
+    times=URBAN.travelTime(array(range(0, 200)) / 10)
+
+    assert (times[1:] > times[:-1]).all()
+
+@mark.parametrize("bounds,speeds", [([1], [1]), ([2, 1], [1, 1, 1]), ([0], [1, 1]), ([1], [1, 0])])
+def test_SpeedProfile_errors(bounds, speeds):
+    with raises(ValueError):
+        SpeedProfile(bounds, speeds)
+
+def test_travelTimeBatch():
+    X=rng.uniform(-5, 5, (20, 2))
+    Y=rng.uniform(-5, 5, (20, 2))
+    speeds=rng.uniform(1, 3, 20)
+
+    expected=[ travelTime(2, list(x), list(y), "manhattan") for x, y in zip(X, Y) ]
+
+    assert allclose(travelTimeBatch(2, X, Y, "manhattan"), expected)
+    assert allclose(travelTimeBatch(speeds, X, Y), distanceBatch(X, Y) / speeds)
+    assert allclose(travelTimeBatch(URBAN, X, Y), URBAN.travelTime(distanceBatch(X, Y)))
+
+    with raises(ValueError):
+        travelTimeBatch(speeds[:5], X, Y)
+
+    with raises(ValueError):
+        travelTimeBatch(0, X, Y)
+
+def test_travelTimeMatrix():
+    A=rng.uniform(-5, 5, (8, 2))
+    B=rng.uniform(-5, 5, (6, 2))
+    distances=distanceMatrix(A, B)
+
+    origin_speeds=rng.uniform(1, 3, 8)
+    pair_speeds=rng.uniform(1, 3, (8, 6))
+
+    assert allclose(travelTimeMatrix(2, A, B, block_size=10), distances / 2)
+    assert allclose(travelTimeMatrix(origin_speeds, A, B, block_size=10), \
+        distances / origin_speeds[:, None])
+    assert allclose(travelTimeMatrix(pair_speeds, A, B, block_size=10), distances / pair_speeds)
+    assert allclose(travelTimeMatrix(URBAN, A, B, block_size=10), URBAN.travelTime(distances))
+
+    with raises(ValueError):
+        travelTimeMatrix(zeros(3), A, B)
+
+def test_travelTimes():
+    assert allclose(travelTimes(array([2, 4]), 2), [1, 2])
+
+    with raises(ValueError):
+        travelTimes(array([2, 4]), [1, -1])
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from pytest import mark, raises, warns
-from math import isclose
+from math import isclose, cos, radians
+from subprocess import run
+from sys import executable
 
-from numpy import sqrt, Inf, pi
+from numpy import sqrt, Inf, pi, array, radians as toRadians
+from numpy.random import default_rng
 
 from spycio.spycio import pNorm, distance, pNormDistance, \
-    greatCircleDistance, nSphereDistance, travelTime, cosnuv
+    greatCircleDistance, nSphereDistance, travelTime, cosnuv, geographicalDistance
+
+from spycio.kernels import haversineBatch
 
 from .fixtures import TOL, distance_setups, distance_setups_without_config, \
     pnorm_fixtures, non_spherical_candidate_tuples
@@ -239,3 +244,74 @@ def test_distance_sphere_error_nonSpherical(candidate1,candidate2):
 
     with raises(TypeError):
         assert distance(candidate1, candidate2, method, config)
+
+def test_distance_scalar_path_without_numpy():
+    script="import sys; from spycio.spycio import distance; " \
+        "distance([0, 0], [3, 4]); distance([0, 0], [30, 40], 'geographical', { 'radius': 1 }); " \
+        "sys.exit('numpy' in sys.modules)"
+
+    assert run([executable, "-c", script]).returncode == 0
+
+def test_distance_close_vectors():
+    assert distance([1, 1, 1], [1, 1, 1], "sphere", { "radius": 1 }) == 0
+    assert distance([1, 2, 0], [1, 2, 0], "canberra") == 0
+
+
+@mark.parametrize("offset", [1e-1, 1e-5, 1e-7, 1e-9])
+def test_geographicalDistance_matches_haversineBatch(offset):
+    origin=[48.85, 2.35]
+    target=[48.85 + offset, 2.35 + offset]
+
+    expected=haversineBatch(toRadians(array(origin)), toRadians(array(target)), 6371)
+
+    assert isclose(geographicalDistance(origin, target, 6371), expected, rel_tol=1e-9)
+    assert isclose(distance(origin, target, "geographical", { "radius": 6371 }), expected, \
+        rel_tol=1e-9)
+
+def test_distance_approximate_geographical_within_bound():
+    rng=default_rng(11)
+
+    for _ in range(500):
+        origin=[rng.uniform(-80, 80), rng.uniform(-180, 180)]
+        target=[
+            min(max(origin[0] + rng.normal(0, 0.2), -90), 90),
+            min(max(origin[1] + rng.normal(0, 0.2), -180), 180)
+        ]
+
+        expected=geographicalDistance(origin, target, 6371)
+        theta=expected / 6371
+        bound=theta ** 2 / (16 * cos(radians(max(abs(origin[0]), abs(target[0])))) ** 2)
+
+        for method in ["equirectangular", "flatearth"]:
+            result=distance(origin, target, method, { "radius": 6371 })
+
+            assert abs(result - expected) <= (bound + 1e-9) * expected
+
+def test_distance_approximate_geographical_across_antimeridian():
+    expected=distance([10, 179.9], [10, -179.9], "geographical", { "radius": 6371 })
+
+    for method in ["equirectangular", "flatearth", "autogeographical"]:
+        result=distance([10, 179.9], [10, -179.9], method, { "radius": 6371 })
+
+        assert isclose(result, expected, rel_tol=1e-6)
+
+def test_distance_autogeographical():
+    config={ "radius": 6371 }
+
+    near=distance([48.85, 2.35], [48.86, 2.36], "autogeographical", config)
+    far=distance([48.85, 2.35], [40.42, -3.7], "autogeographical", config)
+
+    assert near == distance([48.85, 2.35], [48.86, 2.36], "flatearth", config)
+    assert far == distance([48.85, 2.35], [40.42, -3.7], "geographical", config)
+
+    strict=distance([48.85, 2.35], [48.86, 2.36], "autogeographical", { **config, "tolerance": 0 })
+
+    assert strict == distance([48.85, 2.35], [48.86, 2.36], "geographical", config)
+
+@mark.parametrize("method", ["equirectangular", "flatearth", "autogeographical"])
+def test_distance_approximate_geographical_errors(method):
+    with raises(TypeError):
+        distance([0, 0], [1, 1], method)
+
+    with raises(TypeError):
+        distance([0, 0], [100, 1], method, { "radius": 1 })
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pytest import raises
+from io import StringIO
+from numpy import allclose, array, loadtxt, sqrt
+
+from spycio.spycio import distance, travelTime
+from spycio.stream import readChunks, splitPairs, streamDistances, streamFile
+from spycio.__main__ import main
+
+ROWS="0,0,1,1\n1,1,4,5\n\n2,2,2,2\n-1,0,0,0\n"
+
+def test_readChunks_fixed_size():
+    chunks=list(readChunks(StringIO(ROWS), chunk_size=3))
+
+    assert [ len(chunk) for chunk in chunks ] == [3, 1]
+    assert allclose(chunks[1], [[-1, 0, 0, 0]])
+
+def test_streamDistances_matches_scalar():
+    pairs=splitPairs(readChunks(StringIO(ROWS), chunk_size=2))
+    
+    results=list(streamDistances(pairs, "manhattan", {}, average_speed=2))
+    distances=[ value for _, _, chunk_distances, _ in results for value in chunk_distances ]
+    times=[ value for _, _, _, chunk_times in results for value in chunk_times ]
+
+    assert allclose(distances, [2, 7, 0, 1])
+    assert allclose(times, [travelTime(2, [0, 0], [1, 1], "manhattan"), 3.5, 0, 0.5])
+
+def test_streamFile_with_header():
+    output=StringIO()
+    count=streamFile(StringIO("x1,y1,x2,y2\n" + ROWS), output, average_speed=1, chunk_size=2, \
+        header=True)
+    
+    lines=output.getvalue().splitlines()
+
+    assert count == 4
+    assert lines[0] == "x1,y1,x2,y2,distance,travel_time"
+    assert allclose(loadtxt(lines[1:], delimiter=",")[:, 4], [sqrt(2), 5, 0, 1])
+
+def test_streamFile_geographical():
+    output=StringIO()
+    streamFile(StringIO("0,0,0,90\n"), output, "geographical", { "radius": 1 })
+    
+    expected=distance([0, 0], [0, 90], "geographical", { "radius": 1 })
+
+    assert allclose(loadtxt(StringIO(output.getvalue()), delimiter=",")[4], expected)
+
+def test_streamFile_keeps_input_fields():
+    output=StringIO()
+    streamFile(StringIO("0.12345678901234567,1e-300,0,0\n"), output)
+
+    assert output.getvalue().startswith("0.12345678901234567,1e-300,0,0,")
+
+def test_streamFile_errors():
+    with raises(TypeError):
+        streamFile(StringIO("0,0,1\n"), StringIO())
+
+    with raises(ValueError):
+        list(readChunks(StringIO(ROWS), chunk_size=0))
+
+def test_main(tmp_path):
+    input_path=tmp_path / "pairs.csv"
+    output_path=tmp_path / "distances.csv"
+
+    input_path.write_text(ROWS)
+
+    arguments=[str(input_path), "-o", str(output_path), "-m", "pnorm", "-c", '{"exponent": 1}', \
+        "-s", "2", "--chunk-size", "3"]
+
+    assert main(arguments) == 0
+    assert allclose(loadtxt(output_path, delimiter=",")[:, 4:], \
+        array([[2, 1], [7, 3.5], [0, 0], [1, 0.5]]))
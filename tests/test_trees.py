@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from pytest import mark, raises, warns
+from numpy import allclose, array_equal, sort, zeros
+from numpy.random import default_rng
+
+from spycio.spycio import distance
+from spycio.matrix import distanceMatrix
+from spycio.trees import KDTree, VPTree, defaultLeafSize
+
+from .fixtures import minkowski_methods
+
+rng=default_rng(11)
+
+@mark.parametrize(minkowski_methods["names"], minkowski_methods["variables"])
+def test_KDTree_query_matches_brute_force(method, method_config):
+    points=rng.uniform(-10, 10, (500, 3))
+    queries=rng.uniform(-10, 10, (20, 3))
+
+    tree=KDTree(points, method, method_config, leaf_size=8)
+    indices, distances=tree.query(queries, k=5)
+
+    expected=distanceMatrix(queries, points, method, method_config)
+
+    assert indices.shape == (20, 5)
+    assert allclose(distances, sort(expected, axis=1)[:, :5])
+    assert allclose(expected[range(20), indices[:, 0]], distances[:, 0])
+
+@mark.parametrize(minkowski_methods["names"], minkowski_methods["variables"])
+def test_KDTree_queryRadius_matches_brute_force(method, method_config):
+    points=rng.uniform(-10, 10, (400, 2))
+    queries=rng.uniform(-10, 10, (15, 2))
+
+    tree=KDTree(points, method, method_config, leaf_size=4)
+    indices, distances=tree.queryRadius(queries, 3)
+
+    expected=distanceMatrix(queries, points, method, method_config)
+
+    for row in range(15):
+        assert array_equal(sort(indices[row]), (expected[row] <= 3).nonzero()[0])
+        assert allclose(distances[row], sort(expected[row][expected[row] <= 3]))
+
+def test_KDTree_single_leaf_and_exact_match():
+    points=rng.uniform(0, 1, (10, 2))
+    tree=KDTree(points)
+
+    indices, distances=tree.query(points[3], k=1)
+
+    assert indices[0, 0] == 3
+    assert distances[0, 0] == 0
+
+def test_defaultLeafSize():
+    assert defaultLeafSize(10) == 16
+    assert defaultLeafSize(10 ** 6) == 250
+    assert defaultLeafSize(10 ** 9) == 256
+
+def test_KDTree_errors():
+    with raises(TypeError):
+        KDTree(zeros((3, 2)), "cosine")
+
+    with raises(TypeError):
+        KDTree(zeros(3))
+
+    with raises(ValueError):
+        KDTree(zeros((3, 2))).query(zeros((1, 2)), k=4)
+
+    with raises(TypeError):
+        KDTree(zeros((3, 2))).query(zeros((1, 3)))
+
+@mark.parametrize("method,method_config,low,high", [
+    ("euclidean", {}, -10, 10),
+    ("canberra", {}, 0.5, 10),
+    ("angular", {}, -1, 1),
+    ("geographical", { "radius": 6371 }, -90, 90),
+])
+def test_VPTree_query_matches_brute_force(method, method_config, low, high):
+    points=rng.uniform(low, high, (600, 2))
+    queries=rng.uniform(low, high, (25, 2))
+
+    tree=VPTree(points, method, method_config, leaf_size=8)
+    indices, distances=tree.query(queries, k=4)
+
+    expected=distanceMatrix(queries, points, method, method_config)
+
+    assert allclose(distances, sort(expected, axis=1)[:, :4])
+    assert allclose(expected[range(25), indices[:, 0]], distances[:, 0])
+
+    # Radii between the 10th and 11th distances, off rounding ties
+    radii=sort(expected, axis=1)[:, 9:11].mean(axis=1)
+    indices, distances=tree.queryRadius(queries, radii)
+
+    for row in range(25):
+        within=expected[row] <= radii[row]
+
+        assert array_equal(sort(indices[row]), within.nonzero()[0])
+        assert allclose(distances[row], sort(expected[row][within]))
+
+def test_VPTree_counts_saved_evaluations():
+    points=rng.uniform(0, 1, (2000, 2))
+    tree=VPTree(points, leaf_size=16)
+
+    tree.query(points[:10], k=3)
+
+    assert tree.queries == 10
+    assert tree.evaluations == tree.last_evaluations.sum()
+    assert 0 < tree.saved == 10 * 2000 - tree.evaluations
+    assert (tree.last_evaluations < 2000).all()
+
+    tree.resetCounters()
+
+    assert tree.queries == tree.evaluations == tree.saved == 0
+
+def test_VPTree_callable_metric():
+    points=rng.uniform(0.5, 10, (300, 3))
+    calls=[]
+
+    def canberra(u, v):
+        calls.append(1)
+        return distance(u, v, "canberra")
+
+    tree=VPTree(points, canberra, leaf_size=4)
+    calls.clear()
+
+    indices, distances=tree.query(points[7], k=1)
+
+    assert indices[0, 0] == 7
+    assert distances[0, 0] == 0
+    assert len(calls) == tree.evaluations
+
+def test_VPTree_errors():
+    with warns(UserWarning):
+        VPTree(zeros((3, 2)) + 1, "cosine")
+
+    with raises(TypeError):
+        VPTree(zeros(3))
+
+    with raises(TypeError):
+        VPTree(zeros((3, 2)), "geographical", { "radius": 1 }).query([[100, 0]])
+
+    with raises(ValueError):
+        VPTree(zeros((3, 2)), leaf_size=0)
+
+    with raises(ValueError):
+        VPTree(zeros((3, 2))).query([0, 0], k=4)